@@ -0,0 +1,73 @@
+"""
+OrdoNet: a small neural network library built from scratch on NumPy.
+
+Submodules and the names below are imported on first use (PEP 562), so
+`import OrdoNet` costs almost nothing, and a process that only loads a
+checkpoint and predicts never imports the training, data loading or
+plotting code:
+
+    from OrdoNet import Network, Trainer   # imports network.py and trainer.py
+    import OrdoNet.inference               # the minimal scoring path
+"""
+import importlib
+
+__version__ = '0.1.0'
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    'Network': 'network',
+    'Sequential': 'sequential',
+    'Dense': 'sequential',
+    'Dropout': 'sequential',
+    'BatchNorm': 'sequential',
+    'Residual': 'sequential',
+    'Ensemble': 'ensemble',
+    'Layer': 'layer',
+    'Neuron': 'neuron',
+    'Matrix': 'matrix',
+    'Activation': 'activation',
+    'get_activation': 'activation',
+    'Loss': 'loss',
+    'get_loss': 'loss',
+    'AdamOptimizer': 'optimizer',
+    'AdamW': 'optimizer',
+    'SGDOptimizer': 'optimizer',
+    'RMSPropOptimizer': 'optimizer',
+    'Trainer': 'trainer',
+    'EarlyStopping': 'trainer',
+    'Callback': 'trainer',
+    'Normalizer': 'normalizer',
+    'RunningStats': 'stats',
+    'load_csv': 'dataset',
+    'stream_csv': 'dataset',
+    'csv_to_cache': 'dataset',
+    'MappedDataset': 'dataset',
+    'Pipeline': 'pipeline',
+    'load_model': 'inference',
+    'QuantizedNetwork': 'quantize',
+    'ParallelTrainer': 'parallel',
+    'InferenceServer': 'server',
+    'Profiler': 'profiler',
+    'Sweep': 'sweep',
+}
+
+_SUBMODULES = {
+    'activation', 'checkpoint', 'dataset', 'ensemble', 'inference', 'layer', 'loss', 'matrix',
+    'network', 'neuron', 'normalizer', 'optimizer', 'parallel', 'pipeline', 'profiler',
+    'quantize', 'sequential', 'server', 'stats', 'sweep', 'trainer', 'utils', 'workspace',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -1,87 +1,200 @@
-import math
-
-class Activation:
-    @staticmethod
-    def sigmoid(x):
-        """
-        Computes the sigmoid of x.
-        Squeezes a single number between 0 and 1.
-        """
-        try:
-            return 1 / (1 + math.exp(-x))
-        except Exception as e:
-            raise ValueError(f"Error computing sigmoid for x={x}: {e}")
-
-    @staticmethod
-    def sigmoid_deriv(x):
-        """
-        Computes the derivative of the sigmoid function at x.
-        This is used to determine how much to adjust during training.
-        """
-        s = Activation.sigmoid(x)
-        return s * (1 - s)
-
-    @staticmethod
-    def tanh(x):
-        """
-        Computes the hyperbolic tangent of x.
-        Squeezes a single number between -1 and 1.
-        """
-        try:
-            return math.tanh(x)
-        except Exception as e:
-            raise ValueError(f"Error computing tanh for x={x}: {e}")
-
-    @staticmethod
-    def tanh_deriv(x):
-        """
-        Computes the derivative of tanh at x.
-        Used during backpropagation to adjust weights.
-        """
-        try:
-            t = math.tanh(x)
-            return 1 - t * t
-        except Exception as e:
-            raise ValueError(f"Error computing tanh derivative for x={x}: {e}")
-
-    @staticmethod
-    def relu(x):
-        """
-        Applies the ReLU function: returns x if x > 0, else returns 0.
-        """
-        try:
-            return x if x > 0 else 0
-        except Exception as e:
-            raise ValueError(f"Error computing relu for x={x}: {e}")
-
-    @staticmethod
-    def relu_deriv(x):
-        """
-        Computes the derivative of ReLU: returns 1 if x > 0, else 0.
-        """
-        try:
-            return 1 if x > 0 else 0
-        except Exception as e:
-            raise ValueError(f"Error computing relu derivative for x={x}: {e}")
-
-    @staticmethod
-    def softmax(vector):
-        """
-        Computes the softmax function for a list of numbers.
-        Turns the numbers into probabilities that sum to 1.
-        """
-        if not isinstance(vector, (list, tuple)):
-            raise TypeError("Input to softmax must be a list or tuple.")
-        if len(vector) == 0:
-            raise ValueError("Input vector for softmax cannot be empty.")
-        
-        try:
-            # For numerical stability, subtract the maximum value
-            biggest = max(vector)
-            powered = [math.exp(x - biggest) for x in vector]
-            total = sum(powered)
-            if total == 0:
-                raise ValueError("Sum of exponentials in softmax is zero.")
-            return [x / total for x in powered]
-        except Exception as e:
-            raise ValueError(f"Error computing softmax for vector={vector}: {e}")
\ No newline at end of file
+import math
+import numpy as np
+
+class Activation:
+    @staticmethod
+    def sigmoid(x):
+        """
+        Computes the sigmoid of x.
+        Squeezes a single number between 0 and 1.
+        """
+        # Use the form that cannot overflow for large negative x.
+        if x >= 0:
+            return 1 / (1 + math.exp(-x))
+        e = math.exp(x)
+        return e / (1 + e)
+
+    @staticmethod
+    def sigmoid_deriv(x):
+        """
+        Computes the derivative of the sigmoid function at x.
+        This is used to determine how much to adjust during training.
+        """
+        s = Activation.sigmoid(x)
+        return s * (1 - s)
+
+    @staticmethod
+    def tanh(x):
+        """
+        Computes the hyperbolic tangent of x.
+        Squeezes a single number between -1 and 1.
+        """
+        try:
+            return math.tanh(x)
+        except Exception as e:
+            raise ValueError(f"Error computing tanh for x={x}: {e}")
+
+    @staticmethod
+    def tanh_deriv(x):
+        """
+        Computes the derivative of tanh at x.
+        Used during backpropagation to adjust weights.
+        """
+        try:
+            t = math.tanh(x)
+            return 1 - t * t
+        except Exception as e:
+            raise ValueError(f"Error computing tanh derivative for x={x}: {e}")
+
+    @staticmethod
+    def relu(x):
+        """
+        Applies the ReLU function: returns x if x > 0, else returns 0.
+        """
+        try:
+            return x if x > 0 else 0
+        except Exception as e:
+            raise ValueError(f"Error computing relu for x={x}: {e}")
+
+    @staticmethod
+    def relu_deriv(x):
+        """
+        Computes the derivative of ReLU: returns 1 if x > 0, else 0.
+        """
+        try:
+            return 1 if x > 0 else 0
+        except Exception as e:
+            raise ValueError(f"Error computing relu derivative for x={x}: {e}")
+
+    @staticmethod
+    def softmax(vector):
+        """
+        Computes the softmax function for a list of numbers.
+        Turns the numbers into probabilities that sum to 1.
+        """
+        if not isinstance(vector, (list, tuple)):
+            raise TypeError("Input to softmax must be a list or tuple.")
+        if len(vector) == 0:
+            raise ValueError("Input vector for softmax cannot be empty.")
+        
+        try:
+            # For numerical stability, subtract the maximum value
+            biggest = max(vector)
+            powered = [math.exp(x - biggest) for x in vector]
+            total = sum(powered)
+            if total == 0:
+                raise ValueError("Sum of exponentials in softmax is zero.")
+            return [x / total for x in powered]
+        except Exception as e:
+            raise ValueError(f"Error computing softmax for vector={vector}: {e}")
+
+
+# Batched activations.
+# Each one works on whole NumPy arrays: a single vector or a (batch, units) block.
+# forward(z) returns the activated output, and backward(y, d_outputs) turns the
+# gradient with respect to the output into the gradient with respect to z.
+# backward reuses the cached forward output y, so nothing is recomputed.
+# Both take an optional out array (which may be z itself for forward) to write
+# the result into instead of allocating a new one.
+
+class Sigmoid:
+    name = 'sigmoid'
+
+    def forward(self, z, out=None):
+        # 0.5 * (1 + tanh(z / 2)) equals 1 / (1 + exp(-z)) but never overflows.
+        y = np.multiply(z, 0.5, out=out)
+        np.tanh(y, out=y)
+        y += 1
+        y *= 0.5
+        return y
+
+    def backward(self, y, d_outputs, out=None):
+        if out is None:
+            return d_outputs * y * (1 - y)
+        np.subtract(1, y, out=out)
+        out *= y
+        out *= d_outputs
+        return out
+
+class Tanh:
+    name = 'tanh'
+
+    def forward(self, z, out=None):
+        return np.tanh(z, out=out)
+
+    def backward(self, y, d_outputs, out=None):
+        if out is None:
+            return d_outputs * (1 - y * y)
+        np.multiply(y, y, out=out)
+        np.subtract(1, out, out=out)
+        out *= d_outputs
+        return out
+
+class ReLU:
+    name = 'relu'
+
+    def forward(self, z, out=None):
+        return np.maximum(z, 0, out=out)
+
+    def backward(self, y, d_outputs, out=None):
+        # y > 0 exactly where z > 0.
+        if out is None:
+            return d_outputs * (y > 0)
+        np.sign(y, out=out)  # 1 where y > 0, else 0 (y is never negative)
+        out *= d_outputs
+        return out
+
+class Linear:
+    name = 'linear'
+
+    def forward(self, z, out=None):
+        if out is None:
+            return np.array(z, dtype=np.result_type(z, np.float32))
+        if out is not z:
+            np.copyto(out, z)
+        return out
+
+    def backward(self, y, d_outputs, out=None):
+        if out is None:
+            return d_outputs
+        np.copyto(out, d_outputs)
+        return out
+
+class Softmax:
+    name = 'softmax'
+
+    def forward(self, z, out=None):
+        # Subtract the row maximum for numerical stability.
+        y = np.subtract(z, np.max(z, axis=-1, keepdims=True), out=out)
+        np.exp(y, out=y)
+        y /= np.sum(y, axis=-1, keepdims=True)
+        return y
+
+    def backward(self, y, d_outputs, out=None):
+        # Jacobian-vector product of softmax: y * (d - sum(d * y)).
+        # When softmax is followed by cross-entropy, Network skips this and
+        # uses the much simpler fused gradient (y - target) instead.
+        product = np.multiply(d_outputs, y, out=out)
+        dot = np.sum(product, axis=-1, keepdims=True)
+        result = np.subtract(d_outputs, dot, out=out)
+        result *= y
+        return result
+
+ACTIVATIONS = {cls.name: cls for cls in (Sigmoid, Tanh, ReLU, Linear, Softmax)}
+
+def get_activation(activation):
+    """
+    Returns a batched activation object.
+
+    activation: a name ('sigmoid', 'tanh', 'relu', 'linear', 'softmax')
+    or an object that already has forward and backward methods.
+    """
+    if isinstance(activation, str):
+        try:
+            return ACTIVATIONS[activation.lower()]()
+        except KeyError:
+            raise ValueError(f"Unknown activation '{activation}'. "
+                             f"Choose from: {', '.join(ACTIVATIONS)}.") from None
+    if hasattr(activation, 'forward') and hasattr(activation, 'backward'):
+        return activation
+    raise TypeError("Activation must be a name or an object with forward and backward methods.")
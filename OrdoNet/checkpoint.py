@@ -0,0 +1,139 @@
+import json
+import os
+import secrets
+import struct
+
+import numpy as np
+
+# Model checkpoint file layout (all integers little-endian):
+#   bytes 0-31   preamble: magic b'ORDOMODL', format version (uint32), padding,
+#                offset and length of the JSON header (two uint64)
+#   bytes 64-    the arrays, one after another, each starting on a 64-byte
+#                boundary: first the network parameters as one flat block,
+#                then the optimizer's per-parameter arrays (if saved)
+#   at the end   JSON header: layer sizes, activations, loss, normalizers,
+#                optimizer settings, and the name, dtype, offset and shape of
+#                every array
+# The parameter block is written exactly as Network keeps it in memory, so a
+# checkpoint can be memory-mapped and used without parsing or copying.
+
+CHECKPOINT_MAGIC = b'ORDOMODL'
+CHECKPOINT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sI4xQQ')
+_ALIGNMENT = 64
+# Windows cannot rename over a file that is memory-mapped.
+_WINDOWS = os.name == 'nt'
+
+def write_checkpoint(path, header, arrays):
+    """
+    Writes a checkpoint file.
+
+    header: JSON-serializable dict describing the model.
+    arrays: list of (name, array) pairs, stored in this order.
+    The file is written under a temporary name in the same folder, flushed
+    to disk and then renamed onto path, so path always holds a complete
+    checkpoint. On POSIX systems a model memory-mapped from path can be
+    saved back to it: the old file stays intact under the mapping until it
+    is unmapped. Windows refuses to replace a mapped file, and this raises
+    PermissionError; release the mapping first (e.g. copy the parameters
+    with np.array) or save to another path.
+    """
+    header = dict(header, arrays=[])
+    temp_path = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    # O_EXCL never reuses an existing file; mode 0o666 (less the umask)
+    # gives the checkpoint the same permissions a plain open() would.
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(b'\0' * _ALIGNMENT)  # preamble is filled in at the end
+            for name, array in arrays:
+                array = np.ascontiguousarray(array)
+                file.write(b'\0' * (-file.tell() % _ALIGNMENT))
+                header['arrays'].append({
+                    'name': name,
+                    'dtype': array.dtype.name,
+                    'offset': file.tell(),
+                    'shape': list(array.shape),
+                })
+                file.write(array.tobytes())
+            header_bytes = json.dumps(header).encode('utf-8')
+            header_offset = file.tell()
+            file.write(header_bytes)
+            file.seek(0)
+            file.write(_PREAMBLE.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, header_offset, len(header_bytes)))
+            file.flush()
+            os.fsync(file.fileno())
+        try:
+            os.replace(temp_path, path)
+        except PermissionError as error:
+            if not _WINDOWS:
+                raise
+            raise PermissionError(
+                f"Cannot replace {path}: it is in use, e.g. memory-mapped by a model loaded "
+                f"with mmap=True. Release the mapping (copy the parameters into memory or delete "
+                f"the model) or save to another path.") from error
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def is_checkpoint(path):
+    # True if the file starts with the checkpoint magic bytes.
+    with open(path, 'rb') as file:
+        return file.read(len(CHECKPOINT_MAGIC)) == CHECKPOINT_MAGIC
+
+def read_checkpoint(path, mmap=False):
+    """
+    Reads a checkpoint file and returns (header, arrays), where arrays maps
+    each array name to a NumPy array.
+
+    mmap: map the arrays from the file instead of reading them. Nothing is
+    read up front, and the operating system pages values in as they are
+    used. The mapping is copy-on-write: the arrays can be changed (e.g. by
+    training) without changing the file.
+    """
+    with open(path, 'rb') as file:
+        magic, version, header_offset, header_length = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError(f"{path} is not an OrdoNet model checkpoint.")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version}.")
+        file.seek(header_offset)
+        header = json.loads(file.read(header_length).decode('utf-8'))
+        arrays = {}
+        for entry in header['arrays']:
+            shape = tuple(entry['shape'])
+            if mmap:
+                arrays[entry['name']] = np.memmap(path, dtype=entry['dtype'], mode='c',
+                                                  offset=entry['offset'], shape=shape)
+            else:
+                file.seek(entry['offset'])
+                count = int(np.prod(shape))
+                arrays[entry['name']] = np.fromfile(file, dtype=entry['dtype'], count=count).reshape(shape)
+    return header, arrays
+
+def optimizer_header(optimizer):
+    # Splits an optimizer's state into JSON settings and named arrays.
+    state = optimizer.state_dict()
+    arrays = [('optimizer.' + name, array) for name, array in state.pop('arrays').items()]
+    return state, arrays
+
+def load_optimizer(path):
+    """
+    Rebuilds the optimizer saved in a checkpoint (with its moments and step
+    counter), or returns None if the checkpoint has no optimizer state.
+    """
+    from .optimizer import Optimizer  # only needed to resume training
+    state = optimizer_state(*read_checkpoint(path))
+    return Optimizer.from_state_dict(state) if state is not None else None
+
+def optimizer_state(header, arrays):
+    # Joins the optimizer settings and arrays read from a checkpoint back
+    # into a state_dict(), or returns None if no optimizer was saved.
+    if header.get('optimizer') is None:
+        return None
+    prefix = 'optimizer.'
+    state_arrays = {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+    return dict(header['optimizer'], arrays=state_arrays)
@@ -1,96 +1,392 @@
-import csv
-
-def load_csv(filepath, delimiter=',', has_header=True):
-    """
-    Loads data from a CSV file.
-    
-    Each row should contain features (all columns except the last) and the last column is the label.
-    Returns two lists:
-      - values: list of feature lists (floats)
-      - labels: list of labels (float if possible, else string)
-    """
-    values = []  # features go here
-    labels = []  # labels go here
-    try:
-        with open(filepath, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.reader(file, delimiter=delimiter)
-            if has_header:
-                next(reader)  # skip header
-            for row in reader:
-                if not row or all(cell.strip() == '' for cell in row):
-                    continue  # skip empty rows
-                try:
-                    # Convert all but the last column to floats
-                    current_values = [float(x) for x in row[:-1]]
-                except ValueError:
-                    # Skip row if conversion fails
-                    continue
-                current_label = row[-1]  # last column is the label
-                try:
-                    # Convert label to float if possible
-                    current_label = float(current_label)
-                except ValueError:
-                    pass  # keep label as string if conversion fails
-                values.append(current_values)
-                labels.append(current_label)
-    except FileNotFoundError:
-        print(f"File not found: {filepath}")
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-    return values, labels
-
-def normalize(data):
-    """
-    Normalizes data columns to range [0, 1].
-    
-    For each column:
-      1. Find the minimum and maximum.
-      2. Scale each value: (x - min) / (max - min).
-      3. If all values are the same, set to 0.5.
-    Returns a list of normalized rows.
-    """
-    if not data:
-        return data
-    try:
-        # Transpose rows to columns
-        columns = list(zip(*data))
-        norm_columns = []
-        for col in columns:
-            try:
-                min_val = min(col)
-                max_val = max(col)
-            except Exception as e:
-                print("Error computing min/max for a column:", e)
-                min_val, max_val = 0, 0
-            if max_val == min_val:
-                norm_col = [0.5] * len(col)  # if all values are the same, use 0.5
-            else:
-                norm_col = [(x - min_val) / (max_val - min_val) for x in col]
-            norm_columns.append(norm_col)
-        # Transpose columns back to rows
-        normalized_data = [list(row) for row in zip(*norm_columns)]
-    except Exception as e:
-        print("Error during normalization:", e)
-        normalized_data = data
-    return normalized_data
-
-def batches(data, labels, batch_size):
-    """
-    Splits data and labels into mini-batches of a given size.
-    
-    data: list of input vectors (each input is a feature list)
-    labels: list of labels for each input
-    batch_size: desired size for each mini-batch (must be > 0)
-    
-    Returns:
-      - batch_data: list of feature batches
-      - batch_labels: list of label batches
-    """
-    if batch_size <= 0:
-        raise ValueError("Batch size must be a positive integer.")
-    batch_data = []    # batches of inputs
-    batch_labels = []  # batches of labels
-    for i in range(0, len(data), batch_size):
-        batch_data.append(data[i:i+batch_size])
-        batch_labels.append(labels[i:i+batch_size])
-    return batch_data, batch_labels
\ No newline at end of file
+import csv
+import itertools
+import json
+import struct
+from collections import deque
+
+import numpy as np
+
+from .normalizer import Normalizer
+from .stats import RunningStats
+
+def load_csv(filepath, delimiter=',', has_header=True):
+    """
+    Loads data from a CSV file.
+    
+    Each row should contain features (all columns except the last) and the last column is the label.
+    Returns two lists:
+      - values: list of feature lists (floats)
+      - labels: list of labels (float if possible, else string)
+    """
+    values = []  # features go here
+    labels = []  # labels go here
+    try:
+        with open(filepath, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            if has_header:
+                next(reader)  # skip header
+            for row in reader:
+                if not row or all(cell.strip() == '' for cell in row):
+                    continue  # skip empty rows
+                try:
+                    # Convert all but the last column to floats
+                    current_values = [float(x) for x in row[:-1]]
+                except ValueError:
+                    # Skip row if conversion fails
+                    continue
+                current_label = row[-1]  # last column is the label
+                try:
+                    # Convert label to float if possible
+                    current_label = float(current_label)
+                except ValueError:
+                    pass  # keep label as string if conversion fails
+                values.append(current_values)
+                labels.append(current_label)
+    except FileNotFoundError:
+        print(f"File not found: {filepath}")
+    except Exception as e:
+        print(f"Error reading CSV: {e}")
+    return values, labels
+
+def normalize(data):
+    """
+    Normalizes data columns to range [0, 1].
+    
+    For each column:
+      1. Find the minimum and maximum.
+      2. Scale each value: (x - min) / (max - min).
+      3. If all values are the same, set to 0.5.
+    Returns a list of normalized rows (an array if data is an array).
+
+    The minimum and maximum are forgotten afterwards; to scale new inputs
+    the same way (or undo the scaling), use a fitted Normalizer instead.
+    """
+    if len(data) == 0:
+        return data
+    normalized = Normalizer('minmax').fit_transform(data)
+    return normalized if isinstance(data, np.ndarray) else normalized.tolist()
+
+def batches(data, labels, batch_size):
+    """
+    Splits data and labels into mini-batches of a given size.
+    
+    data: list of input vectors (each input is a feature list)
+    labels: list of labels for each input
+    batch_size: desired size for each mini-batch (must be > 0)
+    
+    Returns:
+      - batch_data: list of feature batches
+      - batch_labels: list of label batches
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer.")
+    batch_data = []    # batches of inputs
+    batch_labels = []  # batches of labels
+    for i in range(0, len(data), batch_size):
+        batch_data.append(data[i:i+batch_size])
+        batch_labels.append(labels[i:i+batch_size])
+    return batch_data, batch_labels
+
+
+def _parse_lines(lines, delimiter, feature_idx, label_idx, dtype):
+    """
+    Parses raw CSV lines into feature and label arrays.
+
+    Rows that are empty are skipped; rows with a missing or non-numeric
+    value in a selected column are counted as bad and skipped.
+    Returns (features, labels, bad_row_count). Defined at module level so
+    worker processes can run it.
+    """
+    features = []
+    labels = []
+    bad = 0
+    for row in csv.reader(lines, delimiter=delimiter):
+        if not row or all(cell.strip() == '' for cell in row):
+            continue  # skip empty rows
+        try:
+            current_features = [float(row[i]) for i in feature_idx]
+            current_labels = [float(row[i]) for i in label_idx]
+        except (ValueError, IndexError):
+            bad += 1  # count and skip rows that cannot be parsed
+            continue
+        features.append(current_features)
+        labels.append(current_labels)
+    features = np.array(features, dtype=dtype).reshape(len(features), len(feature_idx))
+    labels = np.array(labels, dtype=dtype).reshape(len(labels), len(label_idx))
+    return features, labels, bad
+
+def _resolve_columns(columns, header, num_columns):
+    # Turns a list of column indices and/or header names into indices.
+    if isinstance(columns, (int, str)):
+        columns = [columns]
+    indices = []
+    for column in columns:
+        if isinstance(column, str):
+            if column not in header:
+                raise ValueError(f"Column '{column}' not found in CSV header.")
+            column = header.index(column)
+        index = column + num_columns if column < 0 else column
+        if not 0 <= index < num_columns:
+            raise ValueError(f"Column index {column} is out of range for a CSV with {num_columns} columns.")
+        indices.append(index)
+    return indices
+
+class CSVStream:
+    def __init__(self, filepath, chunk_size=1024, feature_cols=None, label_cols=None,
+                 delimiter=',', has_header=True, dtype='float64', workers=0):
+        """
+        Reads a CSV file in fixed-size chunks of NumPy arrays.
+
+        Iterating yields (features, labels) pairs of shape (chunk_size, num_features)
+        and (chunk_size, num_labels); only the last chunk can be smaller. Only one
+        chunk (plus a few blocks being parsed) is in memory at a time, so memory use
+        does not depend on the size of the file.
+
+        chunk_size: rows per chunk; use the batch size to get mini-batches directly.
+        feature_cols, label_cols: column indices or header names. By default the
+            last column is the label and all other columns are features.
+        dtype: 'float64' or 'float32'.
+        workers: number of processes that parse blocks of lines in parallel
+            (0 parses in this process). Parallel parsing splits the file on line
+            breaks, so quoted fields must not contain newlines.
+
+        After (or during) iteration, rows holds the number of rows read and
+        bad_rows the number of rows skipped because they could not be parsed.
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive integer.")
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self.feature_cols = feature_cols
+        self.label_cols = label_cols
+        self.delimiter = delimiter
+        self.has_header = has_header
+        self.dtype = np.dtype(dtype)
+        self.workers = workers
+        self.header = []
+        self.rows = 0       # rows successfully parsed
+        self.bad_rows = 0   # rows skipped because of missing or bad values
+
+    def __iter__(self):
+        self.rows = 0
+        self.bad_rows = 0
+        with open(self.filepath, 'r', newline='', encoding='utf-8') as file:
+            if self.has_header:
+                self.header = next(csv.reader([file.readline()], delimiter=self.delimiter), [])
+            block_lines = self.chunk_size if not self.workers else max(self.chunk_size, 8192)
+            blocks = iter(lambda: list(itertools.islice(file, block_lines)), [])
+            first = next(blocks, None)
+            if first is None:
+                return
+            feature_idx, label_idx = self._columns(first)
+            blocks = itertools.chain([first], blocks)
+            args = (self.delimiter, feature_idx, label_idx, self.dtype)
+            if self.workers:
+                parsed = self._parse_parallel(blocks, args)
+            else:
+                parsed = (_parse_lines(block, *args) for block in blocks)
+            yield from _rechunk(self._count(parsed), self.chunk_size)
+
+    def read_all(self):
+        """
+        Reads the whole file and returns (features, labels) as two arrays.
+        Only use this when the data fits in memory.
+        """
+        chunks = list(self)
+        if not chunks:
+            return np.empty((0, 0), dtype=self.dtype), np.empty((0, 0), dtype=self.dtype)
+        features, labels = zip(*chunks)
+        return np.concatenate(features), np.concatenate(labels)
+
+    def _columns(self, first_block):
+        # Works out the feature and label column indices.
+        if self.header:
+            num_columns = len(self.header)
+        else:
+            first_row = next((row for row in csv.reader(first_block, delimiter=self.delimiter) if row), [])
+            num_columns = len(first_row)
+        label_cols = self.label_cols if self.label_cols is not None else [num_columns - 1]
+        label_idx = _resolve_columns(label_cols, self.header, num_columns)
+        if self.feature_cols is not None:
+            feature_idx = _resolve_columns(self.feature_cols, self.header, num_columns)
+        else:
+            feature_idx = [i for i in range(num_columns) if i not in label_idx]
+        return feature_idx, label_idx
+
+    def _parse_parallel(self, blocks, args):
+        # Parses blocks in worker processes, keeping at most two blocks per
+        # worker in flight so memory stays bounded. Results keep file order.
+        import multiprocessing
+        with multiprocessing.Pool(self.workers) as pool:
+            pending = deque()
+            for block in blocks:
+                pending.append(pool.apply_async(_parse_lines, (block,) + args))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    def _count(self, parsed):
+        # Keeps the row counters up to date as parsed blocks go by.
+        for features, labels, bad in parsed:
+            self.bad_rows += bad
+            self.rows += len(features)
+            yield features, labels
+
+def _rechunk(chunks, size):
+    """
+    Regroups (features, labels) chunks of any length into chunks of exactly
+    size rows; only the last one can be smaller. Rows are copied only when
+    a chunk spans two input chunks.
+    """
+    pending_features, pending_labels, count = [], [], 0
+    for features, labels in chunks:
+        if len(features) == 0:
+            continue
+        pending_features.append(features)
+        pending_labels.append(labels)
+        count += len(features)
+        while count >= size:
+            features = np.concatenate(pending_features) if len(pending_features) > 1 else pending_features[0]
+            labels = np.concatenate(pending_labels) if len(pending_labels) > 1 else pending_labels[0]
+            yield features[:size], labels[:size]
+            pending_features = [features[size:]]
+            pending_labels = [labels[size:]]
+            count -= size
+    if count:
+        yield np.concatenate(pending_features), np.concatenate(pending_labels)
+
+def stream_csv(filepath, chunk_size=1024, **options):
+    """
+    Returns a CSVStream over filepath; see CSVStream for the options.
+
+    Example:
+        stream = stream_csv("data.csv", chunk_size=32, label_cols=['Salary'])
+        for features, labels in stream:
+            ...
+        print(stream.bad_rows, "bad rows skipped")
+    """
+    return CSVStream(filepath, chunk_size=chunk_size, **options)
+
+
+# Binary dataset cache.
+#
+# Layout of a cache file:
+#   bytes 0-31   preamble: magic b'ORDODATA', format version (uint32), padding,
+#                offset and length of the JSON header (two uint64)
+#   bytes 64-    one row-major block of rows x (features + labels) floats,
+#                each row holding a sample's features followed by its labels
+#   at the end   JSON header: dtype, shape, column names and the per-column
+#                statistics collected while converting
+# Rows are stored whole (not column by column) because mini-batches read whole
+# rows; the header goes at the end so the file can be written in one pass.
+
+CACHE_MAGIC = b'ORDODATA'
+CACHE_VERSION = 1
+_CACHE_PREAMBLE = struct.Struct('<8sI4xQQ')
+_CACHE_DATA_OFFSET = 64
+
+def csv_to_cache(csv_path, cache_path, dtype='float32', chunk_size=65536, **options):
+    """
+    Converts a CSV file into a binary cache that MappedDataset can open.
+
+    The CSV is streamed (see CSVStream; feature_cols, label_cols, delimiter,
+    has_header and workers are passed through), so this works for files larger
+    than memory. Min, max, mean and variance of every column are collected in
+    the same pass and stored in the header.
+    dtype: 'float32' (half the size) or 'float64'.
+    Returns the opened MappedDataset.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("Cache dtype must be float32 or float64.")
+    stream = CSVStream(csv_path, chunk_size=chunk_size, dtype=dtype, **options)
+    feature_stats = label_stats = None
+    rows = 0
+    with open(cache_path, 'wb') as file:
+        file.write(b'\0' * _CACHE_DATA_OFFSET)  # preamble is filled in at the end
+        for features, labels in stream:
+            if feature_stats is None:
+                feature_stats = RunningStats(features.shape[1])
+                label_stats = RunningStats(labels.shape[1])
+            feature_stats.update(features)
+            label_stats.update(labels)
+            file.write(np.hstack([features, labels]).tobytes())
+            rows += len(features)
+        if feature_stats is None:
+            raise ValueError(f"No valid rows found in {csv_path}.")
+
+        header = {
+            'dtype': dtype.name,
+            'rows': rows,
+            'features': feature_stats.num_columns,
+            'labels': label_stats.num_columns,
+            'header': stream.header,
+            'bad_rows': stream.bad_rows,
+            'feature_stats': feature_stats.to_dict(),
+            'label_stats': label_stats.to_dict(),
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        header_offset = file.tell()
+        file.write(header_bytes)
+        file.seek(0)
+        file.write(_CACHE_PREAMBLE.pack(CACHE_MAGIC, CACHE_VERSION, header_offset, len(header_bytes)))
+    return MappedDataset(cache_path)
+
+class MappedDataset:
+    def __init__(self, cache_path):
+        """
+        Opens a cache written by csv_to_cache with a read-only memory map.
+
+        Nothing is read up front: features and labels are views into the mapped
+        file, and the operating system pages data in as it is used.
+        """
+        with open(cache_path, 'rb') as file:
+            magic, version, header_offset, header_length = _CACHE_PREAMBLE.unpack(
+                file.read(_CACHE_PREAMBLE.size))
+            if magic != CACHE_MAGIC:
+                raise ValueError(f"{cache_path} is not an OrdoNet dataset cache.")
+            if version != CACHE_VERSION:
+                raise ValueError(f"Unsupported dataset cache version {version}.")
+            file.seek(header_offset)
+            self.info = json.loads(file.read(header_length).decode('utf-8'))
+        self.path = cache_path
+        self.num_features = self.info['features']
+        self.num_labels = self.info['labels']
+        self.data = np.memmap(cache_path, dtype=self.info['dtype'], mode='r',
+                              offset=_CACHE_DATA_OFFSET,
+                              shape=(self.info['rows'], self.num_features + self.num_labels))
+        self.features = self.data[:, :self.num_features]  # (rows, features) view
+        self.labels = self.data[:, self.num_features:]     # (rows, labels) view
+        # Statistics of the raw values, collected during conversion.
+        self.feature_stats = RunningStats.from_dict(self.info['feature_stats'])
+        self.label_stats = RunningStats.from_dict(self.info['label_stats'])
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        # Returns (features, labels) for an index, slice or array of indices.
+        return self.features[index], self.labels[index]
+
+    def batches(self, batch_size, shuffle=True, seed=None, drop_last=False):
+        """
+        Yields (features, labels) mini-batches as in-memory arrays.
+
+        Only the rows of the current batch are read from the file. With
+        shuffle, every epoch visits the rows in a new random order; the row
+        indices of each batch are sorted before reading so the reads move
+        forward through the file.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        rows = len(self)
+        order = np.random.default_rng(seed).permutation(rows) if shuffle else None
+        stop = rows - rows % batch_size if drop_last else rows
+        for start in range(0, stop, batch_size):
+            if order is None:
+                block = self.data[start:start + batch_size]
+            else:
+                block = self.data[np.sort(order[start:start + batch_size])]
+            block = np.asarray(block)
+            yield block[:, :self.num_features], block[:, self.num_features:]
@@ -0,0 +1,214 @@
+import threading
+
+import numpy as np
+
+from .network import Network
+from .workspace import Workspace
+
+# Many same-shape networks evaluated as one.
+#
+# The weights of every model are stacked along a new first axis, so layer l
+# holds a (models, inputs, outputs) tensor and one np.matmul call runs all
+# models at once: a shared (rows, inputs) batch broadcasts against the
+# stack, and the hidden activations are (models, rows, units) tensors. The
+# cost of N small models becomes about that of one wide one, without a
+# Python loop over models.
+#
+# Hidden activations of this size are too big for NumPy to allocate quickly
+# on every call, so they come from a Workspace, one per thread; the final
+# outputs are always new arrays, and any number of threads can predict at once.
+
+class Ensemble:
+    def __init__(self, networks):
+        """
+        Stacks the parameters of networks with the same layer sizes,
+        activations and dtype, e.g. one model per customer segment.
+
+        Attached normalizers are applied per model (or once, when all models
+        share the same scaling), so predictions are on the original scale
+        like Network.predict. The parameters are copied, so later changes
+        to the networks do not affect the ensemble.
+        """
+        networks = list(networks)
+        if not networks:
+            raise ValueError("An ensemble needs at least one network.")
+        first = networks[0]
+        for net in networks:
+            if not isinstance(net, Network):
+                raise ValueError("Ensemble members must be Network objects.")
+            activations = [layer.activation.name for layer in net.layers]
+            if (net.layer_sizes != first.layer_sizes or net.dtype != first.dtype
+                    or activations != [layer.activation.name for layer in first.layers]):
+                raise ValueError("Ensemble members must have the same layer sizes, activations and dtype.")
+        self.layer_sizes = list(first.layer_sizes)
+        self.dtype = first.dtype
+        self.activations = [layer.activation for layer in first.layers]
+        # Layer l: weights (models, inputs, outputs), already transposed for
+        # inputs @ weights, and biases (models, 1, outputs).
+        self.weights = []
+        self.biases = []
+        for index in range(len(first.layers)):
+            layers = [net.layers[index] for net in networks]
+            self.weights.append(np.stack([layer.weights.T for layer in layers]))
+            self.biases.append(np.stack([layer.biases for layer in layers])[:, None, :])
+        self.input_scaling = _stack_normalizers([net.input_normalizer for net in networks],
+                                                self.layer_sizes[0], self.dtype)
+        self.target_scaling = _stack_normalizers([net.target_normalizer for net in networks],
+                                                 self.layer_sizes[-1], self.dtype)
+        self._local = threading.local()
+
+    @classmethod
+    def from_files(cls, paths, mmap=True):
+        """
+        Loads checkpoints written by Network.save and stacks them. With mmap
+        each file is only mapped while its parameters are copied into the stack.
+        """
+        return cls(Network.from_file(path, mmap=mmap) for path in paths)
+
+    def __len__(self):
+        return len(self.weights[0])
+
+    def predict_all(self, inputs):
+        """
+        Runs every model on every input in one pass.
+
+        inputs: one input vector, or a (batch, features) array.
+        Returns an array of shape (models, batch, outputs), or (models,
+        outputs) for one vector.
+        """
+        data, single = self._inputs(inputs)
+        if self.input_scaling is not None:
+            offset, scale = self.input_scaling
+            # Scaled once if all models share the scaling, else per model.
+            data = (data - offset) / scale
+        output = self._forward(data)
+        if self.target_scaling is not None:
+            offset, scale = self.target_scaling
+            output *= scale
+            output += offset
+        return output[:, 0] if single else output
+
+    def predict(self, inputs, weights=None):
+        """
+        Averaging ensemble: the (weighted) mean of all models' predictions.
+
+        weights: optional weight per model, e.g. from validation scores;
+            they are scaled to sum to 1.
+        Returns (batch, outputs), or (outputs,) for one input vector.
+        """
+        outputs = self.predict_all(inputs)
+        if weights is None:
+            return outputs.mean(axis=0)
+        weights = np.asarray(weights, dtype=self.dtype)
+        if weights.shape != (len(self),):
+            raise ValueError(f"Expected {len(self)} model weights, got shape {weights.shape}.")
+        return np.tensordot(weights / weights.sum(), outputs, axes=1)
+
+    def vote(self, inputs):
+        """
+        Voting ensemble for classifiers: every model picks a class (argmax
+        of its outputs, or output > 0.5 for a single output) and the class
+        with the most votes wins; ties go to the lower class index.
+        Returns class indices of shape (batch,), or a single index for one vector.
+        """
+        outputs = self.predict_all(inputs)
+        if outputs.shape[-1] == 1:
+            labels = (outputs[..., 0] > 0.5).astype(np.intp)
+            classes = 2
+        else:
+            labels = outputs.argmax(axis=-1)
+            classes = outputs.shape[-1]
+        counts = (labels[..., None] == np.arange(classes)).sum(axis=0)
+        return counts.argmax(axis=-1)
+
+    def predict_each(self, inputs, models):
+        """
+        Scores every input with its own model, e.g. each customer with the
+        model of their segment, in one pass for all models.
+
+        inputs: (batch, features) array.
+        models: model index of each input row, shape (batch,).
+        Returns (batch, outputs). Rows are grouped by model and padded to
+        the largest group, so the cost is about (models x largest group)
+        rows: best when the groups are of similar size.
+        """
+        data, _ = self._inputs(inputs)
+        models = np.asarray(models, dtype=np.intp)
+        if models.shape != (len(data),):
+            raise ValueError("models must hold one model index per input row.")
+        if len(data) == 0:
+            return np.empty((0, self.layer_sizes[-1]), dtype=self.dtype)
+        if models.min() < 0 or models.max() >= len(self):
+            raise ValueError(f"Model indices must be from 0 to {len(self) - 1}.")
+        # Position of every row within its model's group.
+        order = np.argsort(models, kind='stable')
+        counts = np.bincount(models, minlength=len(self))
+        starts = np.cumsum(counts) - counts
+        sorted_models = models[order]
+        slots = np.arange(len(data)) - starts[sorted_models]
+        grouped = np.zeros((len(self), counts.max(), data.shape[1]), dtype=self.dtype)
+        grouped[sorted_models, slots] = data[order]
+        if self.input_scaling is not None:
+            offset, scale = self.input_scaling
+            grouped -= offset
+            grouped /= scale
+        output = self._forward(grouped)
+        if self.target_scaling is not None:
+            offset, scale = self.target_scaling
+            output *= scale
+            output += offset
+        result = np.empty((len(data), output.shape[-1]), dtype=self.dtype)
+        result[order] = output[sorted_models, slots]
+        return result
+
+    def _inputs(self, inputs):
+        # (batch, features) array in the ensemble's dtype, and whether the
+        # input was a single vector.
+        data = np.asarray(inputs, dtype=self.dtype)
+        single = data.ndim == 1
+        if single:
+            data = data.reshape(1, -1)
+        if data.ndim != 2 or data.shape[1] != self.layer_sizes[0]:
+            raise ValueError(f"Expected inputs with {self.layer_sizes[0]} features.")
+        return data, single
+
+    def _forward(self, data):
+        # data: (rows, inputs) shared by all models, or (models, rows, inputs).
+        workspace = getattr(self._local, 'workspace', None)
+        if workspace is None:
+            workspace = self._local.workspace = Workspace()
+        models, rows = len(self), data.shape[-2]
+        last = len(self.weights) - 1
+        for index, (weights, biases, activation) in enumerate(zip(self.weights, self.biases, self.activations)):
+            shape = (models, rows, weights.shape[2])
+            if index == last:
+                out = np.empty(shape, dtype=self.dtype)
+            else:
+                # The first models * rows rows of a (models * rows, units)
+                # array, so a smaller batch reuses it as well.
+                out = workspace.get(index, (models * rows, shape[2]), self.dtype).reshape(shape)
+            np.matmul(data, weights, out=out)
+            out += biases
+            data = activation.forward(out, out=out)
+        return data
+
+def _stack_normalizers(normalizers, width, dtype):
+    # (offset, scale) so that scaled = (x - offset) / scale for every model:
+    # rows of shape (width,) when all models scale alike, else (models, 1,
+    # width) so they broadcast against per-model tensors. None if no model
+    # has a normalizer.
+    if all(normalizer is None for normalizer in normalizers):
+        return None
+    offsets, scales = [], []
+    for normalizer in normalizers:
+        if normalizer is None:
+            offsets.append(np.zeros(width))
+            scales.append(np.ones(width))
+        else:
+            offset, scale = normalizer._parameters()
+            offsets.append(offset)
+            scales.append(scale)
+    offsets, scales = np.array(offsets, dtype=dtype), np.array(scales, dtype=dtype)
+    if (offsets == offsets[0]).all() and (scales == scales[0]).all():
+        return offsets[0], scales[0]
+    return offsets[:, None, :], scales[:, None, :]
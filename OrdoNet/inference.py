@@ -0,0 +1,49 @@
+"""
+Lightweight inference entry point: load a checkpoint and predict.
+
+Importing this module loads only what inference needs (NumPy and the
+layer, activation, loss, normalizer and checkpoint modules); the training,
+data loading, plotting and multiprocessing code is never imported. Meant
+for short-lived scoring processes:
+
+    python -m OrdoNet.inference model.ckpt 5.0        # one input vector
+    python -m OrdoNet.inference model.ckpt < rows.txt # one JSON list per line
+"""
+import json
+import sys
+
+from .checkpoint import read_checkpoint
+
+def load_model(path, mmap=True):
+    """
+    Loads a Network, Sequential or QuantizedNetwork checkpoint, whichever
+    the file holds.
+
+    mmap: use the parameters straight from the file (copy-on-write), so a
+    large model is ready as soon as the header has been read.
+    """
+    header, _ = read_checkpoint(path, mmap=True)
+    if header.get('model') == 'QuantizedNetwork':
+        from .quantize import QuantizedNetwork
+        return QuantizedNetwork.from_file(path, mmap=mmap)
+    if header.get('model') == 'Sequential':
+        from .sequential import Sequential
+        return Sequential.from_file(path, mmap=mmap)
+    from .network import Network
+    return Network.from_file(path, mmap=mmap)
+
+def main(args):
+    if not args:
+        print("Usage: python -m OrdoNet.inference model.ckpt [x1 x2 ...]")
+        return 1
+    model = load_model(args[0])
+    if len(args) > 1:
+        print(json.dumps(model.predict([float(value) for value in args[1:]]).tolist()))
+        return 0
+    for line in sys.stdin:
+        if line.strip():
+            print(json.dumps(model.predict(json.loads(line)).tolist()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,39 +1,188 @@
-from neuron import Neuron
-
-class Layer:
-    def __init__(self, num_neurons, num_inputs):
-        # Create a layer as a list of neurons.
-        self.neurons = [Neuron(num_inputs) for _ in range(num_neurons)]
-
-    def forward(self, inputs):
-        # Calculate outputs for all neurons in the layer.
-        self.inputs = inputs  # Save inputs for backpropagation.
-        return [neuron.forward(inputs) for neuron in self.neurons]
-
-    def backward(self, d_outputs):
-        """
-        Computes gradients for each neuron using output errors and aggregates input gradients.
-        
-        d_outputs: list of error gradients for each neuron in this layer.
-        Returns:
-          - grad_weights_all: list of weight gradients for each neuron.
-          - grad_biases_all: list of bias gradients for each neuron.
-          - d_inputs: aggregated gradients with respect to inputs (to propagate to previous layer).
-        """
-        # Compute gradients for each neuron.
-        # Each neuron.backward returns: (grad_weights, grad_bias, d_inputs)
-        grads = [neuron.backward(d_out) for neuron, d_out in zip(self.neurons, d_outputs)]
-        grad_weights_all, grad_biases_all, d_inputs_list = zip(*grads)
-        
-        # Aggregate input gradients: sum d_inputs from each neuron element-wise.
-        d_inputs = [0.0 for _ in range(len(self.inputs))]
-        for d in d_inputs_list:
-            for j, val in enumerate(d):
-                d_inputs[j] += val
-
-        return list(grad_weights_all), list(grad_biases_all), d_inputs
-
-    def update_weights(self, lr, grad_weights_all, grad_biases_all):
-        # Update weights and biases for each neuron using given gradients and learning rate.
-        for neuron, grad_w, grad_b in zip(self.neurons, grad_weights_all, grad_biases_all):
-            neuron.update(grad_w, grad_b, lr)
\ No newline at end of file
+import numpy as np
+from .activation import get_activation
+from .matrix import Matrix
+from .neuron import NeuronView
+
+class Layer:
+    def __init__(self, num_neurons, num_inputs, activation='sigmoid', dtype='float64', initialize=True):
+        """
+        Creates a fully-connected layer backed by one NumPy buffer.
+
+        All weights and biases live in a single contiguous array of shape
+        (num_neurons, num_inputs + 1). Each row holds one neuron's weights
+        followed by its bias, which is the same order get_parameters uses.
+
+        activation: name of the activation ('sigmoid', 'tanh', 'relu',
+        'linear', 'softmax') or an activation object.
+        dtype: 'float64' or 'float32' (half the memory, faster matrix products).
+        Inputs and gradients are converted to this type as well.
+        initialize: start with random weights; pass False (all zeros) when
+        the values will be loaded or copied in anyway.
+        """
+        self.num_neurons = num_neurons
+        self.num_inputs = num_inputs
+        self.activation = get_activation(activation)
+        self.params = None
+        self.grads = None
+        # Weights and biases start with random values from -1 to 1.
+        # Gradients use the same layout as the parameters.
+        dtype = np.dtype(dtype)
+        shape = (num_neurons, num_inputs + 1)
+        if initialize:
+            params = np.random.uniform(-1, 1, shape).astype(dtype)
+        else:
+            params = np.zeros(shape, dtype=dtype)
+        self.bind(params, np.zeros(shape, dtype=dtype))
+        # Per-neuron views so code written for Neuron objects keeps working.
+        self.neurons = [NeuronView(self, i) for i in range(num_neurons)]
+        self.inputs = None   # Saved input vector for backpropagation.
+        self.outputs = None  # Saved output vector (after activation).
+
+    @property
+    def num_params(self):
+        # Weights plus one bias per neuron.
+        return self.num_neurons * (self.num_inputs + 1)
+
+    def bind(self, params, grads, copy=True):
+        """
+        Makes the layer use the given arrays as its parameter and gradient storage.
+
+        params, grads: arrays of shape (num_neurons, num_inputs + 1), usually
+        views into a Network's flat buffers. From then on the layer reads and
+        writes the given arrays directly (no copies).
+        copy: copy the current parameter values into params first; pass False
+        when params already holds the values to use (e.g. shared memory).
+        """
+        shape = (self.num_neurons, self.num_inputs + 1)
+        if params.shape != shape or grads.shape != shape:
+            raise ValueError(f"Layer buffers must have shape {shape}.")
+        if copy and self.params is not None:
+            params[...] = self.params
+        self.params = params
+        self.grads = grads
+        self.dtype = params.dtype
+        self.weights = params[:, :-1]  # view: (num_neurons, num_inputs)
+        self.biases = params[:, -1]    # view: (num_neurons,)
+
+    def weight_matrix(self):
+        # The weights as a Matrix that shares memory with this layer (no copy).
+        return Matrix.from_array(self.weights)
+
+    def forward(self, inputs, workspace=None):
+        """
+        Calculates outputs for all neurons in the layer with one matrix product.
+
+        inputs: one input vector, or a (batch, num_inputs) array.
+        workspace: optional workspace.Workspace; a batch is then computed in
+            arrays kept there instead of new ones, and the returned outputs
+            are overwritten by the next forward call with the same workspace.
+        """
+        self.inputs = np.asarray(inputs, dtype=self.dtype)  # Save inputs for backpropagation.
+        if workspace is None or self.inputs.ndim != 2:
+            z = self.inputs @ self.weights.T + self.biases
+            self.outputs = self.activation.forward(z)
+            return self.outputs
+        shape = (len(self.inputs), self.num_neurons)
+        z = workspace.get((self, 'outputs'), shape, self.dtype)
+        np.matmul(self.inputs, self.weights.T, out=z)
+        # Adding a row to a batch in place makes NumPy allocate a temporary
+        # buffer; a batch-shaped copy of the biases avoids it. The delta
+        # array is free until backward.
+        rows = workspace.get((self, 'delta'), shape, self.dtype)
+        np.copyto(rows, self.biases)
+        z += rows
+        self.outputs = self.activation.forward(z, out=z)
+        return self.outputs
+
+    def infer(self, inputs):
+        """
+        Calculates outputs like forward, but without saving inputs and
+        outputs for backpropagation.
+
+        Nothing on the layer is changed, so several threads can run
+        inference on the same layer at once.
+        """
+        z = np.asarray(inputs, dtype=self.dtype) @ self.weights.T
+        z += self.biases
+        return self.activation.forward(z)
+
+    def forward_batch(self, inputs):
+        """
+        Calculates outputs for a whole mini-batch at once.
+
+        inputs: array of shape (batch, num_inputs), one sample per row.
+        Returns an array of shape (batch, num_neurons).
+        """
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        if inputs.ndim != 2:
+            raise ValueError("forward_batch expects a 2D (batch, num_inputs) input.")
+        return self.forward(inputs)
+
+    def backward(self, d_outputs, workspace=None):
+        """
+        Computes gradients for the whole layer using output errors.
+
+        d_outputs: error gradients for each neuron in this layer (a vector,
+        or a (batch, num_neurons) array after a batched forward pass).
+        workspace: optional workspace.Workspace for the batch intermediates
+            (see forward); d_inputs is then an array kept there.
+        Returns:
+          - grad_weights_all: weight gradients, one row per neuron.
+          - grad_biases_all: bias gradients, one per neuron.
+          - d_inputs: gradients with respect to inputs (to propagate to previous layer).
+        """
+        d_outputs = np.asarray(d_outputs, dtype=self.dtype)
+        # The activation turns output errors into errors of the weighted sums,
+        # using the outputs saved by forward.
+        if workspace is None or d_outputs.ndim != 2:
+            delta = self.activation.backward(self.outputs, d_outputs)
+        else:
+            delta = self.activation.backward(self.outputs, d_outputs,
+                                             out=workspace.get((self, 'delta'), d_outputs.shape, self.dtype))
+        return self.backward_delta(delta, workspace)
+
+    def backward_batch(self, d_outputs):
+        """
+        Computes gradients for a whole mini-batch.
+
+        d_outputs: array of shape (batch, num_neurons) with the error of every sample.
+        Gradients are summed over the batch, so scale d_outputs to get an average.
+        Returns the same three values as backward, with d_inputs of shape (batch, num_inputs).
+        """
+        return self.backward(d_outputs)
+
+    def backward_delta(self, delta, workspace=None):
+        """
+        Computes gradients from the error of the weighted sums (after the activation).
+
+        Used directly when the activation gradient is fused with the loss,
+        e.g. softmax followed by cross-entropy.
+        workspace: see backward.
+        """
+        delta = np.asarray(delta, dtype=self.dtype)
+        grad_weights_all = self.grads[:, :-1]
+        grad_biases_all = self.grads[:, -1]
+        if delta.ndim == 1:
+            # One sample: delta (outer) inputs.
+            np.outer(delta, self.inputs, out=grad_weights_all)
+            grad_biases_all[:] = delta
+        else:
+            # Sum of per-sample outer products is a single matrix product.
+            np.matmul(delta.T, self.inputs, out=grad_weights_all)
+            np.sum(delta, axis=0, out=grad_biases_all)
+        # Input gradients summed over all neurons.
+        if workspace is None or delta.ndim != 2:
+            d_inputs = delta @ self.weights
+        else:
+            d_inputs = workspace.get((self, 'd_inputs'), (len(delta), self.num_inputs), self.dtype)
+            np.matmul(delta, self.weights, out=d_inputs)
+        return grad_weights_all, grad_biases_all, d_inputs
+
+    def update_weights(self, lr, grad_weights_all=None, grad_biases_all=None):
+        # Update weights and biases for the whole layer using given gradients and learning rate.
+        # Without explicit gradients, the ones stored by the last backward pass are used.
+        if grad_weights_all is None and grad_biases_all is None:
+            self.params -= lr * self.grads
+            return
+        self.weights -= lr * np.asarray(grad_weights_all, dtype=self.dtype)
+        self.biases -= lr * np.asarray(grad_biases_all, dtype=self.dtype)
@@ -1,31 +1,279 @@
-class Loss:
-    @staticmethod
-    def mse(y_true, y_pred):
-        """
-        Mean Squared Error: measures how far predictions are from true values.
-        
-        Both y_true and y_pred should be lists of numbers of equal length.
-        """
-        if len(y_true) == 0:
-            raise ValueError("y_true is empty.")
-        if len(y_true) != len(y_pred):
-            raise ValueError("y_true and y_pred must have the same length.")
-        error = 0.0  # sum of squared differences
-        for yt, yp in zip(y_true, y_pred):
-            error += (yt - yp) ** 2  # add squared difference
-        return error / len(y_true)  # average error
-
-    @staticmethod
-    def mse_deriv(y_true, y_pred):
-        """
-        Derivative of MSE: gives the gradient for each (true, predicted) pair.
-        
-        Both y_true and y_pred should be lists of numbers of equal length.
-        """
-        if len(y_true) == 0:
-            raise ValueError("y_true is empty.")
-        if len(y_true) != len(y_pred):
-            raise ValueError("y_true and y_pred must have the same length.")
-        n = len(y_true)  # total number of values
-        # Calculate gradient for each pair: (2 * (predicted - true)) / n
-        return [(2 * (yp - yt)) / n for yt, yp in zip(y_true, y_pred)]
\ No newline at end of file
+import numpy as np
+
+class Loss:
+    # Simple function-style interface, kept for existing code. These now
+    # use the batched loss classes defined below.
+
+    @staticmethod
+    def mse(y_true, y_pred):
+        """
+        Mean Squared Error: measures how far predictions are from true values.
+        
+        Both y_true and y_pred should be lists of numbers of equal length.
+        """
+        return MSE().value(y_true, y_pred)
+
+    @staticmethod
+    def mse_deriv(y_true, y_pred):
+        """
+        Derivative of MSE: gives the gradient for each (true, predicted) pair.
+        
+        Both y_true and y_pred should be lists of numbers of equal length.
+        """
+        return MSE().grad(y_true, y_pred).tolist()
+
+    @staticmethod
+    def mse_batch(y_true, y_pred):
+        """
+        Mean Squared Error over a whole mini-batch.
+
+        y_true and y_pred are arrays of shape (batch, outputs).
+        Returns the loss averaged over every sample and output.
+        """
+        return MSE().value(y_true, y_pred)
+
+    @staticmethod
+    def mse_batch_deriv(y_true, y_pred):
+        """
+        Derivative of mse_batch with respect to every prediction.
+
+        This is mse_deriv for each sample, averaged over the batch.
+        """
+        return MSE().grad(y_true, y_pred)
+
+    @staticmethod
+    def cross_entropy_batch(y_true, y_pred):
+        """
+        Categorical cross-entropy: -sum(y_true * log(y_pred)) per sample,
+        averaged over the batch.
+
+        y_true holds one-hot (or probability) targets; y_pred holds predicted
+        probabilities, e.g. from a softmax layer. Works on a single vector too.
+        """
+        return CategoricalCrossEntropy().value(y_true, y_pred)
+
+    @staticmethod
+    def cross_entropy_batch_deriv(y_true, y_pred):
+        """
+        Derivative of cross_entropy_batch with respect to every prediction.
+        """
+        return CategoricalCrossEntropy().grad(y_true, y_pred)
+
+
+# Batched losses.
+# Each loss works on (batch, outputs) arrays (or a single output vector) and
+# offers value, grad and value_and_grad; value_and_grad computes the shared
+# intermediate terms once and returns both the reduced loss and the gradient
+# with respect to y_pred.
+#
+# reduction decides how per-sample losses are combined:
+#   'mean' - average over the batch (gradients are divided by the batch size)
+#   'sum'  - sum over the batch
+#   'none' - return the per-sample losses as an array
+
+REDUCTIONS = ('mean', 'sum', 'none')
+
+class BatchLoss:
+    name = None
+    # Name of the output activation this loss can be fused with, if any.
+    fused_activation = None
+
+    def __init__(self, reduction='mean'):
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"Unknown reduction '{reduction}'. Choose from: {', '.join(REDUCTIONS)}.")
+        self.reduction = reduction
+
+    def value(self, y_true, y_pred):
+        """
+        Returns the loss, reduced over the batch.
+        """
+        y_true, y_pred = self._check(y_true, y_pred)
+        return self._reduce(self._per_sample(y_true, y_pred))
+
+    def grad(self, y_true, y_pred):
+        """
+        Returns the gradient of the reduced loss with respect to y_pred.
+        """
+        return self.value_and_grad(y_true, y_pred)[1]
+
+    def value_and_grad(self, y_true, y_pred):
+        """
+        Returns (loss, gradient) in one call.
+        """
+        y_true, y_pred = self._check(y_true, y_pred)
+        per_sample, grad = self._per_sample_and_grad(y_true, y_pred)
+        if self.reduction == 'mean':
+            grad /= self._samples(y_true)
+        return self._reduce(per_sample), grad
+
+    def to_dict(self):
+        # Name and settings, so the loss can be saved with a model.
+        return {'name': self.name, **vars(self)}
+
+    def fused_delta(self, y_true, y_pred):
+        """
+        Gradient with respect to the weighted sums of an output layer that
+        uses fused_activation, skipping the activation derivative entirely.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no fused gradient.")
+
+    @staticmethod
+    def _check(y_true, y_pred):
+        # Work in the predictions' float type (e.g. float32 for a float32
+        # network), converting anything else to float64.
+        y_pred = np.asarray(y_pred)
+        if y_pred.dtype.kind != 'f':
+            y_pred = y_pred.astype(float)
+        y_true = np.asarray(y_true, dtype=y_pred.dtype)
+        if y_true.size == 0:
+            raise ValueError("y_true is empty.")
+        if y_true.shape != y_pred.shape:
+            raise ValueError("y_true and y_pred must have the same shape.")
+        return y_true, y_pred
+
+    @staticmethod
+    def _samples(y):
+        # A single vector counts as a batch of one.
+        return 1 if y.ndim == 1 else len(y)
+
+    def _reduce(self, per_sample):
+        if self.reduction == 'none':
+            return per_sample
+        if self.reduction == 'sum':
+            return float(np.sum(per_sample))
+        return float(np.mean(per_sample))
+
+    def _scale_delta(self, delta, y_true):
+        if self.reduction == 'mean':
+            delta /= self._samples(y_true)
+        return delta
+
+class MSE(BatchLoss):
+    name = 'mse'
+
+    def _per_sample(self, y_true, y_pred):
+        diff = y_pred - y_true
+        return np.mean(diff * diff, axis=-1)
+
+    def _per_sample_and_grad(self, y_true, y_pred):
+        diff = y_pred - y_true
+        per_sample = np.mean(diff * diff, axis=-1)
+        diff *= 2 / y_true.shape[-1]
+        return per_sample, diff
+
+class MAE(BatchLoss):
+    name = 'mae'
+
+    def _per_sample(self, y_true, y_pred):
+        return np.mean(np.abs(y_pred - y_true), axis=-1)
+
+    def _per_sample_and_grad(self, y_true, y_pred):
+        diff = y_pred - y_true
+        per_sample = np.mean(np.abs(diff), axis=-1)
+        return per_sample, np.sign(diff) / y_true.shape[-1]
+
+class Huber(BatchLoss):
+    name = 'huber'
+
+    def __init__(self, delta=1.0, reduction='mean'):
+        """
+        Squared error for small errors, absolute error beyond delta.
+        """
+        super().__init__(reduction)
+        if delta <= 0:
+            raise ValueError("Huber delta must be positive.")
+        self.delta = delta
+
+    def _per_sample(self, y_true, y_pred):
+        return self._per_sample_and_grad(y_true, y_pred)[0]
+
+    def _per_sample_and_grad(self, y_true, y_pred):
+        diff = y_pred - y_true
+        small = np.minimum(np.abs(diff), self.delta)  # quadratic part
+        large = np.abs(diff) - small                  # linear part
+        per_sample = np.mean(0.5 * small * small + self.delta * large, axis=-1)
+        grad = np.clip(diff, -self.delta, self.delta)
+        grad /= y_true.shape[-1]
+        return per_sample, grad
+
+class BinaryCrossEntropy(BatchLoss):
+    name = 'binary_cross_entropy'
+    fused_activation = 'sigmoid'
+
+    def __init__(self, eps=1e-12, reduction='mean'):
+        """
+        Cross-entropy for independent 0/1 targets, averaged over the outputs.
+        """
+        super().__init__(reduction)
+        self.eps = eps  # keeps log() away from zero
+
+    def _clip(self, y_pred):
+        # 1 - 1e-12 rounds to 1 in float32, so never use an eps below the
+        # resolution of the predictions' dtype.
+        eps = max(self.eps, float(np.finfo(y_pred.dtype).eps))
+        return np.clip(y_pred, eps, 1 - eps)
+
+    def _per_sample(self, y_true, y_pred):
+        p = self._clip(y_pred)
+        return -np.mean(y_true * np.log(p) + (1 - y_true) * np.log1p(-p), axis=-1)
+
+    def _per_sample_and_grad(self, y_true, y_pred):
+        p = self._clip(y_pred)
+        per_sample = -np.mean(y_true * np.log(p) + (1 - y_true) * np.log1p(-p), axis=-1)
+        grad = (p - y_true) / (p * (1 - p) * y_true.shape[-1])
+        return per_sample, grad
+
+    def fused_delta(self, y_true, y_pred):
+        # sigmoid + binary cross-entropy: d loss / d z = (p - y) / outputs
+        y_true, y_pred = self._check(y_true, y_pred)
+        return self._scale_delta((y_pred - y_true) / y_true.shape[-1], y_true)
+
+class CategoricalCrossEntropy(BatchLoss):
+    name = 'cross_entropy'
+    fused_activation = 'softmax'
+
+    def __init__(self, eps=1e-12, reduction='mean'):
+        """
+        Cross-entropy for one-hot (or probability) targets: -sum(y * log(p)) per sample.
+        """
+        super().__init__(reduction)
+        self.eps = eps  # keeps log() away from zero
+
+    def _per_sample(self, y_true, y_pred):
+        return -np.sum(y_true * np.log(np.clip(y_pred, self.eps, 1.0)), axis=-1)
+
+    def _per_sample_and_grad(self, y_true, y_pred):
+        p = np.clip(y_pred, self.eps, 1.0)
+        per_sample = -np.sum(y_true * np.log(p), axis=-1)
+        return per_sample, -y_true / p
+
+    def fused_delta(self, y_true, y_pred):
+        # softmax + cross-entropy: d loss / d z = p - y
+        y_true, y_pred = self._check(y_true, y_pred)
+        return self._scale_delta(y_pred - y_true, y_true)
+
+LOSSES = {cls.name: cls for cls in (MSE, MAE, Huber, BinaryCrossEntropy, CategoricalCrossEntropy)}
+LOSSES['categorical_cross_entropy'] = CategoricalCrossEntropy
+
+def get_loss(loss):
+    """
+    Returns a batched loss object.
+
+    loss: a name ('mse', 'mae', 'huber', 'binary_cross_entropy',
+    'cross_entropy' / 'categorical_cross_entropy'), a loss object, or a
+    dict from BatchLoss.to_dict().
+    """
+    if isinstance(loss, dict):
+        settings = dict(loss)
+        name = settings.pop('name')
+        if name not in LOSSES:
+            raise ValueError(f"Unknown loss '{name}'. Choose from: {', '.join(LOSSES)}.")
+        return LOSSES[name](**settings)
+    if isinstance(loss, str):
+        try:
+            return LOSSES[loss.lower()]()
+        except KeyError:
+            raise ValueError(f"Unknown loss '{loss}'. Choose from: {', '.join(LOSSES)}.") from None
+    if hasattr(loss, 'value_and_grad'):
+        return loss
+    raise TypeError("Loss must be a name or an object with a value_and_grad method.")
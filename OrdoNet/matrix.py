@@ -1,95 +1,140 @@
-import random
-
-class Matrix:
-    def __init__(self, cols, rows, data=None):
-        self.cols = cols  # number of columns
-        self.rows = rows  # number of rows
-
-        if data:
-            # Use provided data (ensure it has the correct dimensions)
-            if len(data) != rows or any(len(row) != cols for row in data):
-                raise ValueError("Data dimensions do not match given rows and cols.")
-            self.data = data
-        else:
-            # If no data, fill the matrix with zeros
-            self.data = [[0 for _ in range(cols)] for _ in range(rows)]
-
-    def randomize(self):
-        # Fill the matrix with random numbers from -1 to 1
-        self.data = [
-            [random.uniform(-1, 1) for _ in range(self.cols)]  # for each column
-            for _ in range(self.rows)                           # for each row
-        ]
-
-    def show(self):
-        # Print the matrix row by row
-        for row in self.data:
-            print(row)
-
-    def __str__(self):
-        # Create a neat string representation of the matrix
-        return "\n".join(str(row) for row in self.data)
-
-    def transpose(self):
-        # Flip rows and columns
-        flipped = list(zip(*self.data))               # Convert columns to rows
-        new_data = [list(row) for row in flipped]     # Convert tuples to lists
-        return Matrix(self.cols, self.rows, new_data)   # Note: new shape is (cols, rows)
-
-    def dot(self, other):
-        # Standard matrix multiplication: self (rows x cols) dot other (other.rows x other.cols)
-        if self.cols != other.rows:
-            raise ValueError("Matrix dot product dimension mismatch: self.cols must equal other.rows")
-        
-        result = []
-        for row in self.data:  # For each row in self
-            new_row = []
-            # For each column in other (via transposition)
-            for col in zip(*other.data):
-                total = 0
-                for a, b in zip(row, col):  # Multiply corresponding elements and sum
-                    total += a * b
-                new_row.append(total)
-            result.append(new_row)
-        return Matrix(self.rows, other.cols, result)
-
-    def add(self, other):
-        # Element-wise addition: both matrices must have the same dimensions
-        if self.rows != other.rows or self.cols != other.cols:
-            raise ValueError("Matrix addition dimension mismatch.")
-        
-        new_data = [
-            [a + b for a, b in zip(row1, row2)]  # Add each corresponding pair
-            for row1, row2 in zip(self.data, other.data)
-        ]
-        return Matrix(self.cols, self.rows, new_data)
-
-    def subtract(self, other):
-        # Element-wise subtraction: both matrices must have the same dimensions
-        if self.rows != other.rows or self.cols != other.cols:
-            raise ValueError("Matrix subtraction dimension mismatch.")
-        
-        new_data = [
-            [a - b for a, b in zip(row1, row2)]  # Subtract each pair
-            for row1, row2 in zip(self.data, other.data)
-        ]
-        return Matrix(self.cols, self.rows, new_data)
-
-    def multiply(self, other):
-        # Element-wise multiplication (Hadamard product): matrices must have the same dimensions
-        if self.rows != other.rows or self.cols != other.cols:
-            raise ValueError("Matrix element-wise multiplication dimension mismatch.")
-        
-        new_data = [
-            [a * b for a, b in zip(row1, row2)]  # Multiply each pair
-            for row1, row2 in zip(self.data, other.data)
-        ]
-        return Matrix(self.cols, self.rows, new_data)
-
-    def scalar(self, number):
-        # Multiply each element by a scalar number
-        new_data = [
-            [a * number for a in row]  # Scale each value
-            for row in self.data
-        ]
-        return Matrix(self.cols, self.rows, new_data)
+import numpy as np
+
+class Matrix:
+    def __init__(self, cols, rows, data=None):
+        self.cols = cols  # number of columns
+        self.rows = rows  # number of rows
+
+        if data is not None and len(data) > 0:
+            # Use provided data (ensure it has the correct dimensions)
+            if len(data) != rows or any(len(row) != cols for row in data):
+                raise ValueError("Data dimensions do not match given rows and cols.")
+            # Copy into one contiguous (rows x cols) buffer of doubles
+            self._array = np.array(data, dtype=float)
+        else:
+            # If no data, fill the matrix with zeros
+            self._array = np.zeros((rows, cols))
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Wraps an existing 2D NumPy array without copying it.
+
+        Changes made through the Matrix are visible in the array and the
+        other way round, so e.g. a Layer's weights can be used as a Matrix.
+        """
+        if array.ndim != 2:
+            raise ValueError("Matrix.from_array expects a 2D array.")
+        matrix = cls.__new__(cls)
+        matrix.rows, matrix.cols = array.shape
+        matrix._array = array
+        return matrix
+
+    @property
+    def data(self):
+        # The underlying (rows x cols) array; data[i][j] works as before.
+        return self._array
+
+    @data.setter
+    def data(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.shape != (self.rows, self.cols):
+            raise ValueError("Data dimensions do not match given rows and cols.")
+        self._array[...] = values
+
+    def randomize(self):
+        # Fill the matrix with random numbers from -1 to 1
+        self._array[...] = np.random.uniform(-1, 1, (self.rows, self.cols))
+
+    def show(self):
+        # Print the matrix row by row
+        for row in self._array:
+            print(row.tolist())
+
+    def __str__(self):
+        # Create a neat string representation of the matrix
+        return "\n".join(str(row.tolist()) for row in self._array)
+
+    def transpose(self):
+        # Flip rows and columns. This is a view: no data is copied, and
+        # the result shares memory with this matrix.
+        return Matrix.from_array(self._array.T)
+
+    def dot(self, other):
+        # Standard matrix multiplication: self (rows x cols) dot other (other.rows x other.cols)
+        if self.cols != other.rows:
+            raise ValueError("Matrix dot product dimension mismatch: self.cols must equal other.rows")
+        # NumPy hands this to BLAS, which uses cache-blocked kernels.
+        return Matrix.from_array(self._array @ other._array)
+
+    def __matmul__(self, other):
+        return self.dot(other)
+
+    def _check_same_shape(self, other, operation):
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError(f"Matrix {operation} dimension mismatch.")
+
+    def add(self, other):
+        # Element-wise addition: both matrices must have the same dimensions
+        self._check_same_shape(other, "addition")
+        return Matrix.from_array(self._array + other._array)
+
+    def subtract(self, other):
+        # Element-wise subtraction: both matrices must have the same dimensions
+        self._check_same_shape(other, "subtraction")
+        return Matrix.from_array(self._array - other._array)
+
+    def multiply(self, other):
+        # Element-wise multiplication (Hadamard product): matrices must have the same dimensions
+        self._check_same_shape(other, "element-wise multiplication")
+        return Matrix.from_array(self._array * other._array)
+
+    def scalar(self, number):
+        # Multiply each element by a scalar number
+        return Matrix.from_array(self._array * number)
+
+    # In-place versions: they change this matrix and return it, without
+    # allocating a new buffer.
+
+    def iadd(self, other):
+        # In-place element-wise addition
+        self._check_same_shape(other, "addition")
+        self._array += other._array
+        return self
+
+    def isub(self, other):
+        # In-place element-wise subtraction
+        self._check_same_shape(other, "subtraction")
+        self._array -= other._array
+        return self
+
+    def imul(self, other):
+        # In-place element-wise multiplication
+        self._check_same_shape(other, "element-wise multiplication")
+        self._array *= other._array
+        return self
+
+    def scale_(self, number):
+        # In-place multiplication by a scalar number
+        self._array *= number
+        return self
+
+    def __iadd__(self, other):
+        # m += other works with another matrix or a plain number
+        if isinstance(other, Matrix):
+            return self.iadd(other)
+        self._array += other
+        return self
+
+    def __isub__(self, other):
+        # m -= other works with another matrix or a plain number
+        if isinstance(other, Matrix):
+            return self.isub(other)
+        self._array -= other
+        return self
+
+    def __imul__(self, other):
+        # m *= other works with another matrix or a plain number
+        if isinstance(other, Matrix):
+            return self.imul(other)
+        return self.scale_(other)
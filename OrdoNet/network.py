@@ -1,160 +1,496 @@
-from layer import Layer  # import Layer class (contains neurons)
-from loss import Loss    # import loss functions
-
-class Network:
-    def __init__(self, layer_sizes):
-        """
-        Builds a neural network.
-
-        layer_sizes: list of how many neurons in each layer.
-        Example: [2, 4, 1] means:
-            - 2 input values
-            - 1 hidden layer with 4 neurons
-            - 1 output neuron
-        """
-        self.layers = []  # stores all layers in the network
-        # Create each layer (skip input layer)
-        for i in range(1, len(layer_sizes)):
-            self.layers.append(Layer(num_neurons=layer_sizes[i],
-                                     num_inputs=layer_sizes[i - 1]))
-
-    def forward(self, inputs, debug=False):
-        """
-        Runs the data through the network (forward pass).
-
-        inputs: input vector (like image features)
-        debug: if True, prints the output of each layer.
-        """
-        data = inputs  # start with input
-        for index, layer in enumerate(self.layers):
-            data = layer.forward(data)  # pass through layer
-            if debug:
-                print(f"Layer {index+1} output: {data}")  # print layer output
-        return data  # final prediction
-
-    def backward(self, target):
-        """
-        Runs backpropagation through the network and returns a flattened list
-        of parameter gradients.
-
-        target: correct output (what the network should predict)
-        """
-        # Get prediction from output layer (assumes first layer saved its inputs)
-        output = self.forward(self.layers[0].inputs)
-        # Calculate loss gradient for the output (returns a list for output layer)
-        d_outputs = Loss.mse_deriv(target, output)
-        parameter_gradients = []  # flattened gradients for all layers
-        # Propagate gradients backwards through each layer
-        for layer in reversed(self.layers):
-            # layer.backward now returns: (grad_weights_list, grad_biases_list, d_inputs)
-            grad_weights_list, grad_biases_list, d_inputs = layer.backward(d_outputs)
-            # Flatten gradients for this layer
-            for gw, gb in zip(grad_weights_list, grad_biases_list):
-                parameter_gradients.extend(gw)
-                parameter_gradients.append(gb)
-            # Use d_inputs as the gradient to pass to the previous layer
-            d_outputs = d_inputs
-        return parameter_gradients
-
-    def update(self, lr):
-        """
-        Updates weights in each layer.
-
-        lr: learning rate — how much to adjust weights.
-        """
-        for layer in self.layers:
-            layer.update_weights(lr)
-
-    def train(self, data, targets, epochs, lr):
-        """
-        Trains the network on data.
-
-        data: list of input vectors.
-        targets: list of correct outputs.
-        epochs: number of full passes over the dataset.
-        lr: learning rate.
-        """
-        for epoch in range(epochs):
-            total_loss = 0  # total error for this epoch
-            for inputs, target in zip(data, targets):
-                output = self.forward(inputs)  # forward pass
-                loss = Loss.mse(target, output)  # calculate error
-                total_loss += loss             # accumulate error
-                # Compute parameter gradients via backpropagation
-                grads = self.backward(target)
-                # Get current parameters (flattened)
-                params = self.get_parameters()
-                # Update parameters using the optimizer externally (Adam, etc.)
-                # Here, we assume the optimizer call happens outside and parameters are set
-                # For now, we do a simple update using our update() method
-                self.update(lr)
-            avg_loss = total_loss / len(data)  # average loss
-            print(f"Epoch {epoch+1}: Average Loss = {avg_loss:.4f}")
-
-    def predict(self, inputs):
-        """
-        Gets prediction for the given input.
-        """
-        return self.forward(inputs)
-
-    def save(self, filename):
-        """
-        Saves model weights and biases to a file.
-        """
-        model_data = []
-        for layer in self.layers:
-            layer_data = []
-            for neuron in layer.neurons:
-                layer_data.append({
-                    'weights': neuron.weights,
-                    'bias': neuron.bias
-                })
-            model_data.append(layer_data)
-        with open(filename, 'w') as f:
-            f.write(str(model_data))
-
-    def load(self, filename):
-        """
-        Loads model weights and biases from a file.
-        """
-        with open(filename, 'r') as f:
-            model_data = eval(f.read())
-        for layer, layer_data in zip(self.layers, model_data):
-            for neuron, neuron_data in zip(layer.neurons, layer_data):
-                neuron.weights = neuron_data['weights']
-                neuron.bias = neuron_data['bias']
-
-    def total_parameters(self):
-        """
-        Returns the total number of parameters (weights + biases) in the whole network.
-        Needed to initialize the optimizer.
-        """
-        total = 0
-        for layer in self.layers:
-            for neuron in layer.neurons:
-                total += len(neuron.weights) + 1  # +1 for the bias
-        return total
-
-    def get_parameters(self):
-        """
-        Returns all network parameters (weights and biases) as a flattened list.
-        """
-        params = []
-        for layer in self.layers:
-            for neuron in layer.neurons:
-                params.extend(neuron.weights)
-                params.append(neuron.bias)
-        return params
-
-    def set_parameters(self, new_params):
-        """
-        Sets network parameters from a flattened list.
-        """
-        index = 0
-        for layer in self.layers:
-            for neuron in layer.neurons:
-                num_weights = len(neuron.weights)
-                neuron.weights = new_params[index:index + num_weights]
-                index += num_weights
-                neuron.bias = new_params[index]
-                index += 1
\ No newline at end of file
+from .layer import Layer  # import Layer class (contains neurons)
+from .loss import get_loss  # import loss functions
+from .normalizer import Normalizer
+from .workspace import Workspace
+from .checkpoint import (write_checkpoint, read_checkpoint, is_checkpoint,
+                        optimizer_header, optimizer_state)
+import numpy as np
+
+class Network:
+    def __init__(self, layer_sizes, activations='sigmoid', loss='mse', dtype='float64', initialize=True):
+        """
+        Builds a neural network.
+
+        layer_sizes: list of how many neurons in each layer.
+        Example: [2, 4, 1] means:
+            - 2 input values
+            - 1 hidden layer with 4 neurons
+            - 1 output neuron
+        activations: one activation name used by every layer, or a list with
+            one name per layer (not counting the input), e.g. ['relu', 'softmax'].
+        loss: loss name ('mse', 'mae', 'huber', 'binary_cross_entropy',
+            'cross_entropy') or a loss object from loss.py. A sigmoid output
+            with binary cross-entropy, or a softmax output with cross-entropy,
+            uses the fused, numerically stable gradient.
+        dtype: 'float64' (default) or 'float32'. float32 halves the memory
+            of parameters, gradients and activations and speeds up the
+            matrix products; inputs and targets are converted to it.
+        initialize: start with random parameters. from_file passes False,
+            which also keeps numpy.random from being imported when a model
+            is only loaded for inference.
+        """
+        num_layers = len(layer_sizes) - 1
+        if isinstance(activations, str) or not hasattr(activations, '__len__'):
+            activations = [activations] * num_layers
+        if len(activations) != num_layers:
+            raise ValueError(f"Expected {num_layers} activations, got {len(activations)}.")
+        self.layer_sizes = list(layer_sizes)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("Network dtype must be float32 or float64.")
+        self.loss = get_loss(loss)
+        # Optional fitted Normalizers: predict() scales raw inputs with
+        # input_normalizer and maps outputs back with target_normalizer.
+        # Both are saved and loaded together with the weights.
+        self.input_normalizer = None
+        self.target_normalizer = None
+        # Optimizer kept between partial_fit calls (and saved by save()), and
+        # the optimizer state found in the last loaded checkpoint, which
+        # partial_fit turns into an optimizer on first use.
+        self.optimizer = None
+        self._saved_optimizer = None
+        # Batch-sized activation and gradient arrays reused by every
+        # train_step, so training allocates almost nothing per step. Set it
+        # to None to allocate fresh arrays instead.
+        self.workspace = Workspace()
+        self.layers = []  # stores all layers in the network
+        # Create each layer (skip input layer)
+        for i in range(1, len(layer_sizes)):
+            self.layers.append(Layer(num_neurons=layer_sizes[i],
+                                     num_inputs=layer_sizes[i - 1],
+                                     activation=activations[i - 1],
+                                     dtype=self.dtype,
+                                     initialize=initialize))
+        # One contiguous buffer for every weight and bias, and a matching
+        # gradient buffer. Each layer works on views into these, so the
+        # optimizer can update all parameters in place.
+        total = sum(layer.num_params for layer in self.layers)
+        self.use_buffers(np.empty(total, dtype=self.dtype), np.zeros(total, dtype=self.dtype))
+
+    def use_buffers(self, params, grads, copy=True):
+        """
+        Moves the network's parameters and gradients into the given flat arrays.
+
+        params, grads: 1D arrays with total_parameters() elements, e.g. backed
+        by shared memory or a memory-mapped file. Every layer is re-bound to
+        views of them, and get_parameters() returns params from then on.
+        copy: copy the current parameter values into params first; pass False
+        when params already holds the values to use.
+        """
+        total = sum(layer.num_params for layer in self.layers)
+        if params.shape != (total,) or grads.shape != (total,):
+            raise ValueError(f"Parameter and gradient buffers must have {total} elements.")
+        if params.dtype != self.dtype or grads.dtype != self.dtype:
+            raise ValueError(f"Parameter and gradient buffers must have dtype {self.dtype.name}.")
+        offset = 0
+        for layer in self.layers:
+            shape = (layer.num_neurons, layer.num_inputs + 1)
+            end = offset + layer.num_params
+            layer.bind(params[offset:end].reshape(shape),
+                       grads[offset:end].reshape(shape), copy=copy)
+            offset = end
+        self.params = params
+        self.grads = grads
+
+    @property
+    def input_size(self):
+        # Number of input features, as on Sequential.
+        return self.layer_sizes[0]
+
+    def spec(self):
+        """
+        Returns what is needed to build an identical (untrained) network:
+        layer sizes, activation names, the loss and the dtype.
+        """
+        return {
+            'layer_sizes': list(self.layer_sizes),
+            'activations': [layer.activation.name for layer in self.layers],
+            'loss': self.loss,
+            'dtype': self.dtype.name,
+        }
+
+    def astype(self, dtype):
+        """
+        Returns a copy of this network with parameters of the given dtype,
+        e.g. net.astype('float32') to serve a float64-trained model with
+        half the memory. Normalizers are shared with the copy.
+        """
+        spec = self.spec()
+        net = Network(spec['layer_sizes'], spec['activations'], spec['loss'], dtype, initialize=False)
+        net.params[:] = self.params
+        net.input_normalizer = self.input_normalizer
+        net.target_normalizer = self.target_normalizer
+        return net
+
+    def forward(self, inputs, debug=False):
+        """
+        Runs the data through the network (forward pass).
+
+        inputs: input vector (like image features)
+        debug: if True, prints the output of each layer.
+        """
+        data = inputs  # start with input
+        for index, layer in enumerate(self.layers):
+            data = layer.forward(data)  # pass through layer
+            if debug:
+                print(f"Layer {index+1} output: {data}")  # print layer output
+        return data  # final prediction
+
+    def infer(self, inputs):
+        """
+        Runs the forward pass for inference only.
+
+        inputs: one input vector, or a (batch, features) array.
+        Unlike forward, no activations are kept for backpropagation, so this
+        is cheaper and safe to call from several threads at once.
+        """
+        data = inputs
+        for layer in self.layers:
+            data = layer.infer(data)
+        return data
+
+    def backward(self, target):
+        """
+        Runs backpropagation through the network and returns a flat array
+        of parameter gradients in the same order as get_parameters.
+
+        Uses the activations cached by the last forward call, so the
+        network is not run a second time.
+
+        target: correct output (what the network should predict)
+        """
+        if self.layers[-1].outputs is None:
+            raise ValueError("Call forward before backward.")
+        return self._backpropagate(target)[1]
+
+    def train_step(self, inputs, target, optimizer):
+        """
+        Runs one training step: forward pass, backpropagation and an optimizer update.
+
+        inputs: one input vector, or a (batch, features) array for a mini-batch step.
+        target: the matching correct output(s).
+        optimizer: object with update(params, grads), e.g. AdamOptimizer.
+        Returns the loss measured before the update.
+        A mini-batch step works in the arrays of self.workspace, so the
+        layers' cached inputs and outputs are only valid until the next step.
+        """
+        if np.ndim(inputs) == 2:
+            self.forward_batch(inputs, self.workspace)
+        else:
+            self.forward(inputs)
+        # Loss value and gradients come from the same pass over the output.
+        loss, grads = self._backpropagate(target)
+        self.set_parameters(optimizer.update(self.get_parameters(), grads))
+        return loss
+
+    def forward_batch(self, inputs, workspace=None):
+        """
+        Runs a whole mini-batch through the network.
+
+        inputs: array (or list of lists) of shape (batch, features).
+        Every layer keeps the activations of this batch for backward_batch.
+        workspace: e.g. self.workspace, to compute the activations in reused
+            arrays; the predictions are then overwritten by the next call.
+        Returns predictions of shape (batch, outputs).
+        """
+        data = np.asarray(inputs, dtype=self.dtype)
+        if data.ndim != 2:
+            raise ValueError("forward_batch expects a 2D (batch, features) input.")
+        for layer in self.layers:
+            data = layer.forward(data, workspace)
+        return data
+
+    def backward_batch(self, targets):
+        """
+        Backpropagates the batch seen by the last forward_batch call.
+
+        targets: array of shape (batch, outputs).
+        Returns one flat array of parameter gradients, averaged over the batch,
+        in the same order as get_parameters.
+        """
+        output = self.layers[-1].outputs  # cached by forward_batch
+        if output is None or output.ndim != 2:
+            raise ValueError("Call forward_batch before backward_batch.")
+        return self._backpropagate(targets)[1]
+
+    def compute_loss(self, targets, outputs):
+        """
+        Returns the network's loss for one sample or a (batch, outputs) block,
+        averaged over the batch.
+        """
+        return self.loss.value(targets, outputs)
+
+    def _backpropagate(self, targets):
+        # Shared by backward and backward_batch: works on the cached outputs
+        # of either a single sample or a batch. Returns (loss, gradients),
+        # with both averaged over the batch. Only the gradients are returned,
+        # so the per-layer intermediates can always live in the workspace.
+        workspace = self.workspace
+        output_layer = self.layers[-1]
+        output = output_layer.outputs
+        targets = np.asarray(targets, dtype=self.dtype)
+        if targets.shape != output.shape:
+            raise ValueError("Targets must have the same shape as the network output.")
+        layers = self.layers
+        # Custom losses and activations need not have these attributes.
+        fused = getattr(self.loss, 'fused_activation', None)
+        if fused is not None and fused == getattr(output_layer.activation, 'name', None):
+            # Fused output activation + loss (sigmoid + binary cross-entropy,
+            # softmax + cross-entropy): the gradient of the weighted sums is
+            # (prediction - target), with no exp or division.
+            loss = self.loss.value(targets, output)
+            _, _, d_outputs = output_layer.backward_delta(self.loss.fused_delta(targets, output), workspace)
+            layers = self.layers[:-1]
+        else:
+            loss, d_outputs = self.loss.value_and_grad(targets, output)
+        # Propagate gradients backwards through each layer; each layer writes
+        # its gradients into a view of self.grads, which is laid out front to
+        # back just like get_parameters
+        for layer in reversed(layers):
+            _, _, d_outputs = layer.backward(d_outputs, workspace)
+        return loss, self.grads
+
+    def update(self, lr):
+        """
+        Updates weights in each layer with the gradients from the last backward pass.
+
+        lr: learning rate — how much to adjust weights.
+        """
+        self.params -= lr * self.grads
+
+    def train(self, data, targets, epochs, lr=0.01, batch_size=32, optimizer=None, **options):
+        """
+        Trains the network on data and returns the loss history.
+
+        data: list (or array) of input vectors.
+        targets: list of correct outputs.
+        epochs: number of full passes over the dataset.
+        lr: learning rate of the default Adam optimizer.
+        batch_size: samples per update.
+        optimizer: use this optimizer instead of a new AdamOptimizer.
+        Other options (shuffle, seed, validation_split, schedule, callbacks,
+        verbose, ...) are passed to Trainer; see trainer.py.
+        """
+        # Imported here so that loading a model for inference does not pull
+        # in the training modules.
+        from .optimizer import AdamOptimizer
+        from .trainer import Trainer
+        if optimizer is None:
+            optimizer = AdamOptimizer(self.total_parameters(), lr=lr, dtype=self.dtype)
+        trainer = Trainer(self, optimizer, batch_size=batch_size, **options)
+        return trainer.fit(data, targets, epochs)
+
+    def partial_fit(self, inputs, targets, steps=1, optimizer=None, lr=0.01, update_normalizers=True):
+        """
+        Updates the network with a new batch of data (online learning),
+        without going over the earlier data again.
+
+        inputs, targets: one sample or a (batch, ...) block. With normalizers
+            attached they are given on the original scale, as for predict.
+        steps: optimizer steps to take on this batch.
+        optimizer: the optimizer to use from now on. By default the network
+            keeps its own in self.optimizer, so the moments and step counter
+            carry over from call to call: the one saved in the checkpoint this
+            network was loaded from, or else a new AdamOptimizer with this lr.
+            save() stores it with the parameters.
+        update_normalizers: first add the batch to the running statistics of
+            the attached normalizers, so the scaling follows the data.
+        Returns the loss on the batch before the first step, i.e. the error
+        on data the network had not seen yet.
+        """
+        # Copies, so the in-place scaling below leaves the caller's arrays alone.
+        inputs = np.array(inputs, dtype=float)
+        targets = np.array(targets, dtype=float)
+        if inputs.ndim == 1:
+            inputs = inputs.reshape(1, -1)
+            targets = targets.reshape(1, -1)
+        if len(inputs) != len(targets):
+            raise ValueError("Inputs and targets must have the same number of samples.")
+        if steps <= 0:
+            raise ValueError("steps must be a positive integer.")
+        for normalizer, data in ((self.input_normalizer, inputs), (self.target_normalizer, targets)):
+            if normalizer is not None and update_normalizers:
+                normalizer.partial_fit(data)
+        if self.input_normalizer is not None:
+            inputs = self.input_normalizer.transform(inputs, in_place=True)
+        if self.target_normalizer is not None:
+            targets = self.target_normalizer.transform(targets, in_place=True)
+        inputs = inputs.astype(self.dtype, copy=False)
+        targets = targets.astype(self.dtype, copy=False)
+
+        if isinstance(self.params, np.memmap):
+            # Loaded with mmap=True: train on an owned copy instead of the
+            # file's copy-on-write pages, so the live model no longer depends
+            # on the checkpoint file that save() will replace.
+            self.use_buffers(np.array(self.params), self.grads, copy=False)
+        if optimizer is not None:
+            self.optimizer = optimizer
+        elif self.optimizer is None:
+            self.optimizer = self._new_optimizer(lr)
+        loss = self.train_step(inputs, targets, self.optimizer)
+        for _ in range(steps - 1):
+            self.train_step(inputs, targets, self.optimizer)
+        return loss
+
+    def _new_optimizer(self, lr):
+        # Imported here so that loading a model for inference does not pull
+        # in the training modules.
+        from .optimizer import AdamOptimizer, Optimizer
+        if self._saved_optimizer is not None:
+            optimizer = Optimizer.from_state_dict(self._saved_optimizer)
+            self._saved_optimizer = None
+            return optimizer
+        return AdamOptimizer(self.total_parameters(), lr=lr, dtype=self.dtype)
+
+    def predict(self, inputs):
+        """
+        Gets prediction for the given input (one vector, or a (batch,
+        features) array for many predictions at once).
+
+        If normalizers are attached, inputs are given on their original scale
+        and the prediction is returned on the original target scale.
+        Uses the stateless infer path, so it is thread-safe.
+        """
+        if self.input_normalizer is not None:
+            inputs = self.input_normalizer.transform(inputs)
+        output = self.infer(inputs)
+        if self.target_normalizer is not None:
+            output = self.target_normalizer.inverse_transform(output)
+        return output
+
+    def save(self, filename, optimizer=None):
+        """
+        Saves the model to a binary checkpoint file (see checkpoint.py).
+
+        The file holds the architecture (layer sizes, activations, loss), any
+        attached normalizers and all parameters as one float block.
+        optimizer: also save this optimizer's settings, moments and step
+            counter, so training can be resumed after loading. Defaults to
+            the optimizer partial_fit keeps in self.optimizer, if any.
+        """
+        header = {
+            'model': 'Network',
+            'layer_sizes': self.layer_sizes,
+            'activations': [layer.activation.name for layer in self.layers],
+            'loss': self.loss.to_dict(),
+            'dtype': self.dtype.name,
+            'input_normalizer': self.input_normalizer.to_dict() if self.input_normalizer else None,
+            'target_normalizer': self.target_normalizer.to_dict() if self.target_normalizer else None,
+            'optimizer': None,
+        }
+        arrays = [('params', self.params)]
+        optimizer = optimizer if optimizer is not None else self.optimizer
+        if optimizer is not None:
+            header['optimizer'], optimizer_arrays = optimizer_header(optimizer)
+            arrays += optimizer_arrays
+        write_checkpoint(filename, header, arrays)
+
+    def load(self, filename, optimizer=None, mmap=False):
+        """
+        Loads parameters (and normalizers) from a file written by save into
+        this network, which must have the same layer sizes and activations.
+
+        optimizer: restore the optimizer state saved in the file into this
+            optimizer. Without one, the saved state is kept for partial_fit.
+        mmap: use the file's parameter block directly through a copy-on-write
+            memory map instead of reading it into memory.
+        Files written by older versions (plain text) can still be loaded;
+        they are parsed as literals, never executed.
+        """
+        if not is_checkpoint(filename):
+            self._load_text(filename)
+            return self
+        header, arrays = read_checkpoint(filename, mmap=mmap)
+        if header.get('model', 'Network') != 'Network':
+            raise ValueError(f"{filename} holds a {header['model']}, not a Network.")
+        activations = [layer.activation.name for layer in self.layers]
+        if header['layer_sizes'] != self.layer_sizes or header['activations'] != activations:
+            raise ValueError(f"Checkpoint is for a {header['layer_sizes']} network with activations "
+                             f"{header['activations']}, not {self.layer_sizes} with {activations}.")
+        self._load_header(header)
+        params = arrays['params']
+        if mmap and params.dtype == self.params.dtype:
+            self.use_buffers(params, np.zeros(params.size, dtype=params.dtype), copy=False)
+        else:
+            self.params[:] = params
+        state = optimizer_state(header, arrays)
+        if optimizer is not None:
+            if state is None:
+                raise ValueError(f"{filename} has no saved optimizer state.")
+            optimizer.load_state_dict(state)
+        # Kept for partial_fit, which continues with the saved optimizer.
+        self.optimizer = optimizer
+        self._saved_optimizer = state if optimizer is None else None
+        return self
+
+    @classmethod
+    def from_file(cls, filename, mmap=False):
+        """
+        Builds a network from a checkpoint file written by save, with the
+        saved architecture, loss, normalizers and parameters.
+
+        mmap: see load. Lets a large model start serving without reading
+        its parameters first.
+        To resume training, get the saved optimizer with checkpoint.load_optimizer(filename).
+        """
+        if not is_checkpoint(filename):
+            raise ValueError(f"{filename} is not a binary checkpoint; build the network "
+                             "and use load() for older text files.")
+        header, _ = read_checkpoint(filename, mmap=True)
+        if header.get('model', 'Network') != 'Network':
+            raise ValueError(f"{filename} holds a {header['model']}, not a Network.")
+        net = cls(header['layer_sizes'], header['activations'], header['loss'],
+                  header.get('dtype', 'float64'), initialize=False)
+        return net.load(filename, mmap=mmap)
+
+    def _load_header(self, header):
+        input_normalizer = header.get('input_normalizer')
+        target_normalizer = header.get('target_normalizer')
+        self.input_normalizer = Normalizer.from_dict(input_normalizer) if input_normalizer else None
+        self.target_normalizer = Normalizer.from_dict(target_normalizer) if target_normalizer else None
+
+    def _load_text(self, filename):
+        # Older text format: str() of a list of layers (lists of
+        # {'weights', 'bias'} dicts), or of a dict that also holds normalizers.
+        import ast
+        with open(filename, 'r') as f:
+            try:
+                model_data = ast.literal_eval(f.read())
+            except (ValueError, SyntaxError) as e:
+                raise ValueError(f"{filename} is not a valid OrdoNet model file.") from e
+        if isinstance(model_data, dict):
+            self._load_header(model_data)
+            model_data = model_data['layers']
+        for layer, layer_data in zip(self.layers, model_data):
+            for neuron, neuron_data in zip(layer.neurons, layer_data):
+                neuron.weights = neuron_data['weights']
+                neuron.bias = neuron_data['bias']
+
+    def total_parameters(self):
+        """
+        Returns the total number of parameters (weights + biases) in the whole network.
+        Needed to initialize the optimizer.
+        """
+        return self.params.size
+
+    def get_parameters(self, copy=False):
+        """
+        Returns all network parameters (weights and biases) as one flat array.
+
+        By default this is the network's own buffer, not a copy: optimizers
+        can update it in place and the layers see the change immediately.
+        Pass copy=True to get a snapshot instead.
+        """
+        return self.params.copy() if copy else self.params
+
+    def set_parameters(self, new_params):
+        """
+        Sets network parameters from a flat list or array.
+
+        Passing the buffer returned by get_parameters is a no-op.
+        """
+        if new_params is self.params:
+            return
+        if len(new_params) != self.params.size:
+            raise ValueError("Number of parameters does not match the network.")
+        self.params[:] = new_params
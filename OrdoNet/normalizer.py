@@ -0,0 +1,196 @@
+import numpy as np
+from .stats import RunningStats
+
+METHODS = ('minmax', 'zscore', 'robust')
+
+class Normalizer:
+    def __init__(self, method='minmax', sample_size=10000, seed=0):
+        """
+        Scales every column of the data; remembers how, so the same scaling
+        can be applied to new inputs and undone on predictions.
+
+        method:
+          'minmax' - (x - min) / (max - min), giving values in [0, 1]
+          'zscore' - (x - mean) / std
+          'robust' - (x - median) / (75th percentile - 25th percentile)
+        Columns with a single constant value become 0.5 (minmax) or 0.
+
+        Statistics are collected in one pass with partial_fit, chunk by chunk,
+        and normalizers fitted on different parts of the data can be combined
+        with merge. 'robust' needs percentiles, which are estimated from a
+        uniform random sample of at most sample_size rows.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown normalization method '{method}'. Choose from: {', '.join(METHODS)}.")
+        self.method = method
+        self.sample_size = sample_size
+        self.stats = None       # RunningStats, created on the first chunk
+        self.sample = None      # reservoir sample of rows (robust only)
+        self._rng = np.random.default_rng(seed)
+        self._offset = None     # cached (x - offset) / scale parameters
+        self._scale = None
+
+    @classmethod
+    def from_stats(cls, stats, method='minmax'):
+        """
+        Builds a fitted normalizer from existing RunningStats, e.g. the
+        statistics stored in a MappedDataset cache.
+        """
+        if method == 'robust':
+            raise ValueError("Robust normalization needs the data itself, not summary statistics.")
+        normalizer = cls(method)
+        normalizer.stats = RunningStats.from_dict(stats.to_dict())
+        return normalizer
+
+    @property
+    def fitted(self):
+        return self.stats is not None and self.stats.count > 0
+
+    def fit(self, data):
+        """
+        Forgets previous statistics and fits on data.
+
+        data: a 2D array (or list of rows), or any iterable of such chunks,
+        e.g. (features for features, labels in stream_csv(...)).
+        """
+        self.stats = None
+        self.sample = None
+        if isinstance(data, (list, tuple, np.ndarray)):
+            self.partial_fit(data)
+        else:
+            for chunk in data:
+                self.partial_fit(chunk)
+        return self
+
+    def partial_fit(self, chunk):
+        """
+        Adds one (rows, columns) chunk to the statistics.
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim == 1:
+            chunk = chunk.reshape(1, -1)
+        if self.stats is None:
+            self.stats = RunningStats(chunk.shape[1])
+        seen = self.stats.count
+        self.stats.update(chunk)
+        if self.method == 'robust':
+            self._sample_rows(chunk, seen)
+        self._offset = self._scale = None
+        return self
+
+    def merge(self, other):
+        """
+        Combines the statistics of another normalizer (same method and
+        columns) into this one, e.g. one fitted in a worker process.
+        """
+        if other.method != self.method:
+            raise ValueError("Cannot merge normalizers that use different methods.")
+        if not other.fitted:
+            return self
+        if not self.fitted:
+            self.stats = RunningStats(other.stats.num_columns)
+        seen = self.stats.count
+        self.stats.merge(other.stats)
+        if self.method == 'robust':
+            self.sample = self._merge_samples(self.sample, seen, other.sample, other.stats.count)
+        self._offset = self._scale = None
+        return self
+
+    def transform(self, data, in_place=False):
+        """
+        Normalizes data (one row or a (rows, columns) array).
+
+        in_place: overwrite the given float array instead of allocating a new one.
+        """
+        offset, scale = self._parameters()
+        if in_place and isinstance(data, np.ndarray) and data.dtype.kind == 'f':
+            data -= offset
+            data /= scale
+            return data
+        return (np.asarray(data, dtype=float) - offset) / scale
+
+    def fit_transform(self, data):
+        return self.fit(data).transform(data)
+
+    def inverse_transform(self, data, in_place=False):
+        """
+        Maps normalized values (e.g. network predictions) back to the original scale.
+        """
+        offset, scale = self._parameters()
+        if in_place and isinstance(data, np.ndarray) and data.dtype.kind == 'f':
+            data *= scale
+            data += offset
+            return data
+        return np.asarray(data, dtype=float) * scale + offset
+
+    def to_dict(self):
+        # Plain Python values, so the normalizer can be saved with a model.
+        return {
+            'method': self.method,
+            'sample_size': self.sample_size,
+            'stats': self.stats.to_dict() if self.stats is not None else None,
+            'sample': self.sample.tolist() if self.sample is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        normalizer = cls(data['method'], data['sample_size'])
+        if data['stats'] is not None:
+            normalizer.stats = RunningStats.from_dict(data['stats'])
+        if data['sample'] is not None:
+            normalizer.sample = np.array(data['sample'], dtype=float)
+        return normalizer
+
+    def _parameters(self):
+        # Works out (offset, scale) so that normalized = (x - offset) / scale.
+        if not self.fitted:
+            raise ValueError("Normalizer has not been fitted yet.")
+        if self._offset is None:
+            if self.method == 'minmax':
+                offset = self.stats.min.copy()
+                scale = self.stats.max - self.stats.min
+                constant = scale == 0
+                offset[constant] -= 0.5  # constant columns map to 0.5
+            elif self.method == 'zscore':
+                offset = self.stats.mean.copy()
+                scale = self.stats.std
+                constant = scale == 0
+            else:
+                q1, median, q3 = np.percentile(self.sample, [25, 50, 75], axis=0)
+                offset = median
+                scale = q3 - q1
+                constant = scale == 0
+            scale = np.where(constant, 1.0, scale)
+            self._offset, self._scale = offset, scale
+        return self._offset, self._scale
+
+    def _sample_rows(self, chunk, seen):
+        # Reservoir sampling: every row seen so far ends up in the sample
+        # with the same probability, using at most sample_size rows of memory.
+        if self.sample is None:
+            self.sample = np.empty((0, chunk.shape[1]))
+        room = self.sample_size - len(self.sample)
+        if room > 0:
+            taken = chunk[:room]
+            self.sample = np.vstack([self.sample, taken])
+            seen += len(taken)
+            chunk = chunk[len(taken):]
+        if len(chunk) == 0:
+            return
+        # Row number i (counting from 0) replaces a random slot with probability sample_size / (i + 1).
+        positions = self._rng.integers(0, seen + np.arange(1, len(chunk) + 1))
+        keep = positions < self.sample_size
+        self.sample[positions[keep]] = chunk[keep]
+
+    def _merge_samples(self, sample_a, seen_a, sample_b, seen_b):
+        # Combines two reservoir samples, taking rows from each in proportion
+        # to how many rows it represents.
+        if sample_a is None or len(sample_a) == 0:
+            return sample_b.copy()
+        size = min(self.sample_size, len(sample_a) + len(sample_b))
+        take_a = int(round(size * seen_a / (seen_a + seen_b)))
+        take_a = min(max(take_a, size - len(sample_b)), len(sample_a))
+        take_b = size - take_a
+        rows_a = sample_a[self._rng.choice(len(sample_a), take_a, replace=False)]
+        rows_b = sample_b[self._rng.choice(len(sample_b), take_b, replace=False)]
+        return np.vstack([rows_a, rows_b])
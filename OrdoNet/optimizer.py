@@ -1,42 +1,222 @@
-import math
-
-class AdamOptimizer:
-    def __init__(self, size, lr=0.01, beta1=0.9, beta2=0.999, eps=1e-8):
-        self.lr = lr            # learning rate
-        self.beta1 = beta1      # retention factor for 1st moment (velocity)
-        self.beta2 = beta2      # retention factor for 2nd moment (squared gradients)
-        self.eps = eps          # small number to avoid division by zero
-        self.t = 0              # step counter
-        self.m = [0.0] * size   # first moment, initialized to zeros
-        self.v = [0.0] * size   # second moment, initialized to zeros
-
-    def update(self, weights, grads):
-        # Check that weights and grads are lists of the same length.
-        if len(weights) != len(grads):
-            raise ValueError("Weights and gradients must have the same length.")
-        
-        self.t += 1  # advance training step
-        new_weights = []  # list for updated weights
-        
-        for i in range(len(weights)):
-            # Ensure each gradient is a number (convertible to float)
-            try:
-                grad_i = float(grads[i])
-            except Exception as e:
-                raise ValueError(f"Gradient at index {i} is not a number: {grads[i]}") from e
-
-            # Update the first moment (velocity): blend old and new gradient
-            self.m[i] = self.beta1 * self.m[i] + (1 - self.beta1) * grad_i
-            # Update the second moment (squared gradient): blend old and new squared gradient
-            self.v[i] = self.beta2 * self.v[i] + (1 - self.beta2) * (grad_i ** 2)
-            
-            # Correct bias for the first moment
-            m_hat = self.m[i] / (1 - self.beta1 ** self.t)
-            # Correct bias for the second moment
-            v_hat = self.v[i] / (1 - self.beta2 ** self.t)
-            
-            # Calculate the update step and apply it
-            update_val = self.lr * m_hat / (math.sqrt(v_hat) + self.eps)
-            new_weights.append(weights[i] - update_val)
-        
-        return new_weights
\ No newline at end of file
+import numpy as np
+
+class Optimizer:
+    """
+    Base class for optimizers that update a flat parameter array in place.
+
+    Subclasses implement step(params, grads), which works on NumPy arrays of
+    the same length. All per-parameter state (moments, velocity) is kept in
+    arrays of that length, and a scratch array is reused for temporaries so
+    a step does not allocate new arrays.
+
+    Subclasses list their constructor settings in hyperparameters and their
+    per-parameter arrays in state_arrays, so state_dict() can save them.
+
+    dtype: type of the state arrays; use the network's dtype (e.g. 'float32')
+    so gradients are used as they are, without conversion.
+    """
+    hyperparameters = ('lr',)
+    state_arrays = ()
+
+    def __init__(self, size, lr, dtype='float64'):
+        self.size = size
+        self.lr = lr            # learning rate
+        self.t = 0              # step counter
+        self.dtype = np.dtype(dtype)
+        self._buf = np.zeros(size, dtype=self.dtype)  # scratch space reused by every step
+
+    def update(self, weights, grads):
+        """
+        Applies one optimizer step and returns the updated weights.
+
+        weights: a NumPy array (e.g. Network.get_parameters()) is updated in
+        place and returned; a list gets a new list of updated weights.
+        grads: gradients of the same length (list or array).
+        """
+        # Check that weights and grads have the same length.
+        if len(weights) != len(grads):
+            raise ValueError("Weights and gradients must have the same length.")
+        if len(weights) != self.size:
+            raise ValueError(f"Optimizer was created for {self.size} parameters, got {len(weights)}.")
+        try:
+            grads = np.asarray(grads, dtype=self.dtype)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Gradients must all be numbers.") from e
+
+        in_place = isinstance(weights, np.ndarray) and weights.dtype.kind == 'f'
+        params = weights if in_place else np.array(weights, dtype=float)
+        self.step(params, grads)
+        return params if in_place else params.tolist()
+
+    def step(self, params, grads):
+        raise NotImplementedError
+
+    def state_dict(self):
+        """
+        Returns everything needed to resume training: the optimizer type,
+        its settings, the step counter and its per-parameter arrays.
+        """
+        return {
+            'type': type(self).__name__,
+            'size': self.size,
+            'dtype': self.dtype.name,
+            't': self.t,
+            'hyperparameters': {name: getattr(self, name) for name in self.hyperparameters},
+            'arrays': {name: getattr(self, name) for name in self.state_arrays},
+        }
+
+    def load_state_dict(self, state):
+        """
+        Restores a state saved with state_dict(). The arrays are copied
+        into this optimizer's own arrays.
+        """
+        if state['type'] != type(self).__name__:
+            raise ValueError(f"Cannot load {state['type']} state into {type(self).__name__}.")
+        if state['size'] != self.size:
+            raise ValueError(f"Optimizer was created for {self.size} parameters, state has {state['size']}.")
+        for name, value in state['hyperparameters'].items():
+            setattr(self, name, value)
+        for name in self.state_arrays:
+            getattr(self, name)[...] = state['arrays'][name]
+        self.t = state['t']
+        return self
+
+    @classmethod
+    def from_state_dict(cls, state):
+        """
+        Builds an optimizer of the saved type and restores its state.
+        """
+        try:
+            optimizer_class = OPTIMIZERS[state['type']]
+        except KeyError:
+            raise ValueError(f"Unknown optimizer type '{state['type']}'.") from None
+        optimizer = optimizer_class(state['size'], dtype=state.get('dtype', 'float64'),
+                                    **state['hyperparameters'])
+        return optimizer.load_state_dict(state)
+
+class AdamOptimizer(Optimizer):
+    hyperparameters = ('lr', 'beta1', 'beta2', 'eps', 'weight_decay')
+    state_arrays = ('m', 'v')
+
+    def __init__(self, size, lr=0.01, beta1=0.9, beta2=0.999, eps=1e-8, weight_decay=0.0,
+                 dtype='float64'):
+        """
+        Adam optimizer.
+
+        weight_decay: if non-zero, weights are also shrunk by lr * weight_decay
+        every step, separately from the gradient (the AdamW variant).
+        """
+        super().__init__(size, lr, dtype)
+        self.beta1 = beta1      # retention factor for 1st moment (velocity)
+        self.beta2 = beta2      # retention factor for 2nd moment (squared gradients)
+        self.eps = eps          # small number to avoid division by zero
+        self.weight_decay = weight_decay
+        self.m = np.zeros(size, dtype=self.dtype)  # first moment, initialized to zeros
+        self.v = np.zeros(size, dtype=self.dtype)  # second moment, initialized to zeros
+
+    def step(self, params, grads):
+        self.t += 1  # advance training step
+        buf = self._buf
+
+        # Update the first moment (velocity): blend old and new gradient
+        self.m *= self.beta1
+        np.multiply(grads, 1 - self.beta1, out=buf)
+        self.m += buf
+        # Update the second moment (squared gradient): blend old and new squared gradient
+        self.v *= self.beta2
+        np.multiply(grads, grads, out=buf)
+        buf *= 1 - self.beta2
+        self.v += buf
+
+        # Bias corrections only depend on the step, so compute them once:
+        # lr * m_hat / (sqrt(v_hat) + eps), with m_hat = m / c1 and v_hat = v / c2
+        c1 = 1 - self.beta1 ** self.t
+        c2 = 1 - self.beta2 ** self.t
+        np.sqrt(self.v, out=buf)
+        buf /= c2 ** 0.5
+        buf += self.eps
+        np.divide(self.m, buf, out=buf)
+        buf *= self.lr / c1
+
+        if self.weight_decay:
+            # Decoupled weight decay (AdamW)
+            params *= 1 - self.lr * self.weight_decay
+        params -= buf
+
+class AdamW(AdamOptimizer):
+    def __init__(self, size, lr=0.01, beta1=0.9, beta2=0.999, eps=1e-8, weight_decay=0.01,
+                 dtype='float64'):
+        """
+        Adam with decoupled weight decay switched on by default.
+        """
+        super().__init__(size, lr, beta1, beta2, eps, weight_decay, dtype)
+
+class SGDOptimizer(Optimizer):
+    hyperparameters = ('lr', 'momentum', 'nesterov', 'weight_decay')
+    state_arrays = ('velocity',)
+
+    def __init__(self, size, lr=0.01, momentum=0.0, nesterov=False, weight_decay=0.0, dtype='float64'):
+        """
+        Stochastic gradient descent with optional (Nesterov) momentum.
+
+        momentum: how much of the previous step is kept (0 means plain SGD).
+        weight_decay: L2 penalty added to the gradient.
+        """
+        super().__init__(size, lr, dtype)
+        self.momentum = momentum
+        self.nesterov = nesterov
+        self.weight_decay = weight_decay
+        self.velocity = np.zeros(size, dtype=self.dtype)  # running update direction
+
+    def step(self, params, grads):
+        self.t += 1
+        buf = self._buf
+        # buf holds the effective gradient, including the L2 penalty if any
+        if self.weight_decay:
+            np.multiply(params, self.weight_decay, out=buf)
+            buf += grads
+        else:
+            np.copyto(buf, grads)
+        if self.momentum:
+            self.velocity *= self.momentum
+            self.velocity += buf
+            if self.nesterov:
+                # Look ahead: step by the gradient, then by the damped new velocity
+                buf *= self.lr
+                params -= buf
+                np.multiply(self.velocity, self.lr * self.momentum, out=buf)
+            else:
+                np.multiply(self.velocity, self.lr, out=buf)
+        else:
+            buf *= self.lr
+        params -= buf
+
+class RMSPropOptimizer(Optimizer):
+    hyperparameters = ('lr', 'rho', 'eps')
+    state_arrays = ('v',)
+
+    def __init__(self, size, lr=0.001, rho=0.9, eps=1e-8, dtype='float64'):
+        """
+        RMSProp: scales each step by a running average of squared gradients.
+
+        rho: retention factor for the squared-gradient average.
+        """
+        super().__init__(size, lr, dtype)
+        self.rho = rho
+        self.eps = eps
+        self.v = np.zeros(size, dtype=self.dtype)  # running average of squared gradients
+
+    def step(self, params, grads):
+        self.t += 1
+        buf = self._buf
+        self.v *= self.rho
+        np.multiply(grads, grads, out=buf)
+        buf *= 1 - self.rho
+        self.v += buf
+        np.sqrt(self.v, out=buf)
+        buf += self.eps
+        np.divide(grads, buf, out=buf)
+        buf *= self.lr
+        params -= buf
+
+OPTIMIZERS = {cls.__name__: cls for cls in (AdamOptimizer, AdamW, SGDOptimizer, RMSPropOptimizer)}
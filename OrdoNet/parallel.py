@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .network import Network
+
+def _shared_array(shape, dtype, name=None):
+    # Creates (name=None) or attaches to an array in shared memory.
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if name is None:
+        block = shared_memory.SharedMemory(create=True, size=max(size, 8))
+    else:
+        block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _worker(rank, spec, names, layout, conn):
+    """
+    Worker process: a Network replica whose parameters live in shared memory.
+
+    For each ('step', start, stop) message the worker takes its rows of the
+    current batch, runs forward_batch/backward_batch (writing its gradient
+    straight into its row of the shared gradient matrix) and replies with
+    (rows, loss).
+    """
+    blocks = []
+    arrays = {}
+    try:
+        for key in ('params', 'grads', 'data', 'targets', 'order'):
+            block, arrays[key] = _shared_array(*layout[key], name=names[key])
+            blocks.append(block)
+        net = Network(spec['layer_sizes'], spec['activations'], spec['loss'], spec['dtype'],
+                      initialize=False)
+        # Read parameters from the shared buffer (no copy) and write
+        # gradients into this worker's own row of the gradient matrix.
+        net.use_buffers(arrays['params'], arrays['grads'][rank], copy=False)
+        data, targets, order = arrays['data'], arrays['targets'], arrays['order']
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            _, start, stop = message
+            if stop <= start:
+                conn.send((0, 0.0))
+                continue
+            rows = order[start:stop]
+            inputs = net.workspace.get('inputs', (len(rows),) + data.shape[1:], data.dtype)
+            outputs = net.workspace.get('targets', (len(rows),) + targets.shape[1:], targets.dtype)
+            np.take(data, rows, axis=0, out=inputs, mode='clip')
+            np.take(targets, rows, axis=0, out=outputs, mode='clip')
+            output = net.forward_batch(inputs, net.workspace)
+            loss = net.compute_loss(outputs, output)
+            net.backward_batch(outputs)
+            conn.send((len(rows), loss))
+    finally:
+        # Views into shared memory must be gone before the blocks are closed.
+        net = data = targets = order = rows = None
+        arrays.clear()
+        for block in blocks:
+            block.close()
+        conn.close()
+
+class ParallelTrainer:
+    def __init__(self, net, optimizer, workers=None, start_method=None):
+        """
+        Data-parallel trainer: every mini-batch is split across worker processes.
+
+        net: the Network to train. Its parameters are moved into shared memory
+            while the trainer is open, so workers always see the latest values
+            without any copying.
+        optimizer: e.g. AdamOptimizer(net.total_parameters()); it runs in this
+            process on the averaged gradient and updates the shared parameters in place.
+        workers: number of processes (default: number of CPU cores).
+        start_method: multiprocessing start method ('fork', 'spawn', ...).
+
+        Use as a context manager, or call close() when done:
+            with ParallelTrainer(net, adam, workers=8) as trainer:
+                history = trainer.fit(data, targets, epochs=10, batch_size=256)
+        """
+        self.net = net
+        self.optimizer = optimizer
+        self.workers = workers or os.cpu_count() or 1
+        self.context = multiprocessing.get_context(start_method)
+        self._blocks = {}
+        self._arrays = {}
+        self._processes = []
+        self._conns = []
+        self._data_shape = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fit(self, data, targets, epochs=1, batch_size=256, shuffle=True, seed=None):
+        """
+        Trains for a number of epochs and returns the average loss of each epoch.
+
+        data, targets: (samples, features) and (samples, outputs) arrays. They
+        are copied into shared memory once; workers then read their rows directly.
+        """
+        data = np.asarray(data, dtype=self.net.dtype)
+        targets = np.asarray(targets, dtype=self.net.dtype)
+        if len(data) != len(targets):
+            raise ValueError("Data and targets must have the same number of samples.")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        self._start(data.shape, targets.shape)
+        self._arrays['data'][...] = data
+        self._arrays['targets'][...] = targets
+
+        rng = np.random.default_rng(seed)
+        order = self._arrays['order']
+        history = []
+        for _ in range(epochs):
+            order[...] = rng.permutation(len(data)) if shuffle else np.arange(len(data))
+            total_loss = 0.0
+            for start in range(0, len(data), batch_size):
+                total_loss += self._step(start, min(start + batch_size, len(data)))
+            history.append(total_loss / len(data))
+        return history
+
+    def _step(self, start, stop):
+        # Splits rows start..stop of the shuffled order across the workers,
+        # averages their gradients and applies one optimizer step.
+        # Returns the summed loss over the batch.
+        bounds = np.linspace(start, stop, self.workers + 1).astype(int)
+        for conn, lo, hi in zip(self._conns, bounds[:-1], bounds[1:]):
+            conn.send(('step', lo, hi))
+        counts = np.zeros(self.workers)
+        total_loss = 0.0
+        for rank, conn in enumerate(self._conns):
+            try:
+                rows, loss = conn.recv()
+            except (EOFError, ConnectionError):
+                raise RuntimeError(f"Worker {rank} stopped unexpectedly.") from None
+            counts[rank] = rows
+            total_loss += rows * loss
+        # Weighted average of the per-worker mean gradients, written into
+        # the network's gradient buffer.
+        weights = (counts / (stop - start)).astype(self.net.dtype)
+        np.dot(weights, self._arrays['grads'], out=self.net.grads)
+        self.optimizer.update(self.net.params, self.net.grads)
+        return total_loss
+
+    def _start(self, data_shape, targets_shape):
+        # Allocates shared memory and starts the workers (again, if the data
+        # shape changed since the last fit).
+        if self._processes and self._data_shape == (data_shape, targets_shape):
+            return
+        self.close()
+        size = self.net.total_parameters()
+        dtype = self.net.dtype.name
+        layout = {
+            'params': ((size,), dtype),
+            'grads': ((self.workers, size), dtype),
+            'data': (data_shape, dtype),
+            'targets': (targets_shape, dtype),
+            'order': ((data_shape[0],), 'int64'),
+        }
+        for key, (shape, array_dtype) in layout.items():
+            self._blocks[key], self._arrays[key] = _shared_array(shape, array_dtype)
+        # Move the network's parameters into shared memory.
+        self.net.use_buffers(self._arrays['params'], np.zeros(size, dtype=dtype))
+        names = {key: block.name for key, block in self._blocks.items()}
+        spec = self.net.spec()
+        for rank in range(self.workers):
+            parent, child = self.context.Pipe()
+            process = self.context.Process(target=_worker, args=(rank, spec, names, layout, child),
+                                           daemon=True)
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._conns.append(parent)
+        self._data_shape = (data_shape, targets_shape)
+
+    def close(self):
+        """
+        Stops the workers and moves the network's parameters back into
+        ordinary memory. Safe to call more than once.
+        """
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        if 'params' in self._arrays:
+            size = self.net.total_parameters()
+            self.net.use_buffers(np.array(self._arrays['params']), np.zeros(size, dtype=self.net.dtype),
+                                 copy=False)
+        self._arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        self._processes = []
+        self._conns = []
+        self._data_shape = None
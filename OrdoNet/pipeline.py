@@ -0,0 +1,325 @@
+import multiprocessing
+import queue
+import threading
+
+import numpy as np
+
+from .dataset import CSVStream, MappedDataset, _rechunk
+
+# Streaming input pipeline.
+#
+# A Pipeline is a recipe that runs again for every epoch:
+#   source (read + parse) -> map / normalize -> shuffle buffer -> batch -> prefetch
+# Every stage is a generator over (features, labels) pairs of arrays, so only
+# a few chunks are in memory at a time, whatever the size of the dataset.
+# prefetch() runs all the stages before it in a background thread (or
+# process) that fills a bounded queue: the next batches are read, parsed and
+# shuffled while the current one trains, and at most depth batches wait in
+# memory. Stages are small classes rather than closures so a pipeline can be
+# sent to a worker process.
+
+class _CSVSource:
+    def __init__(self, path, chunk_size, options):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.options = options
+
+    def __call__(self, epoch):
+        return iter(CSVStream(self.path, chunk_size=self.chunk_size, **self.options))
+
+class _CacheSource:
+    def __init__(self, path, chunk_size):
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def __call__(self, epoch):
+        # Contiguous chunks, so the file is read front to back.
+        dataset = MappedDataset(self.path)
+        for start in range(0, len(dataset), self.chunk_size):
+            block = np.array(dataset.data[start:start + self.chunk_size])
+            yield block[:, :dataset.num_features], block[:, dataset.num_features:]
+
+class _ArraySource:
+    def __init__(self, features, labels, chunk_size):
+        self.features = features
+        self.labels = labels
+        self.chunk_size = chunk_size
+
+    def __call__(self, epoch):
+        for start in range(0, len(self.features), self.chunk_size):
+            yield self.features[start:start + self.chunk_size], self.labels[start:start + self.chunk_size]
+
+class _Map:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, chunks, epoch):
+        for features, labels in chunks:
+            yield self.fn(features, labels)
+
+class _Normalize:
+    def __init__(self, input_normalizer, target_normalizer):
+        self.input_normalizer = input_normalizer
+        self.target_normalizer = target_normalizer
+
+    def __call__(self, chunks, epoch):
+        # Copies each chunk once and scales the copy in place, which keeps its
+        # dtype and never touches the caller's arrays.
+        for features, labels in chunks:
+            if self.input_normalizer is not None:
+                features = self.input_normalizer.transform(np.array(features), in_place=True)
+            if self.target_normalizer is not None:
+                labels = self.target_normalizer.transform(np.array(labels), in_place=True)
+            yield features, labels
+
+class _Shuffle:
+    def __init__(self, buffer_size, seed):
+        self.buffer_size = buffer_size
+        # The order depends only on (seed, epoch), so it is reproducible and
+        # is the same whether the stage runs here or in a worker process.
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+    def __call__(self, chunks, epoch):
+        rng = np.random.default_rng([self.seed, epoch])
+        size = self.buffer_size
+        features = labels = None
+        filled = 0
+        for new_features, new_labels in chunks:
+            if features is None:
+                features = np.empty((size,) + new_features.shape[1:], dtype=new_features.dtype)
+                labels = np.empty((size,) + new_labels.shape[1:], dtype=new_labels.dtype)
+            start = 0
+            if filled < size:
+                start = min(size - filled, len(new_features))
+                features[filled:filled + start] = new_features[:start]
+                labels[filled:filled + start] = new_labels[:start]
+                filled += start
+            # Once the buffer is full, every new row takes the place of a
+            # random buffered row, which is sent on.
+            while start < len(new_features):
+                count = min(size, len(new_features) - start)
+                slots = rng.choice(size, count, replace=False)
+                yield features[slots], labels[slots]
+                features[slots] = new_features[start:start + count]
+                labels[slots] = new_labels[start:start + count]
+                start += count
+        if filled:
+            order = rng.permutation(filled)
+            yield features[order], labels[order]
+
+class _Batch:
+    def __init__(self, batch_size, drop_last):
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+
+    def __call__(self, chunks, epoch):
+        for features, labels in _rechunk(chunks, self.batch_size):
+            if self.drop_last and len(features) < self.batch_size:
+                return
+            yield features, labels
+
+class _Prefetch:
+    def __init__(self, depth, mode, start_method):
+        self.depth = depth
+        self.mode = mode
+        self.start_method = start_method
+
+    def __call__(self, upstream, epoch):
+        # upstream is the Pipeline of the stages before this one; it is run
+        # from scratch in the background.
+        if self.mode == 'process':
+            return _prefetch_process(upstream, epoch, self.depth, multiprocessing.get_context(self.start_method))
+        return _prefetch_thread(upstream, epoch, self.depth)
+
+def _prefetch_thread(upstream, epoch, depth):
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        # Waits for room in the queue, but gives up once the reader has stopped.
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in upstream._run(epoch):
+                if not put(('batch', item)):
+                    return
+            put(('end', None))
+        except BaseException as error:
+            put(('error', error))
+
+    thread = threading.Thread(target=produce, name='OrdoNet-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == 'end':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stop.set()
+        thread.join()
+
+def _process_worker(upstream, epoch, items):
+    # Runs in the worker process: streams the upstream stages into the queue.
+    try:
+        for item in upstream._run(epoch):
+            items.put(('batch', item))
+        items.put(('end', None))
+    except Exception as error:
+        items.put(('error', f"{type(error).__name__}: {error}"))
+
+def _prefetch_process(upstream, epoch, depth, context):
+    items = context.Queue(maxsize=depth)
+    process = context.Process(target=_process_worker, args=(upstream, epoch, items), daemon=True)
+    process.start()
+    try:
+        while True:
+            try:
+                kind, value = items.get(timeout=1.0)
+            except queue.Empty:
+                # A worker that exits cleanly has already queued 'end'.
+                if process.exitcode not in (None, 0):
+                    raise RuntimeError(f"Pipeline worker process died (exit code {process.exitcode}).")
+                continue
+            if kind == 'end':
+                return
+            if kind == 'error':
+                raise RuntimeError(f"Pipeline worker process failed: {value}")
+            yield value
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        items.close()
+
+class Pipeline:
+    def __init__(self, source, stages=()):
+        """
+        A streaming input pipeline that yields (features, labels) batches.
+
+        Build one from a source and chain stages; each method returns a new
+        Pipeline, and iterating runs the whole chain once (one epoch):
+
+            pipeline = (Pipeline.from_csv('data.csv', label_cols=['y'], dtype='float32')
+                        .normalize(input_normalizer)
+                        .shuffle(buffer_size=20000, seed=0)
+                        .batch(64)
+                        .prefetch(depth=4))
+            Trainer(net).fit(pipeline, epochs=10)
+
+        source: callable (epoch) -> iterator of (features, labels) chunks;
+            normally made by from_csv, from_cache or from_arrays.
+        """
+        self.source = source
+        self.stages = list(stages)
+        self.epoch = 0  # iterations started so far; seeds the shuffle stage
+
+    @classmethod
+    def from_csv(cls, path, chunk_size=4096, **options):
+        """
+        Streams a CSV file in chunks of parsed arrays; options are passed to
+        CSVStream (feature_cols, label_cols, delimiter, dtype, workers, ...).
+        """
+        return cls(_CSVSource(path, chunk_size, options))
+
+    @classmethod
+    def from_cache(cls, cache_path, chunk_size=4096):
+        """
+        Streams a binary cache written by dataset.csv_to_cache, reading it
+        front to back in contiguous chunks.
+        """
+        if isinstance(cache_path, MappedDataset):
+            cache_path = cache_path.path
+        return cls(_CacheSource(cache_path, chunk_size))
+
+    @classmethod
+    def from_arrays(cls, features, labels, chunk_size=4096):
+        """
+        Streams in-memory (samples, features) and (samples, labels) arrays.
+        """
+        features, labels = np.asarray(features), np.asarray(labels)
+        if len(features) != len(labels):
+            raise ValueError("Features and labels must have the same number of samples.")
+        return cls(_ArraySource(features, labels, chunk_size))
+
+    def map(self, fn):
+        """
+        Applies fn(features, labels) -> (features, labels) to every chunk.
+        With prefetch(mode='process') fn must be picklable (a module-level function).
+        """
+        return self._add(_Map(fn))
+
+    def normalize(self, input_normalizer=None, target_normalizer=None):
+        """
+        Scales features and/or labels with fitted Normalizers.
+        """
+        return self._add(_Normalize(input_normalizer, target_normalizer))
+
+    def shuffle(self, buffer_size=10000, seed=None):
+        """
+        Shuffles rows through a buffer of buffer_size rows: each row sent on
+        is picked at random from the buffer. A buffer as large as the dataset
+        gives a full shuffle; smaller buffers only mix rows that are near each
+        other in the source, so use a buffer much larger than the batch size.
+        Every epoch gets a new order.
+        """
+        if buffer_size <= 0:
+            raise ValueError("Shuffle buffer size must be a positive integer.")
+        return self._add(_Shuffle(buffer_size, seed))
+
+    def batch(self, batch_size, drop_last=False):
+        """
+        Regroups the rows into batches of batch_size; the last batch of an
+        epoch can be smaller unless drop_last is set.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        return self._add(_Batch(batch_size, drop_last))
+
+    def prefetch(self, depth=2, mode='thread', start_method=None):
+        """
+        Runs the stages added so far in the background and keeps up to depth
+        items ready in a bounded queue.
+
+        mode: 'thread' (NumPy parsing and copies release the GIL, and nothing
+            has to be pickled) or 'process' (for Python-heavy stages such as
+            CSV parsing or a map function; items are pickled through a queue).
+        start_method: multiprocessing start method for mode='process'.
+        """
+        if depth <= 0:
+            raise ValueError("Prefetch depth must be a positive integer.")
+        if mode not in ('thread', 'process'):
+            raise ValueError("Prefetch mode must be 'thread' or 'process'.")
+        return self._add(_Prefetch(depth, mode, start_method))
+
+    def __iter__(self):
+        epoch = self.epoch
+        self.epoch += 1
+        return self._run(epoch)
+
+    def _add(self, stage):
+        return Pipeline(self.source, self.stages + [stage])
+
+    def _run(self, epoch):
+        # Starts from the last prefetch stage, which runs everything before it.
+        start = 0
+        chunks = None
+        for index in range(len(self.stages) - 1, -1, -1):
+            if isinstance(self.stages[index], _Prefetch):
+                chunks = self.stages[index](Pipeline(self.source, self.stages[:index]), epoch)
+                start = index + 1
+                break
+        if chunks is None:
+            chunks = self.source(epoch)
+        for stage in self.stages[start:]:
+            chunks = stage(chunks, epoch)
+        return chunks
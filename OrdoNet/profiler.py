@@ -0,0 +1,251 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+MEMORY_MODES = ('rss', 'tracemalloc', None)
+
+class Profiler:
+    def __init__(self, memory='rss', max_events=1000000):
+        """
+        Opt-in timing of the training and inference hot paths.
+
+        attach(net, optimizer) wraps, on those objects only, each layer's
+        forward / infer / backward, the optimizer step and Network.train_step,
+        so that every call is timed. Nothing is changed in the classes: a
+        network that is not attached runs exactly the same code as before, so
+        profiling costs nothing while it is off. detach() removes the wrappers.
+        Trainer(profiler=...) attaches automatically and also times data
+        loading (batch gathering) and validation.
+
+        memory: how peak memory is measured:
+          'rss'         - peak resident set size of the process (free, but it
+                          is the peak since the process started)
+          'tracemalloc' - peak of Python and NumPy allocations while attached
+                          (exact, but slows allocation-heavy code down)
+          None          - not measured
+        max_events: individual events kept for the Chrome trace; after that
+            only the per-section totals are updated.
+        """
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode '{memory}'. Choose from: 'rss', 'tracemalloc', None.")
+        self.memory = memory
+        self.max_events = max_events
+        self.events = []        # (name, category, start, end, thread id)
+        self.sections = {}      # name -> [category, count, total, max]
+        self.samples = 0
+        self.peak_memory = None
+        self.wall_time = 0.0
+        self._patched = []      # (object, attribute name, previous instance value)
+        self._started = None
+        self._own_tracemalloc = False
+
+    @property
+    def active(self):
+        return self._started is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.detach()
+
+    def attach(self, net, optimizer=None):
+        """
+        Starts profiling the given Network or Sequential (and optimizer),
+        timing every layer (or plan op). Returns self, so
+        it can be used as a context manager:
+            with Profiler().attach(net, adam) as profiler:
+                ...
+            profiler.report()
+        """
+        if self.active:
+            raise RuntimeError("Profiler is already attached; call detach() first.")
+        for index, layer in enumerate(net.layers, 1):
+            prefix = f"layer{index}"
+            inside_backward = self._wrap(layer, 'backward', f"{prefix}.backward", 'backward')
+            # backward calls backward_delta itself; only time backward_delta
+            # on its own when it is called directly (fused output layer).
+            if hasattr(layer, 'backward_delta'):
+                self._wrap(layer, 'backward_delta', f"{prefix}.backward", 'backward', skip=inside_backward)
+            self._wrap(layer, 'forward', f"{prefix}.forward", 'forward')
+            if hasattr(layer, 'infer'):
+                self._wrap(layer, 'infer', f"{prefix}.infer", 'inference')
+        self._wrap(net, 'train_step', 'train_step', 'step', count_samples=True)
+        if optimizer is not None:
+            self._wrap(optimizer, 'step', 'optimizer.step', 'optimizer')
+        if self.memory == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        if self.memory == 'tracemalloc':
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        return self
+
+    def detach(self):
+        """
+        Stops profiling and removes all wrappers. Safe to call more than once.
+        """
+        if not self.active:
+            return
+        self.wall_time += time.perf_counter() - self._started
+        self._started = None
+        for obj, attribute, previous in reversed(self._patched):
+            if previous is None:
+                delattr(obj, attribute)
+            else:
+                setattr(obj, attribute, previous)
+        self._patched = []
+        self.peak_memory = self._measure_memory()
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+
+    def record(self, name, category, start, end):
+        """
+        Adds one timed section (start and end from time.perf_counter()).
+        """
+        section = self.sections.get(name)
+        duration = end - start
+        if section is None:
+            self.sections[name] = [category, 1, duration, duration]
+        else:
+            section[1] += 1
+            section[2] += duration
+            if duration > section[3]:
+                section[3] = duration
+        if len(self.events) < self.max_events:
+            self.events.append((name, category, start, end, threading.get_ident()))
+
+    def count_samples(self, count):
+        # For custom loops that do not go through Network.train_step.
+        self.samples += count
+
+    def iterate(self, iterable, name='data'):
+        """
+        Yields the items of iterable (e.g. MappedDataset.batches() or a
+        CSVStream), timing how long each item takes to produce.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(name, 'data', start, time.perf_counter())
+            yield item
+
+    def summary(self):
+        """
+        Returns the results as a dict: wall time, samples and samples per
+        second, peak memory, and for every section its call count, total,
+        mean and maximum time (milliseconds) and share of the wall time.
+        """
+        wall_time = self.wall_time + (time.perf_counter() - self._started if self.active else 0.0)
+        sections = {}
+        for name, (category, count, total, longest) in sorted(
+                self.sections.items(), key=lambda item: -item[1][2]):
+            sections[name] = {
+                'category': category,
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_ms': total * 1000 / count,
+                'max_ms': longest * 1000,
+                'percent': 100 * total / wall_time if wall_time > 0 else 0.0,
+            }
+        return {
+            'wall_time_s': wall_time,
+            'samples': self.samples,
+            'samples_per_second': self.samples / wall_time if wall_time > 0 else 0.0,
+            'peak_memory_bytes': self.peak_memory if not self.active else self._measure_memory(),
+            'memory_mode': self.memory,
+            'sections': sections,
+        }
+
+    def report(self):
+        """
+        Prints the summary as a table, slowest sections first.
+        """
+        summary = self.summary()
+        print(f"Wall time {summary['wall_time_s']:.3f} s, {summary['samples']} samples, "
+              f"{summary['samples_per_second']:.0f} samples/s")
+        if summary['peak_memory_bytes'] is not None:
+            print(f"Peak memory ({self.memory}): {summary['peak_memory_bytes'] / 2 ** 20:.1f} MiB")
+        print(f"{'section':<20}{'calls':>10}{'total ms':>12}{'mean ms':>10}{'max ms':>10}{'%':>7}")
+        for name, stats in summary['sections'].items():
+            print(f"{name:<20}{stats['count']:>10}{stats['total_ms']:>12.2f}{stats['mean_ms']:>10.4f}"
+                  f"{stats['max_ms']:>10.3f}{stats['percent']:>7.1f}")
+
+    def save_json(self, path):
+        # Writes summary() as JSON, e.g. to compare runs and spot regressions.
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def save_chrome_trace(self, path):
+        """
+        Writes the recorded events in Chrome trace format; open the file in
+        chrome://tracing or https://ui.perfetto.dev to see a timeline.
+        """
+        origin = self.events[0][2] if self.events else 0.0
+        pid = os.getpid()
+        threads = {}
+        trace = []
+        for name, category, start, end, thread in self.events:
+            trace.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',  # complete event: start and duration
+                'ts': (start - origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': pid,
+                'tid': threads.setdefault(thread, len(threads)),
+            })
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms',
+                       'otherData': {'samples': self.samples, 'peak_memory_bytes': self.peak_memory}}, file)
+
+    def _wrap(self, obj, attribute, name, category, skip=None, count_samples=False):
+        # Replaces obj.attribute with a timed version on this object only.
+        # Returns a one-item list that is True while the wrapped call runs,
+        # which lets nested wrappers (see skip) avoid counting time twice.
+        original = getattr(obj, attribute)
+        record = self.record
+        clock = time.perf_counter
+        running = [False]
+        profiler = self
+
+        def timed(*args, **kwargs):
+            if skip is not None and skip[0]:
+                return original(*args, **kwargs)
+            running[0] = True
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, category, start, clock())
+                running[0] = False
+                if count_samples:
+                    profiler.samples += len(args[0]) if np.ndim(args[0]) == 2 else 1
+
+        self._patched.append((obj, attribute, obj.__dict__.get(attribute)))
+        setattr(obj, attribute, timed)
+        return running
+
+    def _measure_memory(self):
+        if self.memory == 'tracemalloc':
+            return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else self.peak_memory
+        if self.memory == 'rss' and resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Linux reports kilobytes, macOS bytes.
+            return peak if sys.platform == 'darwin' else peak * 1024
+        return None
@@ -0,0 +1,162 @@
+import numpy as np
+
+from .activation import get_activation
+from .checkpoint import write_checkpoint, read_checkpoint
+from .normalizer import Normalizer
+
+# Post-training int8 quantization for inference.
+#
+# Every layer's weights are stored as int8 with one float32 scale per layer
+# (symmetric: weight ~= int8 value * scale, scale = max |weight| / 127), which
+# is 1 byte per weight instead of 8 (float64) or 4 (float32). Biases stay
+# float32. NumPy has no int8 matrix product, so at inference time each layer's
+# int8 weights are widened to float32 and multiplied with BLAS; the int8 copy
+# is what is kept in memory and on disk.
+
+class QuantizedLayer:
+    def __init__(self, qweights, scale, biases, activation):
+        """
+        A dense layer with int8 weights, for inference only.
+
+        qweights: int8 array (num_neurons, num_inputs).
+        scale: float; real weights are qweights * scale.
+        biases: float32 array (num_neurons,).
+        """
+        self.qweights = qweights
+        self.scale = np.float32(scale)
+        self.biases = biases
+        self.activation = get_activation(activation)
+        self.num_neurons, self.num_inputs = qweights.shape
+
+    @classmethod
+    def from_layer(cls, layer):
+        largest = float(np.max(np.abs(layer.weights))) if layer.weights.size else 0.0
+        scale = largest / 127 if largest > 0 else 1.0
+        qweights = np.clip(np.rint(layer.weights / scale), -127, 127).astype(np.int8)
+        return cls(qweights, scale, layer.biases.astype(np.float32), layer.activation)
+
+    def infer(self, inputs):
+        z = np.asarray(inputs, dtype=np.float32) @ self.qweights.astype(np.float32).T
+        z *= self.scale
+        z += self.biases
+        return self.activation.forward(z)
+
+    def dequantized_weights(self):
+        # The weights this layer actually uses, as float32.
+        return self.qweights.astype(np.float32) * self.scale
+
+class QuantizedNetwork:
+    def __init__(self, layer_sizes, layers, input_normalizer=None, target_normalizer=None):
+        """
+        An inference-only network with int8 weights; build one with quantize(net).
+
+        Has the same infer / predict interface as Network (including
+        attached normalizers), so it can be served by InferenceServer.
+        """
+        self.layer_sizes = list(layer_sizes)
+        self.layers = layers
+        self.input_normalizer = input_normalizer
+        self.target_normalizer = target_normalizer
+
+    @property
+    def input_size(self):
+        # Number of input features, as on Network and Sequential.
+        return self.layer_sizes[0]
+
+    @property
+    def nbytes(self):
+        # Memory used by weights, scales and biases.
+        return sum(layer.qweights.nbytes + layer.biases.nbytes + 4 for layer in self.layers)
+
+    def infer(self, inputs):
+        """
+        Runs the forward pass on one input vector or a (batch, features) array.
+        Results are float32.
+        """
+        data = inputs
+        for layer in self.layers:
+            data = layer.infer(data)
+        return data
+
+    def predict(self, inputs):
+        # Same as Network.predict: raw inputs in, raw-scale predictions out.
+        if self.input_normalizer is not None:
+            inputs = self.input_normalizer.transform(inputs)
+        output = self.infer(inputs)
+        if self.target_normalizer is not None:
+            output = self.target_normalizer.inverse_transform(output)
+        return output
+
+    def save(self, filename):
+        """
+        Saves the quantized model as a checkpoint file (int8 weight blocks).
+        """
+        header = {
+            'model': 'QuantizedNetwork',
+            'layer_sizes': self.layer_sizes,
+            'activations': [layer.activation.name for layer in self.layers],
+            'scales': [float(layer.scale) for layer in self.layers],
+            'input_normalizer': self.input_normalizer.to_dict() if self.input_normalizer else None,
+            'target_normalizer': self.target_normalizer.to_dict() if self.target_normalizer else None,
+        }
+        arrays = []
+        for index, layer in enumerate(self.layers):
+            arrays += [(f"layer{index}.weights", layer.qweights), (f"layer{index}.biases", layer.biases)]
+        write_checkpoint(filename, header, arrays)
+
+    @classmethod
+    def from_file(cls, filename, mmap=False):
+        """
+        Loads a model saved by QuantizedNetwork.save; with mmap the int8
+        weights are used straight from the file.
+        """
+        header, arrays = read_checkpoint(filename, mmap=mmap)
+        if header.get('model') != 'QuantizedNetwork':
+            raise ValueError(f"{filename} does not hold a quantized network.")
+        layers = [QuantizedLayer(arrays[f"layer{index}.weights"], scale,
+                                 arrays[f"layer{index}.biases"], activation)
+                  for index, (scale, activation) in enumerate(zip(header['scales'], header['activations']))]
+        input_normalizer = header.get('input_normalizer')
+        target_normalizer = header.get('target_normalizer')
+        return cls(header['layer_sizes'], layers,
+                   Normalizer.from_dict(input_normalizer) if input_normalizer else None,
+                   Normalizer.from_dict(target_normalizer) if target_normalizer else None)
+
+def quantize(net):
+    """
+    Returns an int8 QuantizedNetwork copy of a trained Network (float32 or
+    float64), with one weight scale per layer. The normalizers are shared.
+    Check the result with accuracy_report before using it.
+    """
+    return QuantizedNetwork(net.layer_sizes, [QuantizedLayer.from_layer(layer) for layer in net.layers],
+                            net.input_normalizer, net.target_normalizer)
+
+def accuracy_report(reference, candidate, data, targets=None, batch_size=4096):
+    """
+    Compares a reduced-precision model with the original on the same data.
+
+    reference: the float64 Network.
+    candidate: e.g. reference.astype('float32') or quantize(reference).
+    data: (samples, features) inputs, already normalized like the training data.
+    targets: optional; adds the loss of both models.
+    Returns a dict with the largest and mean absolute difference of the
+    outputs, and for several outputs the share of samples where both models
+    pick the same largest output (argmax agreement).
+    """
+    data = np.asarray(data, dtype=float)
+    expected = np.concatenate([reference.infer(data[i:i + batch_size])
+                               for i in range(0, len(data), batch_size)])
+    actual = np.concatenate([candidate.infer(data[i:i + batch_size])
+                             for i in range(0, len(data), batch_size)]).astype(float)
+    difference = np.abs(expected - actual)
+    result = {
+        'samples': len(data),
+        'max_abs_error': float(difference.max()),
+        'mean_abs_error': float(difference.mean()),
+    }
+    if expected.shape[1] > 1:
+        result['argmax_agreement'] = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)))
+    if targets is not None:
+        result['reference_loss'] = reference.loss.value(targets, expected)
+        result['candidate_loss'] = reference.loss.value(targets, actual)
+    return result
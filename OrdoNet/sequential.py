@@ -0,0 +1,635 @@
+import numpy as np
+
+from .activation import get_activation
+from .checkpoint import write_checkpoint, read_checkpoint, optimizer_header, optimizer_state
+from .loss import get_loss
+from .normalizer import Normalizer
+
+# Layer specs and compiled execution plans.
+#
+# A model is described by a list of small spec objects (Dense, Dropout,
+# BatchNorm, Residual). Sequential compiles them once into a flat plan: a list
+# of ops that read and write numbered activation buffers. Residual blocks are
+# flattened too; their skip connection is an 'add' op that reads two buffers.
+#
+# Every activation, gradient and scratch buffer is allocated when the model
+# is built, sized for max_batch rows, and a batch of n rows uses the first n
+# rows of each. Parameters live in one flat buffer (and gradients in a
+# matching one), so optimizers work exactly as with Network. A forward and
+# backward pass therefore allocates no arrays except the small loss-sized
+# ones for the output; there are no per-neuron objects at all.
+#
+# NumPy ufuncs that broadcast a row over a batch (x += biases) allocate an
+# internal buffer of up to 8192 elements on every call, while a plain
+# broadcasting copy does not. So ops copy such rows into a batch-shaped
+# scratch buffer (rows) and work on equal shapes, which is as fast.
+
+class Dense:
+    def __init__(self, units, activation='linear'):
+        """
+        Fully-connected layer: activation(inputs @ weights.T + biases).
+
+        Weights start from a scaled normal distribution (He for ReLU,
+        Glorot for the others), so deep stacks train without tuning.
+        """
+        if units <= 0:
+            raise ValueError("Dense units must be a positive integer.")
+        self.units = units
+        # The name of a built-in activation, or a custom activation object.
+        activation = get_activation(activation)
+        self.activation = getattr(activation, 'name', None) or activation
+
+    def to_dict(self):
+        return {'type': 'Dense', 'units': self.units, 'activation': self.activation}
+
+class Dropout:
+    def __init__(self, rate):
+        """
+        Zeroes a random fraction rate of the values during training and
+        scales the rest by 1 / (1 - rate); does nothing at inference.
+        """
+        if not 0 <= rate < 1:
+            raise ValueError("Dropout rate must be at least 0 and less than 1.")
+        self.rate = rate
+
+    def to_dict(self):
+        return {'type': 'Dropout', 'rate': self.rate}
+
+class BatchNorm:
+    def __init__(self, momentum=0.9, eps=1e-5):
+        """
+        Normalizes every feature over the batch, then scales and shifts it
+        with learned gamma and beta. Running mean and variance are kept for
+        inference (and saved with the model).
+        """
+        self.momentum = momentum
+        self.eps = eps
+
+    def to_dict(self):
+        return {'type': 'BatchNorm', 'momentum': self.momentum, 'eps': self.eps}
+
+class Residual:
+    def __init__(self, *layers):
+        """
+        Skip connection: output = inputs + layers(inputs). The layers inside
+        must keep the width of their input.
+        """
+        if not layers:
+            raise ValueError("Residual needs at least one layer.")
+        self.layers = list(layers)
+
+    def to_dict(self):
+        return {'type': 'Residual', 'layers': [layer.to_dict() for layer in self.layers]}
+
+LAYERS = {cls.__name__: cls for cls in (Dense, Dropout, BatchNorm, Residual)}
+
+def layer_from_dict(data):
+    """
+    Rebuilds a layer spec from its to_dict() form.
+    """
+    settings = dict(data)
+    kind = settings.pop('type')
+    if kind not in LAYERS:
+        raise ValueError(f"Unknown layer type '{kind}'. Choose from: {', '.join(LAYERS)}.")
+    if kind == 'Residual':
+        return Residual(*[layer_from_dict(layer) for layer in settings['layers']])
+    return LAYERS[kind](**settings)
+
+
+# Plan ops. Each reads buffer src and writes buffer dst (indices into the
+# model's buffer lists; buffer 0 is the input batch). write says whether the
+# op's input gradient overwrites the gradient buffer of src or is added to it
+# (a buffer read by two ops, i.e. the input of a residual block, gets both).
+
+class _Op:
+    num_params = 0
+    num_state = 0
+
+    def __init__(self, src, dst):
+        self.src = src
+        self.dst = dst
+        self.write = True
+        self.scratch = None  # (max_batch, width) input gradient when adding
+
+    def bind(self, params, grads):
+        pass
+
+    def bind_state(self, state):
+        pass
+
+    def allocate(self, batch, dtype):
+        pass
+
+    def _input_gradient(self, n, grads):
+        # Where backward should put the input gradient (None: not needed).
+        if self.src == 0:
+            return None
+        return grads[self.src][:n] if self.write else self.scratch[:n]
+
+    def _add_input_gradient(self, n, grads, d_inputs):
+        if d_inputs is not None and not self.write:
+            grads[self.src][:n] += d_inputs
+
+class _DenseOp(_Op):
+    def __init__(self, src, dst, num_inputs, units, activation):
+        super().__init__(src, dst)
+        self.num_inputs = num_inputs
+        self.units = units
+        self.activation = get_activation(activation)
+        self.num_params = units * (num_inputs + 1)
+
+    def bind(self, params, grads):
+        # Layout: the (units, num_inputs) weight block, then the biases.
+        split = self.units * self.num_inputs
+        self.weights = params[:split].reshape(self.units, self.num_inputs)
+        self.biases = params[split:]
+        self.grad_weights = grads[:split].reshape(self.units, self.num_inputs)
+        self.grad_biases = grads[split:]
+
+    def initialize(self, rng):
+        if getattr(self.activation, 'name', None) == 'relu':
+            std = np.sqrt(2.0 / self.num_inputs)
+        else:
+            std = np.sqrt(2.0 / (self.num_inputs + self.units))
+        self.weights[...] = rng.normal(0.0, std, self.weights.shape)
+        self.biases[...] = 0
+
+    def allocate(self, batch, dtype):
+        self.delta = np.empty((batch, self.units), dtype=dtype)
+
+    def forward(self, n, acts, training):
+        out = acts[self.dst]
+        np.matmul(acts[self.src], self.weights.T, out=out)
+        rows = self.delta[:n]  # free until backward
+        np.copyto(rows, self.biases)
+        out += rows
+        self.activation.forward(out, out=out)
+
+    def infer(self, inputs):
+        z = inputs @ self.weights.T
+        z += self.biases
+        return self.activation.forward(z, out=z)
+
+    def backward(self, n, acts, grads, delta=None):
+        # delta: error of the weighted sums, when the loss gave it directly.
+        if delta is None:
+            delta = self.activation.backward(acts[self.dst], grads[self.dst][:n], out=self.delta[:n])
+        inputs = acts[self.src]
+        np.matmul(delta.T, inputs, out=self.grad_weights)
+        np.sum(delta, axis=0, out=self.grad_biases)
+        d_inputs = self._input_gradient(n, grads)
+        if d_inputs is not None:
+            np.matmul(delta, self.weights, out=d_inputs)
+            self._add_input_gradient(n, grads, d_inputs)
+
+class _DropoutOp(_Op):
+    def __init__(self, src, dst, width, rate, rng):
+        super().__init__(src, dst)
+        self.width = width
+        self.rate = rate
+        self.rng = rng
+
+    def allocate(self, batch, dtype):
+        self.mask = np.empty((batch, self.width), dtype=dtype)
+
+    def forward(self, n, acts, training):
+        if not training or self.rate == 0:
+            acts[self.dst] = acts[self.src]  # pass the buffer through
+            return
+        mask = self.mask[:n]
+        self.rng.random(out=mask, dtype=mask.dtype)
+        # u in [0, 1) is kept when u >= rate, i.e. when floor(u + 1 - rate) is 1.
+        mask += 1 - self.rate
+        np.floor(mask, out=mask)
+        mask *= 1 / (1 - self.rate)
+        np.multiply(acts[self.src], mask, out=acts[self.dst])
+
+    def infer(self, inputs):
+        return inputs
+
+    def backward(self, n, acts, grads, delta=None):
+        d_inputs = self._input_gradient(n, grads)
+        if d_inputs is None:
+            return
+        if acts[self.dst] is acts[self.src]:
+            np.copyto(d_inputs, grads[self.dst][:n])
+        else:
+            np.multiply(grads[self.dst][:n], self.mask[:n], out=d_inputs)
+        self._add_input_gradient(n, grads, d_inputs)
+
+class _BatchNormOp(_Op):
+    def __init__(self, src, dst, width, momentum, eps):
+        super().__init__(src, dst)
+        self.width = width
+        self.momentum = momentum
+        self.eps = eps
+        self.num_params = 2 * width   # gamma, beta
+        self.num_state = 2 * width    # running mean, running variance
+
+    def bind(self, params, grads):
+        self.gamma, self.beta = params[:self.width], params[self.width:]
+        self.grad_gamma, self.grad_beta = grads[:self.width], grads[self.width:]
+
+    def bind_state(self, state):
+        self.running_mean, self.running_var = state[:self.width], state[self.width:]
+
+    def initialize(self, rng):
+        self.gamma[...] = 1
+        self.beta[...] = 0
+
+    def reset_state(self):
+        self.running_mean[...] = 0
+        self.running_var[...] = 1
+
+    def allocate(self, batch, dtype):
+        self.normalized = np.empty((batch, self.width), dtype=dtype)  # x-hat
+        self.temp = np.empty((batch, self.width), dtype=dtype)
+        self.rows = np.empty((batch, self.width), dtype=dtype)
+        self.mean = np.empty(self.width, dtype=dtype)
+        self.inv_std = np.empty(self.width, dtype=dtype)
+        self.sums = np.empty((2, self.width), dtype=dtype)
+
+    def forward(self, n, acts, training):
+        inputs, out = acts[self.src], acts[self.dst]
+        rows = self.rows[:n]
+        if not training:
+            np.add(self.running_var, self.eps, out=self.inv_std)
+            np.sqrt(self.inv_std, out=self.inv_std)
+            np.divide(self.gamma, self.inv_std, out=self.inv_std)  # scale
+            np.copyto(rows, self.running_mean)
+            np.subtract(inputs, rows, out=out)
+            np.copyto(rows, self.inv_std)
+            out *= rows
+            np.copyto(rows, self.beta)
+            out += rows
+            return
+        normalized = self.normalized[:n]
+        np.mean(inputs, axis=0, out=self.mean)
+        np.copyto(rows, self.mean)
+        np.subtract(inputs, rows, out=normalized)
+        np.multiply(normalized, normalized, out=out)  # out is free until the end
+        np.mean(out, axis=0, out=self.inv_std)  # batch variance for now
+        # running = momentum * running + (1 - momentum) * batch value
+        update = self.sums[0]
+        np.multiply(self.inv_std, n / max(n - 1, 1) * (1 - self.momentum), out=update)
+        self.running_var *= self.momentum
+        self.running_var += update
+        np.multiply(self.mean, 1 - self.momentum, out=update)
+        self.running_mean *= self.momentum
+        self.running_mean += update
+        self.inv_std += self.eps
+        np.sqrt(self.inv_std, out=self.inv_std)
+        np.divide(1, self.inv_std, out=self.inv_std)
+        np.copyto(rows, self.inv_std)
+        normalized *= rows
+        np.copyto(rows, self.gamma)
+        np.multiply(normalized, rows, out=out)
+        np.copyto(rows, self.beta)
+        out += rows
+
+    def infer(self, inputs):
+        scale = self.gamma / np.sqrt(self.running_var + self.eps)
+        out = inputs - self.running_mean
+        out *= scale
+        out += self.beta
+        return out
+
+    def backward(self, n, acts, grads, delta=None):
+        d_outputs = grads[self.dst][:n]
+        normalized, temp = self.normalized[:n], self.temp[:n]
+        np.sum(d_outputs, axis=0, out=self.grad_beta)
+        np.multiply(d_outputs, normalized, out=temp)
+        np.sum(temp, axis=0, out=self.grad_gamma)
+        d_inputs = self._input_gradient(n, grads)
+        if d_inputs is None:
+            return
+        # d_inputs = inv_std * (d_xhat - mean(d_xhat) - xhat * mean(d_xhat * xhat))
+        rows = self.rows[:n]
+        np.copyto(rows, self.gamma)
+        np.multiply(d_outputs, rows, out=temp)  # d_xhat
+        mean_d, mean_dx = self.sums
+        np.mean(temp, axis=0, out=mean_d)
+        np.multiply(temp, normalized, out=d_inputs)
+        np.mean(d_inputs, axis=0, out=mean_dx)
+        np.copyto(rows, mean_dx)
+        np.multiply(normalized, rows, out=d_inputs)
+        np.subtract(temp, d_inputs, out=d_inputs)
+        np.copyto(rows, mean_d)
+        d_inputs -= rows
+        np.copyto(rows, self.inv_std)
+        d_inputs *= rows
+        self._add_input_gradient(n, grads, d_inputs)
+
+class _AddOp(_Op):
+    # End of a residual block: dst = src (block output) + skip (block input).
+    def __init__(self, src, dst, skip):
+        super().__init__(src, dst)
+        self.skip = skip
+        self.skip_write = True
+
+    def forward(self, n, acts, training):
+        np.add(acts[self.src], acts[self.skip], out=acts[self.dst])
+
+    def backward(self, n, acts, grads, delta=None):
+        d_outputs = grads[self.dst][:n]
+        d_inputs = self._input_gradient(n, grads)
+        if d_inputs is not None:
+            np.copyto(d_inputs, d_outputs)
+            self._add_input_gradient(n, grads, d_inputs)
+        if self.skip != 0:
+            if self.skip_write:
+                np.copyto(grads[self.skip][:n], d_outputs)
+            else:
+                grads[self.skip][:n] += d_outputs
+
+
+class Sequential:
+    def __init__(self, input_size, layers, loss='mse', dtype='float64', max_batch=256, seed=None,
+                 initialize=True):
+        """
+        A network built from layer specs and compiled into a flat plan.
+
+        input_size: number of input features.
+        layers: list of specs, e.g.
+            [Dense(256, 'relu'), BatchNorm(), Dropout(0.1),
+             Residual(Dense(256, 'relu'), Dense(256)),
+             Dense(10, 'softmax')]
+        loss: as for Network ('mse', 'cross_entropy', ... or a loss object);
+            softmax + cross-entropy and sigmoid + binary cross-entropy use the
+            fused output gradient.
+        dtype: 'float64' or 'float32'.
+        max_batch: rows the activation buffers are sized for. A larger batch
+            reallocates them once, to its size.
+        seed: seed for weight initialization and dropout masks.
+
+        Has the interface Trainer, Profiler and the optimizers use (train_step,
+        infer, compute_loss, get_parameters, ...), and saves to the same
+        checkpoint format as Network.
+        """
+        self.input_size = input_size
+        self.specs = list(layers)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("Sequential dtype must be float32 or float64.")
+        self.loss = get_loss(loss)
+        self.input_normalizer = None
+        self.target_normalizer = None
+        self.optimizer = None
+        self._rng = np.random.default_rng(seed)
+
+        self.widths = [input_size]  # width of every buffer
+        self.ops = []
+        self.output_buffer = self._compile(self.specs, 0)
+        self.output_size = self.widths[self.output_buffer]
+        self._plan_gradients()
+        last = self.ops[-1]
+        fused = getattr(self.loss, 'fused_activation', None)
+        self._fused = (isinstance(last, _DenseOp) and fused is not None
+                       and fused == getattr(last.activation, 'name', None))
+        self.layers = self.ops  # per-op timing with Profiler
+
+        total = sum(op.num_params for op in self.ops)
+        self.use_buffers(np.zeros(total, dtype=self.dtype), np.zeros(total, dtype=self.dtype))
+        self.state = np.zeros(sum(op.num_state for op in self.ops), dtype=self.dtype)
+        offset = 0
+        for op in self.ops:
+            op.bind_state(self.state[offset:offset + op.num_state])
+            offset += op.num_state
+            if hasattr(op, 'reset_state'):
+                op.reset_state()
+            if initialize and hasattr(op, 'initialize'):
+                op.initialize(self._rng)
+        self.max_batch = 0
+        self._allocate(max_batch)
+
+    def _compile(self, specs, src):
+        # Appends the ops for specs reading buffer src; returns the output buffer.
+        for spec in specs:
+            width = self.widths[src]
+            if isinstance(spec, Residual):
+                end = self._compile(spec.layers, src)
+                if self.widths[end] != width:
+                    raise ValueError(f"Residual block changes the width from {width} to "
+                                     f"{self.widths[end]}; it must keep it.")
+                dst = self._new_buffer(width)
+                self.ops.append(_AddOp(end, dst, src))
+            elif isinstance(spec, Dense):
+                dst = self._new_buffer(spec.units)
+                self.ops.append(_DenseOp(src, dst, width, spec.units, spec.activation))
+            elif isinstance(spec, Dropout):
+                dst = self._new_buffer(width)
+                self.ops.append(_DropoutOp(src, dst, width, spec.rate, self._rng))
+            elif isinstance(spec, BatchNorm):
+                dst = self._new_buffer(width)
+                self.ops.append(_BatchNormOp(src, dst, width, spec.momentum, spec.eps))
+            else:
+                raise TypeError(f"Unknown layer spec {spec!r}; use Dense, Dropout, BatchNorm or Residual.")
+            src = dst
+        return src
+
+    def _new_buffer(self, width):
+        self.widths.append(width)
+        return len(self.widths) - 1
+
+    def _plan_gradients(self):
+        # Walking backwards, the first op to produce the gradient of a buffer
+        # writes it and any later one adds to it.
+        written = set()
+        for op in reversed(self.ops):
+            op.write = op.src not in written
+            written.add(op.src)
+            if isinstance(op, _AddOp):
+                op.skip_write = op.skip not in written
+                written.add(op.skip)
+
+    def _allocate(self, batch):
+        # (Re)allocates every activation, gradient and scratch buffer for batch rows.
+        self.max_batch = batch
+        self._activations = [None] + [np.empty((batch, width), dtype=self.dtype) for width in self.widths[1:]]
+        self._gradients = [None] + [np.empty((batch, width), dtype=self.dtype) for width in self.widths[1:]]
+        for op in self.ops:
+            op.allocate(batch, self.dtype)
+            op.scratch = None if op.write or op.src == 0 else np.empty((batch, self.widths[op.src]), dtype=self.dtype)
+        self._acts = None
+
+    def use_buffers(self, params, grads, copy=True):
+        """
+        Moves the parameters and gradients into the given flat arrays (see
+        Network.use_buffers); every op is re-bound to views of them.
+        """
+        total = sum(op.num_params for op in self.ops)
+        if params.shape != (total,) or grads.shape != (total,):
+            raise ValueError(f"Parameter and gradient buffers must have {total} elements.")
+        if params.dtype != self.dtype or grads.dtype != self.dtype:
+            raise ValueError(f"Parameter and gradient buffers must have dtype {self.dtype.name}.")
+        if copy and getattr(self, 'params', None) is not None:
+            params[...] = self.params
+        offset = 0
+        for op in self.ops:
+            op.bind(params[offset:offset + op.num_params], grads[offset:offset + op.num_params])
+            offset += op.num_params
+        self.params = params
+        self.grads = grads
+
+    def forward(self, inputs, training=True):
+        """
+        Runs a (batch, features) block through the plan.
+
+        training: use dropout and batch statistics (and update the running
+        statistics); False gives inference behaviour.
+        Returns a view of the output buffer, which the next call overwrites;
+        copy it to keep it. Use infer() for thread-safe predictions.
+        """
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        if inputs.ndim == 1:
+            inputs = inputs.reshape(1, -1)
+        if inputs.ndim != 2 or inputs.shape[1] != self.input_size:
+            raise ValueError(f"Expected a (batch, {self.input_size}) input.")
+        n = len(inputs)
+        if n > self.max_batch:
+            self._allocate(n)
+        acts = [inputs] + [buffer[:n] for buffer in self._activations[1:]]
+        for op in self.ops:
+            op.forward(n, acts, training)
+        self._acts = acts
+        return acts[self.output_buffer]
+
+    def backward(self, targets):
+        """
+        Backpropagates the batch of the last forward call. Returns (loss,
+        gradients), with the gradients in the flat grads buffer.
+        """
+        acts = self._acts
+        if acts is None:
+            raise ValueError("Call forward before backward.")
+        outputs = acts[self.output_buffer]
+        n = len(outputs)
+        targets = np.asarray(targets, dtype=self.dtype)
+        if targets.shape != outputs.shape:
+            raise ValueError(f"Targets must have the same shape as the model output {outputs.shape}, "
+                             f"got {targets.shape}.")
+        ops = self.ops
+        if self._fused:
+            loss = self.loss.value(targets, outputs)
+            ops[-1].backward(n, acts, self._gradients, self.loss.fused_delta(targets, outputs))
+            ops = ops[:-1]
+        else:
+            loss, d_outputs = self.loss.value_and_grad(targets, outputs)
+            self._gradients[self.output_buffer][:n] = d_outputs
+        for op in reversed(ops):
+            op.backward(n, acts, self._gradients)
+        return loss, self.grads
+
+    def train_step(self, inputs, targets, optimizer):
+        """
+        One forward pass, backpropagation and optimizer update on a batch.
+        Returns the loss measured before the update.
+        """
+        self.forward(inputs, training=True)
+        loss, grads = self.backward(targets)
+        self.set_parameters(optimizer.update(self.params, grads))
+        return loss
+
+    def infer(self, inputs):
+        """
+        Inference pass (no dropout, running batch-norm statistics) on one
+        vector or a (batch, features) array. Uses its own arrays instead of
+        the shared buffers, so it is safe to call from several threads.
+        """
+        data = np.asarray(inputs, dtype=self.dtype)
+        single = data.ndim == 1
+        data = data.reshape(1, -1) if single else data
+        values = [data] + [None] * (len(self.widths) - 1)
+        for op in self.ops:
+            if isinstance(op, _AddOp):
+                values[op.dst] = values[op.src] + values[op.skip]
+            else:
+                values[op.dst] = op.infer(values[op.src])
+        output = values[self.output_buffer]
+        return output[0] if single else output
+
+    def predict(self, inputs):
+        # Raw inputs in, raw-scale predictions out, as with Network.predict.
+        if self.input_normalizer is not None:
+            inputs = self.input_normalizer.transform(inputs)
+        output = self.infer(inputs)
+        if self.target_normalizer is not None:
+            output = self.target_normalizer.inverse_transform(output)
+        return output
+
+    def compute_loss(self, targets, outputs):
+        return self.loss.value(targets, outputs)
+
+    def total_parameters(self):
+        return self.params.size
+
+    def get_parameters(self, copy=False):
+        return self.params.copy() if copy else self.params
+
+    def set_parameters(self, new_params):
+        if new_params is self.params:
+            return
+        if len(new_params) != self.params.size:
+            raise ValueError("Number of parameters does not match the model.")
+        self.params[:] = new_params
+
+    def summary(self):
+        """
+        Returns one (op, output width, parameters) row per plan op.
+        """
+        rows = []
+        for op in self.ops:
+            name = type(op).__name__.strip('_').replace('Op', '')
+            if isinstance(op, _DenseOp):
+                name += f"({getattr(op.activation, 'name', type(op.activation).__name__)})"
+            rows.append((name, self.widths[op.dst], op.num_params))
+        return rows
+
+    def save(self, filename, optimizer=None):
+        """
+        Saves the specs, loss, normalizers, parameters and batch-norm
+        statistics (and optionally an optimizer) as a checkpoint file.
+        """
+        header = {
+            'model': 'Sequential',
+            'input_size': self.input_size,
+            'layers': [spec.to_dict() for spec in self.specs],
+            'loss': self.loss.to_dict(),
+            'dtype': self.dtype.name,
+            'max_batch': self.max_batch,
+            'input_normalizer': self.input_normalizer.to_dict() if self.input_normalizer else None,
+            'target_normalizer': self.target_normalizer.to_dict() if self.target_normalizer else None,
+            'optimizer': None,
+        }
+        arrays = [('params', self.params), ('state', self.state)]
+        optimizer = optimizer if optimizer is not None else self.optimizer
+        if optimizer is not None:
+            header['optimizer'], optimizer_arrays = optimizer_header(optimizer)
+            arrays += optimizer_arrays
+        write_checkpoint(filename, header, arrays)
+
+    @classmethod
+    def from_file(cls, filename, mmap=False):
+        """
+        Builds the model saved by save(); with mmap the parameters are used
+        straight from the file (copy-on-write).
+        """
+        header, arrays = read_checkpoint(filename, mmap=mmap)
+        if header.get('model') != 'Sequential':
+            raise ValueError(f"{filename} does not hold a Sequential model.")
+        model = cls(header['input_size'], [layer_from_dict(layer) for layer in header['layers']],
+                    header['loss'], header['dtype'], header['max_batch'], initialize=False)
+        params = arrays['params']
+        if mmap and params.dtype == model.dtype:
+            model.use_buffers(params, model.grads, copy=False)
+        else:
+            model.params[:] = params
+        model.state[:] = arrays['state']
+        for key in ('input_normalizer', 'target_normalizer'):
+            if header.get(key):
+                setattr(model, key, Normalizer.from_dict(header[key]))
+        state = optimizer_state(header, arrays)
+        if state is not None:
+            from .optimizer import Optimizer  # only needed to resume training
+            model.optimizer = Optimizer.from_state_dict(state)
+        return model
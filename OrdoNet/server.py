@@ -0,0 +1,236 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+class LatencyStats:
+    def __init__(self, window=100000):
+        """
+        Keeps the latency of the most recent requests (at most window of
+        them) and counts requests and batches since the last reset().
+        """
+        self.latencies = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        self.latencies.clear()
+        self.requests = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    def record(self, latencies):
+        # Adds the latencies (in seconds) of one batch of requests.
+        self.latencies.extend(latencies)
+        self.requests += len(latencies)
+        self.batches += 1
+
+    def summary(self):
+        """
+        Returns p50 and p99 latency (milliseconds), requests per second
+        and the average batch size.
+        """
+        elapsed = time.perf_counter() - self.started
+        if self.latencies:
+            p50, p99 = np.percentile(np.fromiter(self.latencies, dtype=float), [50, 99]) * 1000
+        else:
+            p50 = p99 = 0.0
+        return {
+            'requests': self.requests,
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+            'requests_per_second': self.requests / elapsed if elapsed > 0 else 0.0,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+        }
+
+class MicroBatcher:
+    def __init__(self, net, max_batch_size=64, max_delay=0.002):
+        """
+        Gathers concurrent predict() calls into one batched forward pass.
+
+        A batch is run as soon as max_batch_size requests are waiting, or
+        max_delay seconds after the first request of the batch arrived,
+        whichever comes first. While a batch runs (in a worker thread, using
+        the stateless Network.predict), new requests queue up for the next one.
+        """
+        if max_batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        self.net = net
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.num_inputs = net.input_size  # Network, Sequential or QuantizedNetwork
+        self.stats = LatencyStats()
+        self._pending = []  # (inputs, future, arrival time) of waiting requests
+        self._arrived = None
+        self._full = None
+        self._task = None
+
+    def start(self):
+        # Must be called from inside the running event loop.
+        if self._task is None:
+            self._arrived = asyncio.Event()
+            self._full = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, inputs):
+        """
+        Returns the network's prediction for one input vector.
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        if inputs.shape != (self.num_inputs,):
+            raise ValueError(f"Expected an input vector of {self.num_inputs} numbers.")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((inputs, future, time.perf_counter()))
+        self._arrived.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._arrived.wait()
+            if len(self._pending) < self.max_batch_size:
+                # Give other requests time to join this batch, until max_delay
+                # after the oldest waiting request arrived. Requests that queued
+                # up while the last batch ran may already be past that.
+                remaining = self._pending[0][2] + self.max_delay - time.perf_counter()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            if len(self._pending) < self.max_batch_size:
+                self._full.clear()
+            if not self._pending:
+                self._arrived.clear()
+            inputs = np.stack([item[0] for item in batch])
+            try:
+                outputs = await loop.run_in_executor(None, self.net.predict, inputs)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+            for (_, future, _), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+            self.stats.record([finished - arrived for _, _, arrived in batch])
+
+class InferenceServer:
+    def __init__(self, net, host='127.0.0.1', port=8000, max_batch_size=64, max_delay=0.002):
+        """
+        A small HTTP/1.1 server for a trained Network, built on asyncio.
+
+        POST /predict  body {"inputs": [x1, x2, ...]} or {"inputs": [[...], [...]]}
+                       answers {"outputs": ...} in the same shape.
+        GET  /stats    answers p50/p99 latency, requests per second and the
+                       average batch size (see LatencyStats.summary).
+        Concurrent requests are combined by a MicroBatcher. Connections are
+        kept alive, so a client can send many requests over one connection.
+
+        port: 0 picks a free port; the chosen one is in self.port after start().
+        """
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(net, max_batch_size, max_delay)
+        self._server = None
+
+    async def start(self):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    def serve_forever(self):
+        """
+        Starts the server and runs until interrupted (Ctrl+C).
+        """
+        async def main():
+            await self.start()
+            print(f"Serving on http://{self.host}:{self.port}")
+            try:
+                await self._server.serve_forever()
+            finally:
+                await self.stop()
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
+
+    async def _handle(self, reader, writer):
+        # Answers requests on one connection until the client closes it.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, response = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                payload = json.dumps(response).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # client went away or sent a malformed request
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        # Returns (status line, JSON-serializable response).
+        if method == 'GET' and path == '/stats':
+            return '200 OK', self.batcher.stats.summary()
+        if method != 'POST' or path != '/predict':
+            return '404 Not Found', {'error': f"No route for {method} {path}."}
+        try:
+            inputs = np.asarray(json.loads(body)['inputs'], dtype=float)
+            if inputs.ndim == 1:
+                outputs = await self.batcher.predict(inputs)
+            else:
+                outputs = np.stack(await asyncio.gather(*(self.batcher.predict(row) for row in inputs)))
+        except (ValueError, KeyError, TypeError) as e:
+            return '400 Bad Request', {'error': str(e)}
+        return '200 OK', {'outputs': outputs.tolist()}
+
+if __name__ == '__main__':
+    # Usage: python -m OrdoNet.server model.ckpt [port]
+    from .inference import load_model
+    if len(sys.argv) < 2:
+        print("Usage: python -m OrdoNet.server model.ckpt [port]")
+        sys.exit(1)
+    model = load_model(sys.argv[1])
+    InferenceServer(model, port=int(sys.argv[2]) if len(sys.argv) > 2 else 8000).serve_forever()
@@ -0,0 +1,86 @@
+import numpy as np
+
+class RunningStats:
+    def __init__(self, num_columns):
+        """
+        Per-column count, mean, variance, min and max, collected in one pass.
+
+        Data is added chunk by chunk with update(); each chunk is summarised
+        with NumPy and folded in with the parallel form of Welford's algorithm,
+        so the result does not depend on how the data was split. Two
+        RunningStats (e.g. from different worker processes) can be combined
+        with merge().
+        """
+        self.num_columns = num_columns
+        self.count = 0
+        self.mean = np.zeros(num_columns)
+        self.m2 = np.zeros(num_columns)  # sum of squared differences from the mean
+        self.min = np.full(num_columns, np.inf)
+        self.max = np.full(num_columns, -np.inf)
+
+    def update(self, chunk):
+        """
+        Adds a (rows, num_columns) chunk of data.
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim == 1:
+            chunk = chunk.reshape(1, -1)
+        if chunk.shape[1] != self.num_columns:
+            raise ValueError(f"Expected {self.num_columns} columns, got {chunk.shape[1]}.")
+        if len(chunk) == 0:
+            return self
+        other = RunningStats(self.num_columns)
+        other.count = len(chunk)
+        other.mean = chunk.mean(axis=0)
+        other.m2 = ((chunk - other.mean) ** 2).sum(axis=0)
+        other.min = chunk.min(axis=0)
+        other.max = chunk.max(axis=0)
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        Folds another RunningStats over the same columns into this one.
+        """
+        if other.num_columns != self.num_columns:
+            raise ValueError("Cannot merge statistics with a different number of columns.")
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / total)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        # Population variance of every column.
+        if self.count == 0:
+            return np.zeros(self.num_columns)
+        return self.m2 / self.count
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def to_dict(self):
+        # Plain Python values, so the statistics can be stored as JSON.
+        return {
+            'count': self.count,
+            'mean': self.mean.tolist(),
+            'm2': self.m2.tolist(),
+            'min': self.min.tolist(),
+            'max': self.max.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(len(data['mean']))
+        stats.count = data['count']
+        stats.mean = np.array(data['mean'], dtype=float)
+        stats.m2 = np.array(data['m2'], dtype=float)
+        stats.min = np.array(data['min'], dtype=float)
+        stats.max = np.array(data['max'], dtype=float)
+        return stats
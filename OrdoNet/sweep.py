@@ -0,0 +1,353 @@
+import csv
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .checkpoint import load_optimizer
+from .dataset import MappedDataset
+from .inference import load_model
+from .network import Network
+from .normalizer import Normalizer
+from .optimizer import AdamOptimizer
+from .trainer import Trainer
+
+# Hyperparameter sweeps with successive halving.
+#
+# Every trial is one configuration (learning rate, layer sizes, ...) trained
+# with the usual Trainer loop in a pool of worker processes. Trials run in
+# rounds ("rungs") with a growing epoch budget: after each rung the trials
+# are ranked by their last epoch loss and only the best 1/eta go on, so
+# most of the compute goes to the promising ones. A trial that goes on is
+# resumed from a checkpoint of its model and optimizer, not retrained.
+#
+# The dataset is a binary cache (dataset.csv_to_cache). Only its path is
+# sent to the workers; each one opens it with a memory map, so the rows are
+# shared through the operating system's page cache and never pickled.
+#
+# All trials of a rung are independent, so a rung takes about
+# (trials / workers) trial times. Rankings depend only on the seed, never on
+# the number of workers, so a sweep gives the same table on any machine.
+
+MODEL_KEYS = ('layers', 'activation', 'output_activation', 'loss', 'dtype')
+TRAINER_KEYS = ('lr', 'batch_size')
+
+def build_network(config, num_features, num_labels):
+    """
+    Default model builder for a sweep: a Network with config['layers']
+    hidden sizes (default [16]) using config['activation'] (default 'relu'),
+    an output layer with config['output_activation'] (default 'linear'),
+    config['loss'] (default 'mse') and config['dtype'] (default 'float64').
+    """
+    layers = list(config.get('layers', [16]))
+    activations = [config.get('activation', 'relu')] * len(layers) + [config.get('output_activation', 'linear')]
+    return Network([num_features] + layers + [num_labels], activations,
+                   loss=config.get('loss', 'mse'), dtype=config.get('dtype', 'float64'))
+
+# Dataset split of the last trial this process ran, reused by later trials
+# with the same settings so a worker reads and scales the data only once.
+_DATA = {}
+
+def _trial_data(task, dtype):
+    # (features, labels, validation_data) for training, in the model's dtype.
+    key = (task['path'], task['validation_split'], task['seed'], task['normalize'], dtype.name)
+    if key in _DATA:
+        return _DATA[key]
+    _DATA.clear()
+    dataset = MappedDataset(task['path'])
+    features, labels = dataset.features, dataset.labels
+    validation = None
+    if task['validation_split'] > 0:
+        # The same held-out rows for every trial. Sorted, so the reads move
+        # forward through the file.
+        order = np.random.default_rng(task['seed']).permutation(len(dataset))
+        held_out = int(round(len(dataset) * task['validation_split']))
+        train_rows, validation_rows = np.sort(order[held_out:]), np.sort(order[:held_out])
+        validation = (features[validation_rows], labels[validation_rows])
+        features, labels = features[train_rows], labels[train_rows]
+    if task['normalize'] is not None or dataset.data.dtype != dtype:
+        # Scaled copies in the model's dtype; otherwise the memory-mapped
+        # views are used as they are.
+        features, labels = _scaled(features, labels, task, dtype)
+        if validation is not None:
+            validation = _scaled(*validation, task, dtype)
+    _DATA[key] = (features, labels, validation)
+    return _DATA[key]
+
+def _scaled(features, labels, task, dtype):
+    features = np.array(features, dtype=dtype)
+    labels = np.array(labels, dtype=dtype)
+    if task['normalize'] is not None:
+        task['input_normalizer'].transform(features, in_place=True)
+        task['target_normalizer'].transform(labels, in_place=True)
+    return features, labels
+
+def _trial_model(task):
+    # A new model for the first rung, or the one saved by the last rung.
+    if task['start'] > 0:
+        return load_model(task['checkpoint'], mmap=False), load_optimizer(task['checkpoint'])
+    config = task['config']
+    np.random.seed(task['seed'])  # the same initial weights for equal architectures
+    model = task['build'](config, task['num_features'], task['num_labels'])
+    model.input_normalizer = task['input_normalizer']
+    model.target_normalizer = task['target_normalizer']
+    optimizer = AdamOptimizer(model.total_parameters(), lr=config.get('lr', 0.01), dtype=model.dtype)
+    return model, optimizer
+
+def _run_trial(task):
+    # Runs in a worker process: trains one trial from epoch start to stop
+    # and saves it. Returns (trial, history, error, seconds); errors are
+    # reported as text so one bad configuration does not stop the sweep.
+    start = time.perf_counter()
+    try:
+        model, optimizer = _trial_model(task)
+        features, labels, validation = _trial_data(task, model.dtype)
+        trainer = Trainer(model, optimizer, batch_size=task['config'].get('batch_size', 32),
+                          seed=[task['seed'], task['start']], verbose=False)
+        history = trainer.fit(features, labels, task['stop'] - task['start'], validation_data=validation)
+        model.save(task['checkpoint'], optimizer=optimizer)
+    except Exception as error:
+        return task['trial'], None, f"{type(error).__name__}: {error}", time.perf_counter() - start
+    return task['trial'], history, None, time.perf_counter() - start
+
+class Sweep:
+    def __init__(self, dataset, space, samples=None, build=None, epochs=81, min_epochs=3, eta=3,
+                 validation_split=0.2, normalize=None, workers=None, start_method=None, seed=0,
+                 directory=None):
+        """
+        Hyperparameter sweep over a cached dataset with successive halving.
+
+            sweep = Sweep('salary.cache', {'lr': [0.001, 0.01, 0.05], 'layers': [[4], [16], [16, 16]]},
+                          epochs=90, normalize='minmax')
+            sweep.run()
+            sweep.report()
+            sweep.save_csv('sweep.csv')
+
+        dataset: path of a cache written by dataset.csv_to_cache, or a MappedDataset.
+        space: dict of name -> list of values. Every combination is a trial,
+            unless samples is given. With the default build the names are
+            'layers', 'activation', 'output_activation', 'loss', 'dtype',
+            'lr' and 'batch_size'.
+        samples: run this many random combinations instead of all of them.
+        build: callable (config, num_features, num_labels) -> model (a Network
+            or Sequential); build_network by default. With a process pool it
+            must be a module-level function so it can be pickled.
+        epochs: epochs of the trials that make it through every rung.
+        min_epochs, eta: the rungs end after epochs / eta**k epochs (k = ...,
+            2, 1, 0), the first one after at least min_epochs, and after each
+            rung only the best 1/eta of the trials go on.
+        validation_split: fraction of the rows (the same ones for every trial)
+            held out to rank trials by 'val_loss'; 0 ranks them by training 'loss'.
+        normalize: None, 'minmax' or 'zscore': scale features and labels with
+            the statistics stored in the cache. Saved models include the
+            normalizers, so they predict on the original scale.
+        workers: number of processes (default: number of CPU cores); 1 runs
+            every trial in this process.
+        start_method: multiprocessing start method ('fork', 'spawn', ...).
+        seed: seeds initial weights, shuffling and the validation split.
+        directory: keep each trial's checkpoint (trial_<n>.ckpt) here;
+            by default they go to a temporary folder that is removed after run().
+        """
+        if isinstance(dataset, MappedDataset):
+            dataset = dataset.path
+        if not space:
+            raise ValueError("The search space is empty.")
+        if 'epochs' in space:
+            raise ValueError("Epochs are set by the sweep's budget; use epochs and min_epochs instead.")
+        if build is None:
+            unknown = set(space) - set(MODEL_KEYS) - set(TRAINER_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown hyperparameter(s) {', '.join(sorted(unknown))} for the default "
+                                 f"build. Choose from: {', '.join(MODEL_KEYS + TRAINER_KEYS)}.")
+        if min_epochs <= 0 or epochs < min_epochs:
+            raise ValueError("min_epochs must be positive and at most epochs.")
+        if eta < 2:
+            raise ValueError("eta must be at least 2.")
+        if not 0 <= validation_split < 1:
+            raise ValueError("validation_split must be at least 0 and less than 1.")
+        if normalize not in (None, 'minmax', 'zscore'):
+            raise ValueError("normalize must be None, 'minmax' or 'zscore'.")
+        self.dataset = dataset
+        self.space = {name: list(values) for name, values in space.items()}
+        self.samples = samples
+        self.build = build or build_network
+        self.epochs = epochs
+        self.min_epochs = min_epochs
+        self.eta = eta
+        self.validation_split = validation_split
+        self.normalize = normalize
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.seed = seed
+        self.directory = directory
+        self.metric = 'val_loss' if validation_split > 0 else 'loss'
+        self.results = []
+        self.wall_time = 0.0
+
+    def configs(self):
+        """
+        Returns the list of trial configurations (dicts).
+        """
+        names = list(self.space)
+        if self.samples is None:
+            return [dict(zip(names, values)) for values in itertools.product(*self.space.values())]
+        rng = np.random.default_rng(self.seed)
+        return [{name: self.space[name][rng.integers(len(self.space[name]))] for name in names}
+                for _ in range(self.samples)]
+
+    def rungs(self):
+        """
+        Returns the epoch budget at the end of each rung, e.g. [3, 9, 27, 81].
+        """
+        budgets = [self.epochs]
+        while budgets[0] // self.eta >= self.min_epochs:
+            budgets.insert(0, budgets[0] // self.eta)
+        return budgets
+
+    def run(self):
+        """
+        Runs the sweep and returns the results, best first: one dict per
+        trial with 'rank', 'trial', 'config', 'epochs' (trained), 'loss',
+        'val_loss', 'best_epoch' (epoch with the lowest metric), 'status'
+        ('finished', 'pruned' or the error), 'seconds' (training time) and,
+        with a directory, 'checkpoint'.
+        """
+        start = time.perf_counter()
+        dataset = MappedDataset(self.dataset)
+        normalizers = (None, None)
+        if self.normalize is not None:
+            normalizers = (Normalizer.from_stats(dataset.feature_stats, self.normalize),
+                           Normalizer.from_stats(dataset.label_stats, self.normalize))
+        directory = self.directory or tempfile.mkdtemp(prefix='ordonet-sweep-')
+        os.makedirs(directory, exist_ok=True)
+        trials = [{'trial': index, 'config': config, 'epochs': 0, 'history': {}, 'status': 'running',
+                   'seconds': 0.0, 'checkpoint': os.path.join(directory, f"trial_{index}.ckpt")}
+                  for index, config in enumerate(self.configs())]
+        base_task = {
+            'path': dataset.path, 'num_features': dataset.num_features, 'num_labels': dataset.num_labels,
+            'build': self.build, 'validation_split': self.validation_split, 'seed': self.seed,
+            'normalize': self.normalize, 'input_normalizer': normalizers[0],
+            'target_normalizer': normalizers[1],
+        }
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(self.start_method))
+        try:
+            alive = trials
+            rungs = self.rungs()
+            for rung, budget in enumerate(rungs):
+                tasks = [dict(base_task, trial=trial['trial'], config=trial['config'], start=trial['epochs'],
+                              stop=budget, checkpoint=trial['checkpoint']) for trial in alive]
+                results = executor.map(_run_trial, tasks) if executor is not None else map(_run_trial, tasks)
+                for index, history, error, seconds in results:
+                    trial = trials[index]
+                    trial['seconds'] += seconds
+                    if error is not None:
+                        trial['status'] = error
+                        continue
+                    for name, values in history.items():
+                        trial['history'].setdefault(name, []).extend(values)
+                    trial['epochs'] = budget
+                alive = sorted((trial for trial in alive if trial['status'] == 'running'), key=self._score)
+                if rung < len(rungs) - 1:
+                    for trial in alive[max(1, len(alive) // self.eta):]:
+                        trial['status'] = 'pruned'
+                    alive = alive[:max(1, len(alive) // self.eta)]
+            for trial in alive:
+                trial['status'] = 'finished'
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            _DATA.clear()
+            if self.directory is None:
+                shutil.rmtree(directory, ignore_errors=True)
+
+        # Finished trials first, then by how far they got and their score.
+        order = sorted(trials, key=lambda trial: (trial['status'] != 'finished', -trial['epochs'],
+                                                  self._score(trial)))
+        self.results = []
+        for rank, trial in enumerate(order, 1):
+            history = trial['history']
+            metric = history.get(self.metric, [])
+            self.results.append({
+                'rank': rank,
+                'trial': trial['trial'],
+                'config': trial['config'],
+                'epochs': trial['epochs'],
+                'loss': history['loss'][-1] if history.get('loss') else None,
+                'val_loss': history['val_loss'][-1] if history.get('val_loss') else None,
+                'best_epoch': int(np.nanargmin(metric)) + 1 if metric and not np.all(np.isnan(metric)) else None,
+                'status': trial['status'],
+                'seconds': trial['seconds'],
+            })
+            if self.directory is not None:
+                self.results[-1]['checkpoint'] = trial['checkpoint']
+        self.wall_time = time.perf_counter() - start
+        return self.results
+
+    @property
+    def best(self):
+        # The best result of the last run.
+        if not self.results:
+            raise ValueError("Call run() first.")
+        return self.results[0]
+
+    def best_model(self):
+        """
+        Loads the best trial's model from its checkpoint (needs a directory).
+        """
+        if 'checkpoint' not in self.best:
+            raise ValueError("Checkpoints are only kept when the sweep has a directory.")
+        return load_model(self.best['checkpoint'], mmap=False)
+
+    def rows(self):
+        """
+        Returns the results table: a header row, then one row per trial,
+        with one column per hyperparameter.
+        """
+        names = list(self.space)
+        header = ['rank', 'trial'] + names + ['epochs', 'loss', 'val_loss', 'best_epoch', 'status', 'seconds']
+        rows = [header]
+        for result in self.results:
+            rows.append([result['rank'], result['trial']] + [result['config'][name] for name in names] +
+                        [result['epochs'], result['loss'], result['val_loss'], result['best_epoch'],
+                         result['status'], round(result['seconds'], 3)])
+        return rows
+
+    def report(self):
+        """
+        Prints the results table, best first.
+        """
+        finished = sum(result['status'] == 'finished' for result in self.results)
+        epochs = sum(result['epochs'] for result in self.results)
+        print(f"{len(self.results)} trials, {finished} trained for {self.epochs} epochs, "
+              f"{epochs} epochs in total, {self.wall_time:.2f} s with {self.workers} worker(s), "
+              f"ranked by {self.metric}")
+        rows = [[_format(value) for value in row] for row in self.rows()]
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        for row in rows:
+            print('  '.join(value.rjust(width) for value, width in zip(row, widths)))
+
+    def save_csv(self, path):
+        # Writes the results table as CSV.
+        with open(path, 'w', newline='') as file:
+            csv.writer(file).writerows(self.rows())
+
+    def _score(self, trial):
+        # Last value of the ranking metric; diverged trials rank last.
+        values = trial['history'].get(self.metric)
+        if not values or not np.isfinite(values[-1]):
+            return float('inf')
+        return values[-1]
+
+def _format(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
@@ -0,0 +1,339 @@
+import math
+import time
+
+import numpy as np
+
+from .optimizer import AdamOptimizer
+from .utils import log, progress_bar
+from .workspace import Workspace
+
+# Learning-rate schedules: callables that take (epoch, base_lr), with epochs
+# counted from 0, and return the learning rate for that epoch. Any function
+# with the same signature can be passed to Trainer as schedule.
+
+class StepDecay:
+    def __init__(self, step_size, gamma=0.1):
+        """
+        Multiplies the learning rate by gamma every step_size epochs.
+        """
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def __call__(self, epoch, base_lr):
+        return base_lr * self.gamma ** (epoch // self.step_size)
+
+class ExponentialDecay:
+    def __init__(self, gamma=0.95):
+        """
+        Multiplies the learning rate by gamma every epoch.
+        """
+        self.gamma = gamma
+
+    def __call__(self, epoch, base_lr):
+        return base_lr * self.gamma ** epoch
+
+class CosineAnnealing:
+    def __init__(self, epochs, min_lr=0.0):
+        """
+        Lowers the learning rate from base_lr to min_lr along half a cosine
+        wave over the given number of epochs.
+        """
+        self.epochs = epochs
+        self.min_lr = min_lr
+
+    def __call__(self, epoch, base_lr):
+        progress = min(epoch / max(self.epochs - 1, 1), 1.0)
+        return self.min_lr + (base_lr - self.min_lr) * 0.5 * (1 + math.cos(math.pi * progress))
+
+class Callback:
+    """
+    Base class for Trainer hooks; override the methods you need.
+
+    logs is a dict with the latest values: 'epoch', 'loss', 'lr' and, with
+    validation data, 'val_loss'. on_batch_end gets 'epoch', 'batch',
+    'batches' and 'loss' (running average of the epoch so far; 'batches' is
+    the batches seen so far when a pipeline of unknown length is used). It is
+    throttled: Trainer calls it at most once every hook_interval seconds,
+    plus once after the last batch of every epoch.
+    """
+    def on_train_begin(self, trainer):
+        pass
+
+    def on_epoch_end(self, trainer, logs):
+        pass
+
+    def on_batch_end(self, trainer, logs):
+        pass
+
+    def on_train_end(self, trainer, logs):
+        pass
+
+class EarlyStopping(Callback):
+    def __init__(self, patience=10, min_delta=0.0, monitor=None, restore_best=True):
+        """
+        Stops training when the monitored loss has not improved by at least
+        min_delta for patience epochs.
+
+        monitor: 'loss' or 'val_loss'; by default 'val_loss' when there is
+            validation data, otherwise 'loss'.
+        restore_best: put back the parameters of the best epoch at the end.
+        """
+        self.patience = patience
+        self.min_delta = min_delta
+        self.monitor = monitor
+        self.restore_best = restore_best
+        self.best = None
+        self.best_epoch = None
+        self._best_params = None
+        self._waited = 0
+
+    def on_train_begin(self, trainer):
+        self.best = None
+        self.best_epoch = None
+        self._best_params = None
+        self._waited = 0
+
+    def on_epoch_end(self, trainer, logs):
+        monitor = self.monitor or ('val_loss' if 'val_loss' in logs else 'loss')
+        value = logs[monitor]
+        if self.best is None or value < self.best - self.min_delta:
+            self.best = value
+            self.best_epoch = logs['epoch']
+            self._waited = 0
+            if self.restore_best:
+                self._best_params = trainer.net.get_parameters(copy=True)
+        else:
+            self._waited += 1
+            if self._waited >= self.patience:
+                trainer.stop_training = True
+
+    def on_train_end(self, trainer, logs):
+        if self.restore_best and self._best_params is not None:
+            trainer.net.set_parameters(self._best_params)
+
+class ProgressLogger(Callback):
+    def __init__(self, interval=1.0, progress=False):
+        """
+        Logs the epoch losses at most once every interval seconds (and always
+        for the last epoch), so printing does not slow down small models.
+
+        progress: also draw a progress bar over the batches of each epoch
+        (updated only when Trainer calls on_batch_end).
+        """
+        self.interval = interval
+        self.progress = progress
+        self._last = None
+
+    def on_train_begin(self, trainer):
+        self._last = None
+
+    def on_batch_end(self, trainer, logs):
+        if self.progress:
+            progress_bar(logs['batch'], logs['batches'])
+
+    def on_epoch_end(self, trainer, logs):
+        now = time.perf_counter()
+        last_epoch = trainer.stop_training or logs['epoch'] == trainer.epochs
+        if self._last is None or now - self._last >= self.interval or last_epoch:
+            self._last = now
+            message = f"Epoch {logs['epoch']}/{trainer.epochs}: Average Loss = {logs['loss']:.4f}"
+            if 'val_loss' in logs:
+                message += f", Validation Loss = {logs['val_loss']:.4f}"
+            log(message)
+
+class Trainer:
+    def __init__(self, net, optimizer=None, batch_size=32, shuffle=True, seed=None,
+                 validation_split=0.0, schedule=None, callbacks=(), verbose=True,
+                 log_interval=1.0, hook_interval=0.1, profiler=None):
+        """
+        Trains a Network with vectorized mini-batch epochs.
+
+        optimizer: e.g. AdamOptimizer(net.total_parameters()); Adam with
+            lr=0.01 if not given.
+        batch_size: samples per optimizer step (forward_batch / backward_batch).
+        shuffle: visit the samples in a new random order every epoch.
+        seed: seed for shuffling and the validation split.
+        validation_split: fraction of the samples (picked at random) held
+            out to measure 'val_loss' after each epoch, unless fit() gets
+            validation_data.
+        schedule: callable (epoch, base_lr) -> lr, e.g. StepDecay(30, 0.5).
+        callbacks: Callback objects, e.g. EarlyStopping(patience=20).
+        verbose: add a ProgressLogger that logs at most every log_interval seconds.
+        hook_interval: minimum time in seconds between on_batch_end calls.
+        profiler: a profiler.Profiler; fit() attaches it to the network and
+            optimizer and also times data loading, validation and each epoch.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        if not 0 <= validation_split < 1:
+            raise ValueError("validation_split must be at least 0 and less than 1.")
+        self.net = net
+        self.optimizer = optimizer or AdamOptimizer(net.total_parameters(), dtype=net.dtype)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.validation_split = validation_split
+        self.schedule = schedule
+        self.callbacks = list(callbacks)
+        if verbose:
+            self.callbacks.append(ProgressLogger(log_interval))
+        self.hook_interval = hook_interval
+        self.profiler = profiler
+        self.workspace = Workspace()  # reused arrays for shuffled batches
+        self.epochs = 0
+        self.stop_training = False
+        self.history = {}
+
+    def fit(self, data, targets=None, epochs=1, validation_data=None):
+        """
+        Trains for up to the given number of epochs (callbacks such as
+        EarlyStopping can stop earlier).
+
+        data, targets: (samples, features) and (samples, outputs) arrays or lists.
+            data can instead be a pipeline.Pipeline (or any re-iterable of
+            (inputs, targets) batches) with targets left as None; it is
+            iterated once per epoch and does its own shuffling and batching,
+            so batch_size, shuffle and validation_split do not apply.
+        validation_data: optional (data, targets) pair to evaluate after each epoch.
+        Returns the history: a dict of per-epoch lists 'loss', 'lr' and
+        (with validation) 'val_loss'.
+        """
+        if targets is None:
+            if validation_data is None and self.validation_split > 0:
+                raise ValueError("validation_split needs arrays; pass validation_data with a pipeline.")
+            epoch_batches = lambda: iter(data)
+            num_batches = len(data) if hasattr(data, '__len__') else None
+        else:
+            # Kept in the network's dtype, so batches need no conversion.
+            data = np.asarray(data, dtype=self.net.dtype)
+            targets = np.asarray(targets, dtype=self.net.dtype)
+            if len(data) != len(targets):
+                raise ValueError("Data and targets must have the same number of samples.")
+            if validation_data is None and self.validation_split > 0:
+                order = self.rng.permutation(len(data))
+                held_out = int(round(len(data) * self.validation_split))
+                if held_out == 0 or held_out == len(data):
+                    raise ValueError("validation_split leaves no samples for training or validation.")
+                validation_data = (data[order[:held_out]], targets[order[:held_out]])
+                data, targets = data[order[held_out:]], targets[order[held_out:]]
+            epoch_batches = lambda: self._array_batches(data, targets)
+            num_batches = math.ceil(len(data) / self.batch_size)
+        if validation_data is not None:
+            validation_data = (np.asarray(validation_data[0], dtype=self.net.dtype),
+                               np.asarray(validation_data[1], dtype=self.net.dtype))
+
+        self.epochs = epochs
+        self.stop_training = False
+        self.history = {'loss': [], 'lr': []}
+        if validation_data is not None:
+            self.history['val_loss'] = []
+        base_lr = self.optimizer.lr
+        profiler = self.profiler
+        attached = profiler is not None and not profiler.active
+        if attached:
+            profiler.attach(self.net, self.optimizer)
+        try:
+            self._run_epochs(epoch_batches, num_batches, epochs, base_lr, validation_data)
+        finally:
+            if attached:
+                profiler.detach()
+            # The schedule only applies within this fit: a later fit (or
+            # partial_fit with the same optimizer) starts from base_lr again
+            # instead of compounding the decay.
+            if self.schedule is not None:
+                self.optimizer.lr = base_lr
+        return self.history
+
+    def _array_batches(self, data, targets):
+        # One epoch of mini-batches from in-memory arrays.
+        order = self.rng.permutation(len(data)) if self.shuffle else None
+        for start in range(0, len(data), self.batch_size):
+            if order is None:
+                yield data[start:start + self.batch_size], targets[start:start + self.batch_size]
+            else:
+                # Gathered into the same two arrays every step instead of new
+                # ones (data[rows]). The rows are always valid, and mode='clip'
+                # skips the bounds check that would copy through a temporary.
+                rows = order[start:start + self.batch_size]
+                inputs = self.workspace.get('inputs', (len(rows),) + data.shape[1:], data.dtype)
+                outputs = self.workspace.get('targets', (len(rows),) + targets.shape[1:], targets.dtype)
+                yield (np.take(data, rows, axis=0, out=inputs, mode='clip'),
+                       np.take(targets, rows, axis=0, out=outputs, mode='clip'))
+
+    def _run_epochs(self, epoch_batches, num_batches, epochs, base_lr, validation_data):
+        profiler = self.profiler
+        clock = time.perf_counter
+        dtype = self.net.dtype
+        logs = {}
+        for callback in self.callbacks:
+            callback.on_train_begin(self)
+
+        for epoch in range(epochs):
+            epoch_start = clock()
+            if self.schedule is not None:
+                self.optimizer.lr = self.schedule(epoch, base_lr)
+            batches = epoch_batches()
+            total_loss = 0.0
+            samples = 0
+            batch = hooked = 0
+            last_hook = epoch_start
+            while True:
+                # Time spent here is time the network waits for data.
+                load_start = clock()
+                item = next(batches, None)
+                if item is None:
+                    break
+                inputs = np.asarray(item[0], dtype=dtype)
+                expected = np.asarray(item[1], dtype=dtype)
+                if profiler is not None:
+                    profiler.record('data', 'data', load_start, clock())
+                batch += 1
+                total_loss += self.net.train_step(inputs, expected, self.optimizer) * len(inputs)
+                samples += len(inputs)
+                # Batch hooks are throttled so they cost almost nothing on small models.
+                now = clock()
+                if self.callbacks and now - last_hook >= self.hook_interval:
+                    last_hook = now
+                    hooked = batch
+                    self._batch_end(epoch, batch, num_batches, total_loss / samples)
+            if samples == 0:
+                raise ValueError("No training batches in this epoch.")
+            if self.callbacks and hooked != batch:
+                self._batch_end(epoch, batch, num_batches, total_loss / samples)
+
+            logs = {'epoch': epoch + 1, 'loss': total_loss / samples, 'lr': self.optimizer.lr}
+            if validation_data is not None:
+                validation_start = clock()
+                logs['val_loss'] = self.evaluate(*validation_data)
+                if profiler is not None:
+                    profiler.record('validation', 'validation', validation_start, clock())
+            for key, values in self.history.items():
+                values.append(logs[key])
+            for callback in self.callbacks:
+                callback.on_epoch_end(self, logs)
+            if profiler is not None:
+                profiler.record('epoch', 'epoch', epoch_start, clock())
+            if self.stop_training:
+                break
+
+        for callback in self.callbacks:
+            callback.on_train_end(self, logs)
+
+    def _batch_end(self, epoch, batch, num_batches, loss):
+        logs = {'epoch': epoch + 1, 'batch': batch, 'batches': num_batches or batch, 'loss': loss}
+        for callback in self.callbacks:
+            callback.on_batch_end(self, logs)
+
+    def evaluate(self, data, targets):
+        """
+        Returns the network's loss on the given data, using the stateless
+        inference path (in batches of batch_size, to bound memory).
+        """
+        data = np.asarray(data, dtype=self.net.dtype)
+        targets = np.asarray(targets, dtype=self.net.dtype)
+        total = 0.0
+        for start in range(0, len(data), self.batch_size):
+            inputs = data[start:start + self.batch_size]
+            outputs = self.net.infer(inputs)
+            total += self.net.compute_loss(targets[start:start + self.batch_size], outputs) * len(inputs)
+        return total / len(data)
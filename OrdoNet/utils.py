@@ -1,61 +1,95 @@
-import sys
-import datetime
-
-def log(msg):
-    """
-    Prints a message with a timestamp.
-    If msg is not a string, it's converted automatically.
-    """
-    try:
-        print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}")
-    except Exception as e:
-        print("Error in log:", e)
-
-def progress_bar(current, total, length=40):
-    """
-    Displays a simple text progress bar.
-    
-    current: current progress value.
-    total: total value (must be > 0).
-    length: total length of the bar in characters.
-    """
-    try:
-        if total == 0:
-            sys.stdout.write("\rTotal is zero, cannot compute progress.")
-            sys.stdout.flush()
-            return
-        frac = current / total
-        # Ensure fraction is within [0, 1]
-        frac = max(0, min(frac, 1))
-        filled = int(frac * length)
-        bar = f"\r[{'#' * filled}{' ' * (length - filled)}] {int(frac * 100)}%"
-        sys.stdout.write(bar)
-        sys.stdout.flush()
-        if current >= total:
-            print()  # Move to next line when complete.
-    except Exception as e:
-        print("\nError in progress_bar:", e)
-
-def plot_loss(losses):
-    """
-    Plots the loss over epochs using matplotlib.
-    If losses is empty or matplotlib is not installed, prints a message.
-    """
-    if not losses:
-        print("No loss values provided to plot.")
-        return
-    try:
-        import matplotlib.pyplot as plt
-    except ImportError:
-        print("matplotlib is not installed.")
-        return
-    try:
-        plt.plot(losses, marker='o')
-        plt.title("Loss per Epoch")
-        plt.xlabel("Epoch")
-        plt.ylabel("Loss")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-    except Exception as e:
-        print("Error while plotting loss:", e)
\ No newline at end of file
+import sys
+import datetime
+
+def log(msg):
+    """
+    Prints a message with a timestamp.
+    If msg is not a string, it's converted automatically.
+    """
+    try:
+        print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}")
+    except Exception as e:
+        print("Error in log:", e)
+
+def progress_bar(current, total, length=40):
+    """
+    Displays a simple text progress bar.
+    
+    current: current progress value.
+    total: total value (must be > 0).
+    length: total length of the bar in characters.
+    """
+    try:
+        if total == 0:
+            sys.stdout.write("\rTotal is zero, cannot compute progress.")
+            sys.stdout.flush()
+            return
+        frac = current / total
+        # Ensure fraction is within [0, 1]
+        frac = max(0, min(frac, 1))
+        filled = int(frac * length)
+        bar = f"\r[{'#' * filled}{' ' * (length - filled)}] {int(frac * 100)}%"
+        sys.stdout.write(bar)
+        sys.stdout.flush()
+        if current >= total:
+            print()  # Move to next line when complete.
+    except Exception as e:
+        print("\nError in progress_bar:", e)
+
+def plot_loss(losses):
+    """
+    Plots the loss over epochs using matplotlib.
+    If losses is empty or matplotlib is not installed, prints a message.
+    """
+    if not losses:
+        print("No loss values provided to plot.")
+        return
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed.")
+        return
+    try:
+        plt.plot(losses, marker='o')
+        plt.title("Loss per Epoch")
+        plt.xlabel("Epoch")
+        plt.ylabel("Loss")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+    except Exception as e:
+        print("Error while plotting loss:", e)
+
+def gradient_check(net, inputs, target, eps=1e-6):
+    """
+    Compares backpropagation gradients with finite differences.
+
+    net: Network to check (its parameters are restored afterwards).
+    inputs, target: one sample, or a (batch, features) block and its targets.
+    eps: step used for the central differences.
+    Returns the largest relative error over all parameters; values below
+    about 1e-5 mean the gradients are correct.
+    """
+    batched = len(inputs) > 0 and hasattr(inputs[0], '__len__')  # rows of samples
+    forward = net.forward_batch if batched else net.forward
+    loss_fn = net.compute_loss
+
+    forward(inputs)
+    analytic = list(net.backward_batch(target) if batched else net.backward(target))
+    params = [float(p) for p in net.get_parameters()]
+
+    worst = 0.0
+    for i in range(len(params)):
+        original = params[i]
+        params[i] = original + eps
+        net.set_parameters(params)
+        loss_plus = loss_fn(target, forward(inputs))
+        params[i] = original - eps
+        net.set_parameters(params)
+        loss_minus = loss_fn(target, forward(inputs))
+        params[i] = original
+        numeric = (loss_plus - loss_minus) / (2 * eps)
+        scale = max(abs(numeric), abs(analytic[i]), 1e-8)
+        worst = max(worst, abs(numeric - analytic[i]) / scale)
+    net.set_parameters(params)
+    return worst
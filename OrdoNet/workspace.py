@@ -0,0 +1,49 @@
+import numpy as np
+
+# Reusable scratch arrays for the training loop.
+#
+# A training step on a mini-batch needs the same intermediate arrays every
+# time: each layer's outputs, the errors of its weighted sums and the
+# gradient passed to the layer before it. Allocating them anew on every step
+# costs time and memory churn, so they are taken from a Workspace instead,
+# which keeps one array per key and hands out views of it. An array is only
+# allocated again when a batch has more rows than any earlier one, or a
+# different width or dtype; a smaller last batch uses the first rows.
+
+class Workspace:
+    def __init__(self):
+        """
+        Creates an empty workspace. Arrays are allocated on first use.
+        """
+        self.buffers = {}
+        self.allocations = 0  # arrays allocated so far
+
+    def get(self, key, shape, dtype):
+        """
+        Returns an uninitialized array of the given shape, reusing the
+        one kept under key when it is large enough.
+
+        key: any hashable value, e.g. (layer, 'outputs').
+        shape: (rows, ...); only the number of rows may vary between calls.
+        The contents are whatever the last user of the key left there, and
+        the array is overwritten by the next call with the same key.
+        """
+        dtype = np.dtype(dtype)
+        buffer = self.buffers.get(key)
+        if (buffer is None or len(buffer) < shape[0] or buffer.shape[1:] != tuple(shape[1:])
+                or buffer.dtype != dtype):
+            buffer = np.empty(shape, dtype=dtype)
+            self.buffers[key] = buffer
+            self.allocations += 1
+        return buffer[:shape[0]]
+
+    @property
+    def nbytes(self):
+        # Memory held by all arrays in the workspace.
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def clear(self):
+        """
+        Drops every array, e.g. after training to give the memory back.
+        """
+        self.buffers.clear()
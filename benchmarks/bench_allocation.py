@@ -0,0 +1,96 @@
+"""
+Memory allocated by the training loop, with and without the network's workspace.
+
+Trains a [64, width, width, 10] ReLU/softmax Network with its workspace
+(the default), the same network with net.workspace = None (fresh arrays for
+every intermediate, as before the workspace existed) and the equivalent
+Sequential. For each it reports the time of one training step, the memory
+allocated during a training step (tracemalloc peak above the steady state),
+the same for whole Trainer epochs (shuffled batch gathering included), the
+number of garbage collector runs during those epochs and the number of
+arrays the workspace allocated after the first epoch.
+
+tests/test_workspace.py asserts the per-step allocation budget; this
+script only reports the numbers.
+
+Run from the repository root:
+    python benchmarks/bench_allocation.py [width] [batch]
+"""
+import gc
+import sys
+import tracemalloc
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.sequential import Sequential, Dense
+from OrdoNet.trainer import Trainer
+
+def traced_peak(fn):
+    # Peak bytes allocated while fn runs, above what was allocated before.
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return peak
+
+def collections(fn):
+    # Garbage collector runs (any generation) while fn runs.
+    runs = [0]
+
+    def count(phase, info):
+        if phase == 'start':
+            runs[0] += 1
+
+    gc.callbacks.append(count)
+    try:
+        fn()
+    finally:
+        gc.callbacks.remove(count)
+    return runs[0]
+
+def build(name, width, batch):
+    np.random.seed(0)
+    if name == "Sequential":
+        return Sequential(64, [Dense(width, 'relu'), Dense(width, 'relu'), Dense(10, 'softmax')],
+                          loss='cross_entropy', max_batch=batch, seed=0)
+    net = Network([64, width, width, 10], ['relu', 'relu', 'softmax'], loss='cross_entropy')
+    if name == "Network, no workspace":
+        net.workspace = None
+    return net
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(4096, 64))
+    labels = np.eye(10)[rng.integers(0, 10, len(data))]
+    inputs, targets = data[:batch], labels[:batch]
+
+    rows = []
+    for name in ("Network", "Network, no workspace", "Sequential"):
+        model = build(name, width, batch)
+        optimizer = AdamOptimizer(model.total_parameters())
+        step = measure(lambda: model.train_step(inputs, targets, optimizer), repeat=10)
+        step_kib = traced_peak(lambda: [model.train_step(inputs, targets, optimizer)
+                                        for _ in range(10)]) / 1024
+        trainer = Trainer(model, optimizer, batch_size=batch, seed=0, verbose=False)
+        trainer.fit(data, labels, 1)  # warm up: every array is allocated here
+        workspace = getattr(model, 'workspace', None)
+        before = workspace.allocations if workspace is not None else 0
+        epoch_kib = traced_peak(lambda: trainer.fit(data, labels, 2)) / 1024
+        runs = collections(lambda: trainer.fit(data, labels, 2))
+        after = workspace.allocations if workspace is not None else 0
+        rows.append([name, f"{step * 1000:.3f}", f"{step_kib:.1f}", f"{epoch_kib:.1f}",
+                     runs, after - before if workspace is not None else "-"])
+
+    print(f"[64, {width}, {width}, 10] relu/softmax, batch {batch}, {len(data)} samples")
+    report(rows, ["model", "step ms", "KiB per step", "KiB in 2 epochs", "gc runs", "new arrays"])
+    print("(KiB in 2 epochs includes each epoch's shuffled order)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Many small models: one predict call per model vs. one stacked Ensemble pass.
+
+For 10, 100 and 1000 [8, 32, 32, 1] regression models (one per customer
+segment, each with its own normalizers) the table compares:
+  - all models on a batch: a loop of net.predict vs. Ensemble.predict_all
+  - per-segment scoring: 4096 rows, each scored by its segment's model,
+    as a loop over segments vs. Ensemble.predict_each
+and, for an averaging ensemble of 10 larger [64, 256, 256, 10] softmax
+classifiers, a loop of predict + mean vs. Ensemble.predict. Results are
+checked against the loop.
+
+Run from the repository root:
+    python benchmarks/bench_ensemble.py [batch]
+"""
+import sys
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.ensemble import Ensemble
+from OrdoNet.network import Network
+from OrdoNet.normalizer import Normalizer
+
+def segment_models(count, rng):
+    nets = []
+    for segment in range(count):
+        net = Network([8, 32, 32, 1], ['relu', 'relu', 'linear'])
+        net.input_normalizer = Normalizer('zscore').fit(rng.normal(segment % 7, 2.0, size=(64, 8)))
+        net.target_normalizer = Normalizer('zscore').fit(rng.normal(100.0 * segment, 10.0, size=(64, 1)))
+        nets.append(net)
+    return nets
+
+def loop_each(nets, inputs, segments):
+    result = np.empty((len(inputs), 1))
+    for segment, net in enumerate(nets):
+        rows = np.flatnonzero(segments == segment)
+        if len(rows):
+            result[rows] = net.predict(inputs[rows])
+    return result
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    rows = []
+    for count in (10, 100, 1000):
+        nets = segment_models(count, rng)
+        ensemble = Ensemble(nets)
+        inputs = rng.normal(size=(batch, 8))
+        expected = np.stack([net.predict(inputs) for net in nets])
+        assert np.allclose(ensemble.predict_all(inputs), expected)
+        loop = measure(lambda: [net.predict(inputs) for net in nets])
+        stacked = measure(lambda: ensemble.predict_all(inputs))
+        rows.append([f"{count} models, batch {batch}", f"{loop * 1000:.2f}", f"{stacked * 1000:.2f}",
+                     f"{loop / stacked:.1f}x"])
+
+        scored = rng.normal(size=(4096, 8))
+        segments = rng.integers(0, count, len(scored))
+        assert np.allclose(ensemble.predict_each(scored, segments), loop_each(nets, scored, segments))
+        loop = measure(lambda: loop_each(nets, scored, segments))
+        stacked = measure(lambda: ensemble.predict_each(scored, segments))
+        rows.append([f"{count} models, 4096 rows by segment", f"{loop * 1000:.2f}", f"{stacked * 1000:.2f}",
+                     f"{loop / stacked:.1f}x"])
+
+    nets = [Network([64, 256, 256, 10], ['relu', 'relu', 'softmax'], loss='cross_entropy') for _ in range(10)]
+    ensemble = Ensemble(nets)
+    inputs = rng.normal(size=(256, 64))
+    assert np.allclose(ensemble.predict(inputs), np.mean([net.predict(inputs) for net in nets], axis=0))
+    loop = measure(lambda: np.mean([net.predict(inputs) for net in nets], axis=0))
+    stacked = measure(lambda: ensemble.predict(inputs))
+    rows.append(["10 x [64, 256, 256, 10] average, batch 256", f"{loop * 1000:.2f}", f"{stacked * 1000:.2f}",
+                 f"{loop / stacked:.1f}x"])
+
+    report(rows, ["case", "loop ms", "ensemble ms", "speedup"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares the dense NumPy Layer with the old object-per-neuron path.
+
+Run from the repository root:
+    python benchmarks/bench_layer.py
+"""
+import random
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.layer import Layer
+from OrdoNet.neuron import Neuron
+
+WIDTHS = [16, 64, 256, 1024]
+
+def neuron_step(neurons, inputs):
+    # The original Layer.forward / Layer.backward, one Neuron object per unit.
+    outputs = [neuron.forward(inputs) for neuron in neurons]
+    grads = [neuron.backward(out - 0.5) for neuron, out in zip(neurons, outputs)]
+    d_inputs = [0.0 for _ in range(len(inputs))]
+    for _, _, d in grads:
+        for j, val in enumerate(d):
+            d_inputs[j] += val
+    return d_inputs
+
+def dense_step(layer, inputs):
+    outputs = layer.forward(inputs)
+    return layer.backward(outputs - 0.5)[2]
+
+def main():
+    random.seed(0)
+    np.random.seed(0)
+    rows = []
+    for width in WIDTHS:
+        inputs = [random.uniform(-1, 1) for _ in range(width)]
+        neurons = [Neuron(width) for _ in range(width)]
+        layer = Layer(width, width)
+        repeat = 3 if width >= 256 else 10
+        t_old = measure(lambda: neuron_step(neurons, inputs), repeat=repeat)
+        t_new = measure(lambda: dense_step(layer, inputs), repeat=repeat)
+        rows.append([f"{width}x{width}", f"{t_old * 1e3:.3f}", f"{t_new * 1e3:.3f}",
+                     f"{t_old / t_new:.1f}x"])
+    print("Layer forward + backward, one sample (ms)")
+    report(rows, ["layer", "neurons", "dense", "speedup"])
+
+if __name__ == '__main__':
+    main()
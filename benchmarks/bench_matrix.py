@@ -0,0 +1,60 @@
+"""
+Micro-benchmarks for Matrix on square sizes from 8 to 1024.
+
+The reference is the original nested-list Matrix.dot (triple Python loop),
+which is only run up to 128 because it gets very slow after that.
+Run from the repository root:
+    python benchmarks/bench_matrix.py
+"""
+import random
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.matrix import Matrix
+
+SIZES = [8, 16, 32, 64, 128, 256, 512, 1024]
+REFERENCE_MAX = 128
+
+def reference_dot(a, b):
+    # The original list-of-lists multiplication.
+    result = []
+    for row in a:
+        new_row = []
+        for col in zip(*b):
+            total = 0
+            for x, y in zip(row, col):
+                total += x * y
+            new_row.append(total)
+        result.append(new_row)
+    return result
+
+def main():
+    random.seed(0)
+    np.random.seed(0)
+    rows = []
+    for n in SIZES:
+        a = Matrix(n, n)
+        b = Matrix(n, n)
+        a.randomize()
+        b.randomize()
+        repeat = 3 if n >= 512 else 10
+        t_dot = measure(lambda: a.dot(b), repeat=repeat)
+        t_iadd = measure(lambda: a.iadd(b), repeat=repeat)
+        t_add = measure(lambda: a.add(b), repeat=repeat)
+        t_t = measure(lambda: a.transpose(), repeat=repeat)
+        gflops = 2 * n ** 3 / t_dot / 1e9
+        if n <= REFERENCE_MAX:
+            a_list, b_list = a.data.tolist(), b.data.tolist()
+            t_ref = measure(lambda: reference_dot(a_list, b_list), warmup=0, repeat=1)
+            ref = f"{t_ref * 1e3:.2f}"
+            speedup = f"{t_ref / t_dot:.0f}x"
+        else:
+            ref, speedup = "-", "-"
+        rows.append([n, ref, f"{t_dot * 1e3:.3f}", speedup, f"{gflops:.1f}",
+                     f"{t_add * 1e6:.1f}", f"{t_iadd * 1e6:.1f}", f"{t_t * 1e6:.2f}"])
+    print("Matrix micro-benchmarks (dot in ms, element-wise and transpose in us)")
+    report(rows, ["n", "ref dot", "dot", "speedup", "GFLOP/s", "add", "iadd", "transpose"])
+
+if __name__ == '__main__':
+    main()
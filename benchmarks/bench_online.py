@@ -0,0 +1,87 @@
+"""
+Absorbing new data with Network.partial_fit vs. retraining from scratch.
+
+A regression model is trained on a base dataset, saved with its optimizer
+and reloaded, as a live service would. Then a small slice of new data
+arrives whose relation has drifted a little. The table compares the time to
+take the slice in and the loss on fresh samples from the new distribution:
+  - retrain: a new network trained for the same epochs on base + new data
+  - partial_fit: the loaded model, a few steps per new mini-batch
+
+Run from the repository root:
+    python benchmarks/bench_online.py [base_rows] [new_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from harness import report
+from OrdoNet.network import Network
+from OrdoNet.normalizer import Normalizer
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.trainer import Trainer
+
+WEIGHTS = np.array([[1.0], [-2.0], [0.5], [3.0]])
+
+def make_data(rng, rows, drift=0.0):
+    data = rng.normal(5.0, 2.0, size=(rows, 4))
+    targets = np.sin(data) @ WEIGHTS + data[:, :1] * (1.0 + drift) + rng.normal(0, 0.05, size=(rows, 1))
+    return data, targets
+
+def new_model(data, targets):
+    np.random.seed(0)
+    net = Network([4, 64, 64, 1], ['relu', 'relu', 'linear'])
+    net.input_normalizer = Normalizer('zscore').fit(data)
+    net.target_normalizer = Normalizer('zscore').fit(targets)
+    return net
+
+def train(net, data, targets, epochs):
+    # Full epochs with the normalizers fixed, as the nightly job does.
+    net.optimizer = AdamOptimizer(net.total_parameters(), lr=0.005)  # kept for save()
+    Trainer(net, net.optimizer, batch_size=64, seed=0, verbose=False).fit(
+        net.input_normalizer.transform(data), net.target_normalizer.transform(targets), epochs)
+
+def test_loss(net, data, targets):
+    # Mean squared error relative to the variance of the targets, so models
+    # with different normalizer statistics are compared on the same scale.
+    return float(np.mean((net.predict(data) - targets) ** 2) / np.var(targets))
+
+def main():
+    base_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    new_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    epochs = 20
+    rng = np.random.default_rng(0)
+    base_x, base_y = make_data(rng, base_rows)
+    new_x, new_y = make_data(rng, new_rows, drift=0.3)
+    test_x, test_y = make_data(rng, 4096, drift=0.3)
+
+    net = new_model(base_x, base_y)
+    train(net, base_x, base_y, epochs)
+    rows = [["base model", "-", f"{test_loss(net, test_x, test_y):.4f}"]]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'live.ckpt')
+        net.save(path)  # parameters, normalizers and Adam state
+
+        start = time.perf_counter()
+        all_x, all_y = np.concatenate([base_x, new_x]), np.concatenate([base_y, new_y])
+        retrained = new_model(all_x, all_y)
+        train(retrained, all_x, all_y, epochs)
+        rows.append([f"retrain ({epochs} epochs)", f"{(time.perf_counter() - start) * 1000:.1f}",
+                     f"{test_loss(retrained, test_x, test_y):.4f}"])
+
+        for steps in (1, 5):
+            live = Network.from_file(path)
+            start = time.perf_counter()
+            for i in range(0, new_rows, 32):
+                live.partial_fit(new_x[i:i + 32], new_y[i:i + 32], steps=steps)
+            elapsed = (time.perf_counter() - start) * 1000
+            rows.append([f"partial_fit (steps={steps})", f"{elapsed:.1f}", f"{test_loss(live, test_x, test_y):.4f}"])
+
+    print(f"{base_rows} base rows, {new_rows} new rows with drift, [4, 64, 64, 1] network")
+    report(rows, ["update", "ms", "relative MSE on new data"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Measures optimizer throughput on a 1M-parameter vector.
+
+The reference is the original per-parameter Python loop of AdamOptimizer.
+Run from the repository root:
+    python benchmarks/bench_optimizer.py
+"""
+import math
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.optimizer import AdamOptimizer, AdamW, SGDOptimizer, RMSPropOptimizer
+
+SIZE = 1_000_000
+
+class ReferenceAdam:
+    # The original AdamOptimizer: one Python loop iteration per parameter.
+    def __init__(self, size, lr=0.01, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.lr, self.beta1, self.beta2, self.eps = lr, beta1, beta2, eps
+        self.t = 0
+        self.m = [0.0] * size
+        self.v = [0.0] * size
+
+    def update(self, weights, grads):
+        self.t += 1
+        new_weights = []
+        for i in range(len(weights)):
+            grad_i = float(grads[i])
+            self.m[i] = self.beta1 * self.m[i] + (1 - self.beta1) * grad_i
+            self.v[i] = self.beta2 * self.v[i] + (1 - self.beta2) * (grad_i ** 2)
+            m_hat = self.m[i] / (1 - self.beta1 ** self.t)
+            v_hat = self.v[i] / (1 - self.beta2 ** self.t)
+            new_weights.append(weights[i] - self.lr * m_hat / (math.sqrt(v_hat) + self.eps))
+        return new_weights
+
+def main():
+    rng = np.random.default_rng(0)
+    params = rng.uniform(-1, 1, SIZE)
+    grads = rng.normal(0, 0.1, SIZE)
+    rows = []
+
+    ref = ReferenceAdam(SIZE)
+    ref_weights, ref_grads = params.tolist(), grads.tolist()
+    t_ref = measure(lambda: ref.update(ref_weights, ref_grads), warmup=0, repeat=1)
+    rows.append(["Adam (reference loop)", f"{t_ref * 1e3:.1f}", f"{SIZE / t_ref / 1e6:.1f}", "1.0x"])
+
+    optimizers = [
+        ("Adam", AdamOptimizer(SIZE)),
+        ("AdamW", AdamW(SIZE)),
+        ("SGD momentum", SGDOptimizer(SIZE, momentum=0.9)),
+        ("RMSProp", RMSPropOptimizer(SIZE)),
+    ]
+    for name, opt in optimizers:
+        work = params.copy()
+        t = measure(lambda: opt.update(work, grads), warmup=2, repeat=10)
+        rows.append([name, f"{t * 1e3:.2f}", f"{SIZE / t / 1e6:.1f}", f"{t_ref / t:.0f}x"])
+
+    print(f"Optimizer step on {SIZE:,} parameters")
+    report(rows, ["optimizer", "ms/step", "Mparams/s", "speedup"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures epoch time of ParallelTrainer for 1, 2, 4, ... workers, up to the
+number of CPU cores, against the single-process train_step loop.
+
+Run from the repository root:
+    python benchmarks/bench_parallel.py [samples] [width]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from harness import report
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.parallel import ParallelTrainer
+
+def single_process_epoch(net, optimizer, data, targets, batch_size, rng):
+    order = rng.permutation(len(data))
+    for start in range(0, len(data), batch_size):
+        rows = order[start:start + batch_size]
+        net.train_step(data[rows], targets[rows], optimizer)
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 65536
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    batch_size = 1024
+    epochs = 2
+    rng = np.random.default_rng(0)
+    data = rng.random((samples, 64))
+    targets = rng.random((samples, 1))
+    sizes = [64, width, width, 1]
+
+    np.random.seed(0)
+    net = Network(sizes)
+    optimizer = AdamOptimizer(net.total_parameters())
+    single_process_epoch(net, optimizer, data, targets, batch_size, rng)  # warmup
+    start = time.perf_counter()
+    for _ in range(epochs):
+        single_process_epoch(net, optimizer, data, targets, batch_size, rng)
+    baseline = (time.perf_counter() - start) / epochs
+    rows = [["single process", f"{baseline:.3f}", "1.00x"]]
+
+    cores = os.cpu_count() or 1
+    counts = sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+    for workers in counts:
+        np.random.seed(0)
+        net = Network(sizes)
+        optimizer = AdamOptimizer(net.total_parameters())
+        with ParallelTrainer(net, optimizer, workers=workers) as trainer:
+            trainer.fit(data, targets, epochs=1, batch_size=batch_size, seed=0)  # warmup + worker start
+            start = time.perf_counter()
+            trainer.fit(data, targets, epochs=epochs, batch_size=batch_size, seed=1)
+            elapsed = (time.perf_counter() - start) / epochs
+        rows.append([f"{workers} workers", f"{elapsed:.3f}", f"{baseline / elapsed:.2f}x"])
+
+    print(f"Epoch time, {samples} samples, network {sizes}, batch {batch_size}, {cores} cores")
+    report(rows, ["mode", "s/epoch", "speedup"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Training throughput with a synchronous vs. a prefetching input pipeline.
+
+A synthetic CSV file (and its binary cache) is streamed through
+source -> normalize -> shuffle buffer -> batch, with no prefetch, a
+prefetch thread and a prefetch process, while a [16, width, width, 1]
+network trains one epoch per run. "data wait" is the time the training loop
+spent waiting for the next batch (the profiler's 'data' section); with
+prefetching it should drop towards zero as long as the data side is faster
+than the model. A process only helps with more than one CPU core.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py [rows] [width]
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from harness import report
+from OrdoNet.dataset import csv_to_cache
+from OrdoNet.network import Network
+from OrdoNet.normalizer import Normalizer
+from OrdoNet.pipeline import Pipeline
+from OrdoNet.profiler import Profiler
+from OrdoNet.trainer import Trainer
+
+def run(pipeline, width, epochs=2):
+    # Best epoch time and data wait (seconds) over a few epochs.
+    np.random.seed(0)
+    net = Network([16, width, width, 1], ['relu', 'relu', 'sigmoid'], dtype='float32')
+    best = None
+    for _ in range(epochs):
+        profiler = Profiler(memory=None)
+        Trainer(net, seed=0, verbose=False, profiler=profiler).fit(pipeline, epochs=1)
+        sections = profiler.summary()['sections']
+        result = (sections['epoch']['total_ms'] / 1000, sections['data']['total_ms'] / 1000)
+        best = result if best is None or result[0] < best[0] else best
+    return best
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    rng = np.random.default_rng(0)
+    values = rng.random((rows, 17)).astype(np.float32)
+    values[:, 16] = values[:, :16].sum(axis=1) > 8
+    normalizer = Normalizer('zscore').fit(values[:, :16])
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'data.csv')
+        np.savetxt(csv_path, values, delimiter=',', comments='', fmt='%.6f',
+                   header=','.join(f"c{i}" for i in range(17)))
+        cache_path = os.path.join(folder, 'data.cache')
+        csv_to_cache(csv_path, cache_path)
+        sources = [
+            ("csv", Pipeline.from_csv(csv_path, dtype='float32')),
+            ("cache", Pipeline.from_cache(cache_path)),
+        ]
+        results = []
+        for source_name, source in sources:
+            pipeline = source.normalize(normalizer).shuffle(16384, seed=0).batch(64)
+            for mode_name, candidate in [("none", pipeline),
+                                         ("thread", pipeline.prefetch(4)),
+                                         ("process", pipeline.prefetch(4, mode='process'))]:
+                epoch_time, wait = run(candidate, width)
+                results.append([source_name, mode_name, f"{epoch_time:.3f}", f"{wait:.3f}",
+                                f"{100 * wait / epoch_time:.0f}%", f"{rows / epoch_time:,.0f}"])
+
+    print(f"{rows} rows, [16, {width}, {width}, 1] float32 network, batch 64, "
+          f"{os.cpu_count()} CPU core(s)")
+    report(results, ["source", "prefetch", "epoch s", "data wait s", "wait %", "samples/s"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Memory, speed and accuracy of a trained model in float64, float32 and int8.
+
+A [64, width, width, 10] softmax classifier is trained in float64 on a fixed
+synthetic task, then converted with Network.astype('float32') and
+quantize.quantize(); every version is checked against the float64 model
+with accuracy_report on held-out data.
+
+Run from the repository root:
+    python benchmarks/bench_quantize.py [width]
+"""
+import sys
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.network import Network
+from OrdoNet.quantize import quantize, accuracy_report
+from OrdoNet.trainer import Trainer
+
+def make_data(rng, samples, classes=10):
+    # Class = which of 10 random directions the input points to most.
+    directions = np.random.default_rng(123).normal(size=(64, classes))
+    data = rng.normal(size=(samples, 64))
+    labels = np.eye(classes)[np.argmax(data @ directions, axis=1)]
+    return data, labels
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    train_x, train_y = make_data(rng, 8192)
+    test_x, test_y = make_data(rng, 4096)
+    net = Network([64, width, width, 10], ['relu', 'relu', 'softmax'], loss='cross_entropy')
+    net.params *= 0.1  # smaller start for ReLU layers
+    Trainer(net, batch_size=64, seed=0, verbose=False).fit(train_x, train_y, 5)
+
+    models = [("float64", net), ("float32", net.astype('float32')), ("int8", quantize(net))]
+    batch = test_x[:256]
+    rows = []
+    for name, model in models:
+        nbytes = model.params.nbytes if hasattr(model, 'params') else model.nbytes
+        accuracy = np.mean(model.infer(test_x).argmax(axis=1) == test_y.argmax(axis=1))
+        check = accuracy_report(net, model, test_x, test_y)
+        t_batch = measure(lambda: model.infer(batch), repeat=20)
+        t_single = measure(lambda: model.infer(test_x[0]), repeat=50)
+        rows.append([name, f"{nbytes / 1024:.0f}", f"{accuracy:.4f}", f"{check['max_abs_error']:.2e}",
+                     f"{check['argmax_agreement']:.4f}", f"{check['candidate_loss']:.4f}",
+                     f"{t_batch * 1e3:.3f}", f"{t_single * 1e6:.1f}"])
+    print(f"[64, {width}, {width}, 10] classifier, 4096 test samples")
+    report(rows, ["model", "KiB", "accuracy", "max |diff|", "argmax agree", "loss",
+                  "batch256 ms", "single us"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Network vs. the compiled Sequential plan for deep fully-connected models.
+
+For several depths, builds [64] + [width] * depth + [10] ReLU/softmax
+models both ways and reports construction time, memory held by the model
+object (tracemalloc), the time of one training step, and the memory allocated
+during a training step (tracemalloc peak above the steady state). A deep
+residual Sequential with batch norm and dropout is also trained briefly on a
+synthetic task to show that it learns.
+
+Run from the repository root:
+    python benchmarks/bench_sequential.py [width] [batch]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.sequential import Sequential, Dense, Dropout, BatchNorm, Residual
+from OrdoNet.trainer import Trainer
+
+def build_network(width, depth, batch):
+    return Network([64] + [width] * depth + [10], ['relu'] * depth + ['softmax'], loss='cross_entropy')
+
+def build_sequential(width, depth, batch):
+    return Sequential(64, [Dense(width, 'relu') for _ in range(depth)] + [Dense(10, 'softmax')],
+                      loss='cross_entropy', max_batch=batch, seed=0)
+
+def traced(fn):
+    # (result, bytes still held afterwards, peak bytes during the call)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - start, peak - start
+
+def step_allocation(model, optimizer, inputs, targets):
+    model.train_step(inputs, targets, optimizer)  # warm up
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    for _ in range(10):
+        model.train_step(inputs, targets, optimizer)
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return peak
+
+def compare(width, batch):
+    rng = np.random.default_rng(0)
+    inputs = rng.normal(size=(batch, 64))
+    targets = np.eye(10)[rng.integers(0, 10, batch)]
+    rows = []
+    for depth in (2, 8, 32):
+        for name, build in (("Network", build_network), ("Sequential", build_sequential)):
+            np.random.seed(0)
+            start = time.perf_counter()
+            model = build(width, depth, batch)
+            built = time.perf_counter() - start
+            _, held, _ = traced(lambda: build(width, depth, batch))
+            optimizer = AdamOptimizer(model.total_parameters())
+            step = measure(lambda: model.train_step(inputs, targets, optimizer), repeat=10)
+            allocated = step_allocation(model, optimizer, inputs, targets)
+            rows.append([depth, name, f"{built * 1000:.1f}", f"{held / 2 ** 20:.2f}",
+                         f"{step * 1000:.3f}", f"{allocated / 1024:.1f}"])
+    print(f"[64] + [{width}] * depth + [10] relu/softmax, batch {batch}")
+    report(rows, ["depth", "model", "build ms", "model MiB", "step ms", "KiB allocated per step"])
+
+def deep_residual_demo(width=64, blocks=8):
+    rng = np.random.default_rng(1)
+    directions = rng.normal(size=(64, 10))
+    data = rng.normal(size=(8192, 64))
+    labels = np.eye(10)[np.argmax(np.tanh(data @ directions), axis=1)]
+    layers = [Dense(width, 'relu'), BatchNorm()]
+    for _ in range(blocks):
+        layers.append(Residual(Dense(width, 'relu'), BatchNorm(), Dense(width)))
+    layers += [Dropout(0.1), Dense(10, 'softmax')]
+    model = Sequential(64, layers, loss='cross_entropy', max_batch=128, seed=0)
+    history = Trainer(model, batch_size=128, seed=0, verbose=False).fit(data[:7168], labels[:7168], 5)
+    accuracy = np.mean(model.infer(data[7168:]).argmax(axis=1) == labels[7168:].argmax(axis=1))
+    print(f"\n{len(model.ops)}-op residual model ({model.total_parameters()} parameters): "
+          f"loss {history['loss'][0]:.3f} -> {history['loss'][-1]:.3f} in 5 epochs, "
+          f"held-out accuracy {accuracy:.3f}")
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    compare(width, batch)
+    deep_residual_demo()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Load test for the micro-batching InferenceServer.
+
+Many concurrent clients send single-vector POST /predict requests over
+keep-alive connections; client-side p50/p99 latency and requests per second
+are reported with micro-batching off (batch size 1) and on.
+
+Run from the repository root:
+    python benchmarks/bench_server.py [clients] [requests_per_client]
+"""
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from harness import measure, report
+from OrdoNet.network import Network
+from OrdoNet.server import InferenceServer
+
+SIZES = [64, 256, 256, 10]
+
+async def client(port, requests, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    rng = np.random.default_rng(len(latencies))
+    for _ in range(requests):
+        body = json.dumps({'inputs': rng.random(SIZES[0]).tolist()}).encode('utf-8')
+        start = time.perf_counter()
+        writer.write(b"POST /predict HTTP/1.1\r\nHost: localhost\r\n"
+                     b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b'\r\n':
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def load_test(net, clients, requests, max_batch_size):
+    server = InferenceServer(net, port=0, max_batch_size=max_batch_size, max_delay=0.002)
+    await server.start()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(server.port, requests, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    mean_batch = server.batcher.stats.summary()['mean_batch_size']
+    await server.stop()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return [f"{p50:.2f}", f"{p99:.2f}", f"{len(latencies) / elapsed:.0f}", f"{mean_batch:.1f}"]
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    np.random.seed(0)
+    net = Network(SIZES, ['relu', 'relu', 'softmax'])
+
+    # In-process cost of one forward pass, for reference.
+    x = np.random.rand(SIZES[0])
+    batch = np.random.rand(64, SIZES[0])
+    print(f"Network {SIZES}: forward {measure(lambda: net.forward(x), repeat=200) * 1e6:.1f} us, "
+          f"infer {measure(lambda: net.infer(x), repeat=200) * 1e6:.1f} us, "
+          f"infer x64 {measure(lambda: net.infer(batch), repeat=200) * 1e6:.1f} us")
+
+    rows = []
+    for label, max_batch_size in (("no batching", 1), ("micro-batching", 64)):
+        rows.append([label] + asyncio.run(load_test(net, clients, requests, max_batch_size)))
+    print(f"{clients} concurrent clients x {requests} requests")
+    report(rows, ["mode", "p50 ms", "p99 ms", "req/s", "batch"])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold-start time of a fresh Python process for the main OrdoNet import paths.
+
+Each case is run in a new interpreter several times (the cases take turns,
+so background load affects them alike) and the fastest wall time is
+reported, next to the bare interpreter and `import numpy` for reference.
+The inference path (import OrdoNet.inference, load a checkpoint with mmap,
+predict one vector) must stay within BUDGET_MS of `import numpy` and must not
+import any training, data loading or plotting module; the script exits with
+status 1 otherwise.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import ROOT, report
+
+BUDGET_MS = 40  # allowed on top of importing NumPy (measured about 25-35 ms on one core)
+TRAINING_MODULES = ['trainer', 'optimizer', 'utils', 'dataset', 'pipeline', 'parallel', 'server', 'profiler', 'sweep']
+
+def cold_start(cases, runs):
+    # Fastest wall time (ms) of running each case's code in a fresh interpreter.
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = {name: float('inf') for name, _ in cases}
+    for _ in range(runs):
+        for name, code in cases:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], env=env, check=True, stdout=subprocess.DEVNULL)
+            best[name] = min(best[name], (time.perf_counter() - start) * 1000)
+    return best
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    sys.path.insert(0, ROOT)
+    from OrdoNet.network import Network
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'model.ckpt')
+        Network([64, 256, 256, 10], ['relu', 'relu', 'softmax']).save(path)
+        scoring = ("from OrdoNet.inference import load_model; "
+                   f"model = load_model({path!r}); model.predict([0.5] * 64)")
+        cases = [
+            ("python (no imports)", "pass"),
+            ("import numpy", "import numpy"),
+            ("import OrdoNet", "import OrdoNet"),
+            ("load checkpoint + predict", scoring),
+            ("import OrdoNet.trainer", "import OrdoNet.trainer"),
+            ("import everything", "import OrdoNet as o; [getattr(o, n) for n in o.__all__]"),
+        ]
+        results = cold_start(cases, runs)
+
+        check = scoring + "; import sys; print(' '.join(m for m in sys.modules if m.startswith('OrdoNet')))"
+        loaded = subprocess.run([sys.executable, '-c', check], env=dict(os.environ, PYTHONPATH=ROOT),
+                                check=True, capture_output=True, text=True).stdout.split()
+
+    numpy_ms = results["import numpy"]
+    rows = [[name, f"{ms:.1f}", f"{ms - numpy_ms:+.1f}"] for name, ms in results.items()]
+    print(f"Cold start, best of {runs} runs")
+    report(rows, ["case", "ms", "vs numpy"])
+    print(f"Modules loaded by the inference path: {', '.join(sorted(loaded))}")
+
+    extra = results["load checkpoint + predict"] - numpy_ms
+    heavy = [name for name in TRAINING_MODULES if f"OrdoNet.{name}" in loaded]
+    if heavy:
+        print(f"FAIL: the inference path imported {', '.join(heavy)}")
+        return 1
+    if extra > BUDGET_MS:
+        print(f"FAIL: inference cold start is {extra:.1f} ms over numpy, budget {BUDGET_MS} ms")
+        return 1
+    print(f"OK: inference cold start is {extra:.1f} ms over numpy (budget {BUDGET_MS} ms)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Hyperparameter sweep: successive halving vs. training every trial fully.
+
+A synthetic regression CSV is converted to a binary cache and a grid of
+learning rates, layer sizes and batch sizes is searched twice:
+  - full grid: every trial trains for all epochs (one rung)
+  - halving: rungs of epochs / 9, epochs / 3 and epochs, keeping the best
+    third of the trials after each rung
+each with one worker and with one worker per CPU core. The table shows the
+wall time, the epochs trained in total and the best trial's validation
+loss. Halving should find the same (or an equally good) configuration for
+a fraction of the epochs, and the wall time should drop with more cores.
+
+Run from the repository root:
+    python benchmarks/bench_sweep.py [rows] [epochs]
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from harness import report
+from OrdoNet.dataset import csv_to_cache
+from OrdoNet.sweep import Sweep
+
+SPACE = {
+    'lr': [0.001, 0.005, 0.02],
+    'layers': [[8], [32], [32, 32]],
+    'batch_size': [32, 128],
+}
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 27
+    rng = np.random.default_rng(0)
+    features = rng.uniform(-3, 3, size=(rows, 4))
+    labels = np.sin(features[:, :1]) * 2 + features[:, 1:2] * features[:, 2:3] + rng.normal(0, 0.1, (rows, 1))
+    cores = os.cpu_count() or 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'data.csv')
+        np.savetxt(csv_path, np.hstack([features, labels]), delimiter=',', comments='', fmt='%.6f',
+                   header='a,b,c,d,y')
+        cache_path = os.path.join(folder, 'data.cache')
+        csv_to_cache(csv_path, cache_path)
+        for name, min_epochs in (("full grid", epochs), ("halving", max(1, epochs // 9))):
+            for workers in sorted({1, cores}):
+                sweep = Sweep(cache_path, SPACE, epochs=epochs, min_epochs=min_epochs, eta=3,
+                              normalize='zscore', workers=workers)
+                sweep.run()
+                best = sweep.best
+                results.append([name, workers, f"{sweep.wall_time:.2f}",
+                                sum(result['epochs'] for result in sweep.results),
+                                f"{best['val_loss']:.4f}", best['config']['lr'], best['config']['layers'],
+                                best['config']['batch_size']])
+
+    trials = len(Sweep(cache_path, SPACE).configs())
+    print(f"{trials} trials, {rows} rows, up to {epochs} epochs, {cores} CPU core(s)")
+    report(results, ["search", "workers", "wall s", "epochs", "best val_loss", "lr", "layers", "batch"])
+
+if __name__ == '__main__':
+    main()
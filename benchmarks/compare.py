@@ -0,0 +1,67 @@
+"""
+Compares two JSON files written by suite.py and flags regressions.
+
+Run from the repository root:
+    python benchmarks/compare.py base.json new.json [--threshold 0.10]
+
+A case counts as a regression when its best time grew by more than the
+threshold (10% by default). The exit status is 1 if any case regressed,
+so the script can be used as a CI check.
+"""
+import argparse
+import json
+import sys
+
+from harness import report
+
+def compare(base, new, threshold):
+    """
+    Returns (rows, regressions) for the cases present in both result dicts.
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(base) & set(new)):
+        before = base[name]['best_ms']
+        after = new[name]['best_ms']
+        change = after / before - 1
+        if change > threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = ""
+        rows.append([name, f"{before:.3f}", f"{after:.3f}", f"{change * 100:+.1f}%", status])
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark suite results")
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default 0.10)")
+    args = parser.parse_args()
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    for label, run in (("base", base), ("new", new)):
+        env = run['environment']
+        print(f"{label}: commit {env['commit']}, {env['date']}, Python {env['python']}, "
+              f"NumPy {env['numpy']}, {env['cpu_count']} CPUs")
+    if base['environment']['platform'] != new['environment']['platform']:
+        print("Warning: the runs come from different platforms.")
+
+    rows, regressions = compare(base['results'], new['results'], args.threshold)
+    report(rows, ["case", "base ms", "new ms", "change", ""])
+    only = sorted(set(base['results']) ^ set(new['results']))
+    if only:
+        print(f"Not in both runs: {', '.join(only)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}.")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
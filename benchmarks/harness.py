@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+# Make the OrdoNet package importable from a checkout, without installing it.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def timings(fn, warmup=1, repeat=5):
+    """
+    Runs fn warmup times untimed, then repeat times, and returns the list
+    of wall times in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+def measure(fn, warmup=1, repeat=5):
+    """
+    Runs fn a few times and returns the best wall time in seconds.
+
+    warmup: calls that are run first and not timed.
+    repeat: timed calls; the fastest one is reported.
+    """
+    return min(timings(fn, warmup, repeat))
+
+def report(rows, headers):
+    """
+    Prints a list of result rows as a simple aligned table.
+    """
+    table = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(headers))]
+    for row in table:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,170 @@
+"""
+Reproducible benchmark suite for OrdoNet's hot paths: Matrix.dot, Layer
+forward/backward, AdamOptimizer.update, CSV loading and normalization, and
+full-epoch training and inference at several network widths and dataset sizes.
+
+Every case resets the random seeds before building its data, runs untimed
+warmup calls, then reports best / median / mean of several timed calls.
+Results can be written as JSON (sorted keys, one entry per case) and two
+runs compared with compare.py to catch regressions between commits.
+
+Run from the repository root:
+    python benchmarks/suite.py                          # full suite, table only
+    python benchmarks/suite.py --quick --json base.json # smaller sizes, saved
+    python benchmarks/suite.py --filter train           # only matching cases
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from harness import ROOT, timings, report
+from OrdoNet.dataset import load_csv, normalize, stream_csv
+from OrdoNet.layer import Layer
+from OrdoNet.matrix import Matrix
+from OrdoNet.network import Network
+from OrdoNet.normalizer import Normalizer
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.trainer import Trainer
+
+SEED = 0
+
+# Each group yields (name, fn, items, repeat): items is the number of samples
+# (or parameters) one call processes, used for the throughput column.
+
+def matrix_cases(quick):
+    for n in ([64, 256] if quick else [64, 256, 512, 1024]):
+        a, b = Matrix(n, n), Matrix(n, n)
+        a.randomize()
+        b.randomize()
+        yield f"matrix.dot[n={n}]", lambda a=a, b=b: a.dot(b), None, 10 if n < 512 else 5
+
+def layer_cases(quick):
+    batch = 64
+    for width in ([64, 256] if quick else [64, 256, 1024]):
+        layer = Layer(width, width, 'relu')
+        x = np.random.rand(batch, width)
+        d_outputs = np.random.rand(batch, width)
+        yield f"layer.forward[width={width},batch={batch}]", lambda l=layer, x=x: l.forward(x), batch, 20
+        layer.forward(x)  # backward reuses the activations cached here
+        yield (f"layer.backward[width={width},batch={batch}]",
+               lambda l=layer, d=d_outputs: l.backward(d), batch, 20)
+
+def optimizer_cases(quick):
+    for size in ([10_000, 1_000_000] if quick else [10_000, 1_000_000, 10_000_000]):
+        adam = AdamOptimizer(size)
+        params = np.random.uniform(-1, 1, size)
+        grads = np.random.normal(0, 0.1, size)
+        yield f"adam.update[size={size}]", lambda o=adam, p=params, g=grads: o.update(p, g), size, 10
+
+def data_cases(quick):
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in ([10_000] if quick else [10_000, 100_000]):
+            path = os.path.join(folder, f"data_{rows}.csv")
+            values = np.random.rand(rows, 9)
+            np.savetxt(path, values, delimiter=',', header=','.join(f"c{i}" for i in range(9)),
+                       comments='', fmt='%.6f')
+            repeat = 3 if rows > 10_000 else 5
+            yield f"data.load_csv[rows={rows}]", lambda p=path: load_csv(p), rows, repeat
+            yield (f"data.stream_csv[rows={rows}]",
+                   lambda p=path: stream_csv(p, chunk_size=8192).read_all(), rows, repeat)
+            data = values[:, :8].tolist()
+            yield f"data.normalize[rows={rows}]", lambda d=data: normalize(d), rows, repeat
+            array = values[:, :8]
+            yield (f"data.normalizer_zscore[rows={rows}]",
+                   lambda a=array: Normalizer('zscore').fit_transform(a), rows, repeat)
+
+def train_cases(quick):
+    batch_size = 64
+    for samples in ([1024] if quick else [1024, 16384]):
+        data = np.random.rand(samples, 16)
+        targets = np.random.rand(samples, 1)
+        for width in ([32, 128] if quick else [32, 128, 512]):
+            net = Network([16, width, width, 1], ['relu', 'relu', 'sigmoid'])
+            trainer = Trainer(net, AdamOptimizer(net.total_parameters()), batch_size=batch_size,
+                              seed=SEED, verbose=False)
+            yield (f"train.epoch[width={width},samples={samples}]",
+                   lambda t=trainer, x=data, y=targets: t.fit(x, y, 1), samples, 3)
+
+def inference_cases(quick):
+    samples = 1024
+    data = np.random.rand(samples, 16)
+    for width in ([32, 128] if quick else [32, 128, 512]):
+        net = Network([16, width, width, 1], ['relu', 'relu', 'sigmoid'])
+        yield (f"infer.batch[width={width},samples={samples}]",
+               lambda n=net, x=data: n.infer(x), samples, 10)
+        yield f"infer.single[width={width}]", lambda n=net, x=data[0]: n.predict(x), 1, 50
+
+GROUPS = [matrix_cases, layer_cases, optimizer_cases, data_cases, train_cases, inference_cases]
+
+def environment():
+    # Where the numbers came from, so runs on different machines are not mixed up.
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def run(quick=False, pattern=None, warmup=1):
+    """
+    Runs every case whose name contains pattern and returns {name: result}.
+    """
+    results = {}
+    for group in GROUPS:
+        random.seed(SEED)
+        np.random.seed(SEED)
+        for name, fn, items, repeat in group(quick):
+            if pattern and pattern not in name:
+                continue
+            times = timings(fn, warmup=warmup, repeat=repeat)
+            best = min(times)
+            results[name] = {
+                'best_ms': best * 1000,
+                'median_ms': statistics.median(times) * 1000,
+                'mean_ms': statistics.fmean(times) * 1000,
+                'repeat': repeat,
+                'items': items,
+                'items_per_second': items / best if items else None,
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="OrdoNet benchmark suite")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes for a fast check")
+    parser.add_argument('--filter', default=None, help="only run cases whose name contains this")
+    parser.add_argument('--json', default=None, help="write results to this JSON file")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed calls before timing")
+    args = parser.parse_args()
+
+    results = run(args.quick, args.filter, args.warmup)
+    rows = []
+    for name, result in results.items():
+        throughput = f"{result['items_per_second']:,.0f}" if result['items_per_second'] else "-"
+        rows.append([name, f"{result['best_ms']:.3f}", f"{result['median_ms']:.3f}", throughput])
+    report(rows, ["case", "best ms", "median ms", "items/s"])
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'environment': environment(), 'quick': args.quick, 'results': results},
+                      file, indent=2, sort_keys=True)
+            file.write('\n')
+        print(f"Results written to {args.json}")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from OrdoNet import checkpoint
+from OrdoNet.network import Network
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Windows cannot replace a memory-mapped file")
+def test_save_over_memory_mapped_checkpoint(tmp_path):
+    # Saving a model back to the file its parameters are mapped from must
+    # not truncate the mapping under it.
+    path = str(tmp_path / 'model.ckpt')
+    np.random.seed(0)
+    net = Network([3, 8, 2], ['relu', 'linear'])
+    net.save(path)
+    loaded = Network.from_file(path, mmap=True)
+    loaded.params[0] += 1.0  # copy-on-write change, only in memory
+    expected = np.array(loaded.params)
+    loaded.save(path)
+    reloaded = Network.from_file(path, mmap=True)
+    np.testing.assert_array_equal(reloaded.params, expected)
+    np.testing.assert_array_equal(loaded.params, expected)  # old mapping still readable
+    assert os.listdir(tmp_path) == ['model.ckpt']  # no temporary file left behind
+
+def test_save_over_file_in_use_on_windows(tmp_path, monkeypatch):
+    # On Windows the rename fails while the file is mapped: the caller gets
+    # a clear error and the old checkpoint is kept.
+    path = str(tmp_path / 'model.ckpt')
+    np.random.seed(0)
+    net = Network([3, 8, 2], ['relu', 'linear'])
+    net.save(path)
+
+    def replace(source, target):
+        raise PermissionError(13, "Access is denied", target)
+
+    monkeypatch.setattr(checkpoint, '_WINDOWS', True)
+    monkeypatch.setattr(checkpoint.os, 'replace', replace)
+    with pytest.raises(PermissionError, match="Release the mapping"):
+        Network([3, 8, 2], ['relu', 'linear']).save(path)
+    monkeypatch.undo()
+    assert os.listdir(tmp_path) == ['model.ckpt']
+    np.testing.assert_array_equal(Network.from_file(path).params, net.params)
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Windows cannot replace a memory-mapped file")
+def test_partial_fit_live_model_round_trip(tmp_path):
+    # Live-model workflow: map a checkpoint, update it online and save it
+    # back to the same path, twice, with the optimizer carried along.
+    path = str(tmp_path / 'live.ckpt')
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    Network([4, 16, 1], ['relu', 'linear']).save(path)
+    for _ in range(2):
+        live = Network.from_file(path, mmap=True)
+        live.partial_fit(rng.normal(size=(32, 4)), rng.normal(size=(32, 1)), steps=3)
+        assert not isinstance(live.params, np.memmap)
+        expected = live.params.copy()
+        steps = live.optimizer.t
+        live.save(path)
+        reloaded = Network.from_file(path, mmap=True)
+        np.testing.assert_array_equal(reloaded.params, expected)
+    reloaded.partial_fit(rng.normal(size=(32, 4)), rng.normal(size=(32, 1)))
+    assert reloaded.optimizer.t == steps + 1
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from OrdoNet.dataset import stream_csv
+
+def write_csv(tmp_path, header=True):
+    path = tmp_path / 'data.csv'
+    lines = (['a,b,c'] if header else []) + ['1,2,3', '4,5,6']
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+def test_column_indices_and_names(tmp_path):
+    path = write_csv(tmp_path)
+    features, labels = stream_csv(path, label_cols=['a'], feature_cols=[-1, 1]).read_all()
+    np.testing.assert_array_equal(features, [[3, 2], [6, 5]])
+    np.testing.assert_array_equal(labels, [[1], [4]])
+
+@pytest.mark.parametrize('header', [True, False])
+@pytest.mark.parametrize('options', [{'label_cols': [7]}, {'label_cols': 3},
+                                     {'label_cols': -4}, {'feature_cols': [0, 5]}])
+def test_out_of_range_column_index_is_rejected(tmp_path, header, options):
+    # A mistyped index used to drop every row as unparseable, silently.
+    path = write_csv(tmp_path, header)
+    with pytest.raises(ValueError, match="out of range"):
+        stream_csv(path, has_header=header, **options).read_all()
+
+def test_unknown_column_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="not found"):
+        stream_csv(write_csv(tmp_path), label_cols=['d']).read_all()
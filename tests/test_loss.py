@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.sequential import Sequential, Dense
+
+class Softplus:
+    # A custom activation without a name, as get_activation accepts.
+    def forward(self, z, out=None):
+        return np.logaddexp(0, z, out=out)
+
+    def backward(self, y, d_outputs, out=None):
+        # softplus'(z) = sigmoid(z) = 1 - exp(-y)
+        return np.multiply(d_outputs, -np.expm1(-y), out=out)
+
+class SquaredError:
+    # A custom loss without fused_activation, as get_loss accepts.
+    def value(self, y_true, y_pred):
+        return float(np.mean((y_pred - y_true) ** 2))
+
+    def value_and_grad(self, y_true, y_pred):
+        diff = y_pred - y_true
+        return float(np.mean(diff ** 2)), 2 * diff / diff.size
+
+@pytest.mark.parametrize('loss', ['mse', 'mae', 'huber', SquaredError()])
+def test_custom_output_activation_takes_the_unfused_path(loss):
+    rng = np.random.default_rng(0)
+    inputs, targets = rng.normal(size=(8, 3)), rng.normal(size=(8, 1))
+    net = Network([3, 4, 1], ['relu', Softplus()], loss=loss)
+    assert np.isfinite(net.train_step(inputs, targets, AdamOptimizer(net.total_parameters())))
+    model = Sequential(3, [Dense(4, 'relu'), Dense(1, Softplus())], loss=loss, seed=0)
+    assert np.isfinite(model.train_step(inputs, targets, AdamOptimizer(model.total_parameters())))
+
+def test_custom_loss_with_builtin_activation():
+    rng = np.random.default_rng(0)
+    inputs, targets = rng.normal(size=(8, 3)), rng.normal(size=(8, 2))
+    net = Network([3, 4, 2], ['relu', 'sigmoid'], loss=SquaredError())
+    assert np.isfinite(net.train_step(inputs, targets, AdamOptimizer(net.total_parameters())))
+    model = Sequential(3, [Dense(4, 'relu'), Dense(2, 'sigmoid')], loss=SquaredError(), seed=0)
+    assert np.isfinite(model.train_step(inputs, targets, AdamOptimizer(model.total_parameters())))
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from OrdoNet.matrix import Matrix
+
+def test_in_place_operators_with_numbers_and_matrices():
+    m = Matrix(2, 2, [[1.0, 2.0], [3.0, 4.0]])
+    buffer = m.data
+    m += 1
+    m -= 0.5
+    m *= 2
+    np.testing.assert_array_equal(m.data, [[3.0, 5.0], [7.0, 9.0]])
+    m += Matrix(2, 2, [[1.0, 1.0], [1.0, 1.0]])
+    m -= Matrix(2, 2, [[2.0, 2.0], [2.0, 2.0]])
+    m *= Matrix(2, 2, [[1.0, 0.0], [0.0, 1.0]])
+    np.testing.assert_array_equal(m.data, [[2.0, 0.0], [0.0, 8.0]])
+    assert m.data is buffer  # every update happened in place
+    with pytest.raises(ValueError):
+        m += Matrix(3, 2)
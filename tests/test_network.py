@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from OrdoNet.network import Network
+from OrdoNet.utils import gradient_check
+
+CASES = [
+    (['tanh', 'sigmoid', 'linear'], 'mse', 'real'),
+    (['relu', 'tanh', 'linear'], 'huber', 'real'),
+    (['sigmoid', 'tanh', 'sigmoid'], 'binary_cross_entropy', 'binary'),  # fused
+    (['tanh', 'relu', 'softmax'], 'cross_entropy', 'one_hot'),  # fused
+    (['tanh', 'sigmoid', 'softmax'], 'mse', 'one_hot'),  # softmax Jacobian, unfused
+]
+
+def make_targets(kind, rng, shape):
+    if kind == 'binary':
+        return rng.integers(0, 2, shape).astype(float)
+    if kind == 'one_hot':
+        return np.eye(shape[-1])[rng.integers(0, shape[-1], shape[:-1])]
+    return rng.normal(size=shape)
+
+@pytest.mark.parametrize('activations, loss, kind', CASES)
+def test_gradients_match_finite_differences(activations, loss, kind):
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    net = Network([4, 5, 3, 3], activations, loss=loss)
+    sample = rng.normal(size=4)
+    assert gradient_check(net, sample, make_targets(kind, rng, (3,))) < 1e-5
+    batch = rng.normal(size=(6, 4))
+    assert gradient_check(net, batch, make_targets(kind, rng, (6, 3))) < 1e-5
+
+def test_gradient_layout_matches_get_parameters():
+    # Entry i of the flat gradient belongs to entry i of get_parameters:
+    # layer by layer, each neuron's weights followed by its bias.
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    net = Network([3, 4, 2], ['tanh', 'linear'])
+    inputs, targets = rng.normal(size=(5, 3)), rng.normal(size=(5, 2))
+    net.forward_batch(inputs)
+    grads = net.backward_batch(targets)
+    params = net.get_parameters()
+    assert grads.shape == params.shape
+    offset = 0
+    for layer in net.layers:
+        end = offset + layer.num_params
+        rows = params[offset:end].reshape(layer.num_neurons, layer.num_inputs + 1)
+        np.testing.assert_array_equal(rows[:, :-1], layer.weights)
+        np.testing.assert_array_equal(rows[:, -1], layer.biases)
+        np.testing.assert_array_equal(grads[offset:end].reshape(rows.shape), layer.grads)
+        offset = end
+    # The last entry is the bias of the last output neuron: with a linear
+    # output and MSE over 2 outputs its gradient is the batch mean of
+    # 2 * (prediction - target) / 2 for that output.
+    expected = np.mean(net.predict(inputs)[:, -1] - targets[:, -1])
+    assert grads[-1] == pytest.approx(expected)
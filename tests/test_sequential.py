@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.sequential import Sequential, Dense
+
+def test_backward_rejects_misshaped_targets():
+    model = Sequential(2, [Dense(4, 'relu'), Dense(1)], seed=0)
+    inputs = np.random.default_rng(0).normal(size=(5, 2))
+    model.forward(inputs)
+    for targets in (np.zeros((1, 5)), np.zeros(5), np.zeros((5, 2))):
+        with pytest.raises(ValueError):
+            model.backward(targets)
+    optimizer = AdamOptimizer(model.total_parameters())
+    with pytest.raises(ValueError):
+        model.train_step(inputs, np.zeros((1, 5)), optimizer)
+    assert np.isfinite(model.train_step(inputs, np.zeros((5, 1)), optimizer))
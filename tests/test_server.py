@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from OrdoNet.inference import load_model
+from OrdoNet.sequential import Sequential, Dense
+from OrdoNet.server import InferenceServer, MicroBatcher
+
+def build_sequential():
+    return Sequential(3, [Dense(8, 'relu'), Dense(2)], seed=0)
+
+def test_micro_batcher_with_sequential():
+    model = build_sequential()
+    inputs = np.random.default_rng(0).normal(size=(10, 3))
+
+    async def run():
+        batcher = MicroBatcher(model, max_batch_size=4)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.predict(row) for row in inputs))
+        finally:
+            await batcher.stop()
+
+    outputs = asyncio.run(run())
+    np.testing.assert_allclose(np.array(outputs), model.predict(inputs))
+
+def test_server_serves_sequential_checkpoint(tmp_path):
+    path = str(tmp_path / 'seq.ckpt')
+    build_sequential().save(path)
+    model = load_model(path)
+    assert isinstance(model, Sequential)
+
+    async def run():
+        server = InferenceServer(model, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            body = json.dumps({'inputs': [0.5, -1.0, 2.0]}).encode('utf-8')
+            writer.write(b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+                         + f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            await server.stop()
+
+    response = asyncio.run(run())
+    assert response.startswith(b"HTTP/1.1 200")
+    outputs = json.loads(response.split(b"\r\n\r\n", 1)[1])['outputs']
+    np.testing.assert_allclose(outputs, model.predict(np.array([0.5, -1.0, 2.0])))
+
+class SlowModel:
+    # Takes a fixed time per batch, like a large model.
+    input_size = 1
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def predict(self, inputs):
+        time.sleep(self.seconds)
+        return np.asarray(inputs)
+
+def test_micro_batcher_delay_counts_from_arrival():
+    # A request that arrives while a batch is running has waited longer
+    # than max_delay by the time that batch ends, so it must run at once
+    # instead of waiting another full max_delay.
+    max_delay, run_time = 0.2, 0.3
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        batcher = MicroBatcher(SlowModel(run_time), max_batch_size=8, max_delay=max_delay)
+        batcher.start()
+        try:
+            first = asyncio.ensure_future(batcher.predict([1.0]))
+            await asyncio.sleep(max_delay + 0.02)  # the first batch is running now
+            start = loop.time()
+            await batcher.predict([2.0])
+            latency = loop.time() - start
+            await first
+            return latency
+        finally:
+            await batcher.stop()
+
+    latency = asyncio.run(run())
+    # About 2 * run_time - 0.02 s; waiting a full max_delay again would add 0.2 s.
+    assert latency < 2 * run_time + max_delay / 2
@@ -0,0 +1,17 @@
+import numpy as np
+
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.trainer import Trainer, ExponentialDecay
+
+def test_schedule_restarts_from_base_lr_on_every_fit():
+    rng = np.random.default_rng(0)
+    data, targets = rng.normal(size=(64, 3)), rng.normal(size=(64, 1))
+    net = Network([3, 4, 1], ['relu', 'linear'])
+    optimizer = AdamOptimizer(net.total_parameters(), lr=0.1)
+    trainer = Trainer(net, optimizer, batch_size=16, seed=0, verbose=False, schedule=ExponentialDecay(0.5))
+    first = trainer.fit(data, targets, 3)['lr']
+    assert optimizer.lr == 0.1
+    second = trainer.fit(data, targets, 3)['lr']
+    np.testing.assert_allclose(first, [0.1, 0.05, 0.025])
+    assert second == first
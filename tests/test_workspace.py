@@ -0,0 +1,79 @@
+import tracemalloc
+
+import numpy as np
+
+from OrdoNet.network import Network
+from OrdoNet.optimizer import AdamOptimizer
+from OrdoNet.trainer import Trainer
+from OrdoNet.workspace import Workspace
+
+BUDGET_KIB = 32  # per training step (measured 6-11 KiB: the small loss-sized output arrays)
+
+def traced_peak(fn):
+    # Peak bytes allocated while fn runs, above what was allocated before.
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+def build(workspace=True):
+    np.random.seed(0)
+    net = Network([64, 256, 256, 10], ['relu', 'relu', 'softmax'], loss='cross_entropy')
+    if not workspace:
+        net.workspace = None
+    return net
+
+def batch(rows=64):
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(rows, 64)), np.eye(10)[rng.integers(0, 10, rows)]
+
+def test_training_step_stays_within_allocation_budget():
+    inputs, targets = batch()
+    net = build()
+    optimizer = AdamOptimizer(net.total_parameters())
+    net.train_step(inputs, targets, optimizer)  # warm up: the workspace is filled here
+    allocations = net.workspace.allocations
+    peak = traced_peak(lambda: [net.train_step(inputs, targets, optimizer) for _ in range(10)])
+    assert peak / 1024 <= BUDGET_KIB
+    assert net.workspace.allocations == allocations
+
+    # Without the workspace every intermediate is a new array: hundreds of KiB.
+    fresh = build(workspace=False)
+    optimizer = AdamOptimizer(fresh.total_parameters())
+    fresh.train_step(inputs, targets, optimizer)
+    assert traced_peak(lambda: fresh.train_step(inputs, targets, optimizer)) / 1024 > 4 * BUDGET_KIB
+
+def test_workspace_matches_allocating_path():
+    inputs, targets = batch()
+    results = []
+    for workspace in (True, False):
+        net = build(workspace)
+        optimizer = AdamOptimizer(net.total_parameters())
+        losses = [net.train_step(inputs, targets, optimizer) for _ in range(3)]
+        results.append((losses, net.get_parameters(copy=True)))
+    assert results[0][0] == results[1][0]
+    np.testing.assert_array_equal(results[0][1], results[1][1])
+
+def test_trainer_epochs_allocate_no_new_workspace_arrays():
+    # A smaller last batch reuses the first rows of each array.
+    data, labels = batch(1000)
+    net = build()
+    trainer = Trainer(net, AdamOptimizer(net.total_parameters()), batch_size=64, seed=0, verbose=False)
+    trainer.fit(data, labels, 1)
+    allocations = net.workspace.allocations
+    trainer.fit(data, labels, 2)
+    assert net.workspace.allocations == allocations
+
+def test_workspace_reuses_rows_and_reallocates_on_growth():
+    workspace = Workspace()
+    first = workspace.get('a', (8, 4), np.float64)
+    smaller = workspace.get('a', (5, 4), np.float64)
+    assert np.shares_memory(first, smaller) and smaller.shape == (5, 4)
+    assert workspace.allocations == 1
+    assert workspace.get('a', (9, 4), np.float64).shape == (9, 4)
+    workspace.get('a', (9, 4), np.float32)
+    assert workspace.allocations == 3